@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+CLI startup benchmark
+Times each run_agent.py subcommand end to end (median of several runs) in a
+scratch directory holding a seeded task store, and lists the slowest imports
+of the agent module.
+
+Model-calling commands are run without ANTHROPIC_API_KEY, so they stop right
+before their first model call: their time is pure startup.
+
+Usage: python benchmarks/bench_cli_startup.py [--tasks 1000] [--runs 7]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.models import Task, TaskPriority, TaskStatus
+from src.task_store import JsonTaskStore
+
+RUN_AGENT = str(PROJECT_ROOT / "scripts" / "run_agent.py")
+
+COMMANDS = [
+    ["--help"],
+    ["list-tasks"],
+    ["update-status", "TASK-0001", "in_progress"],
+    ["create-task", "Benchmark task", "Created by the startup benchmark"],
+    ["metrics"],
+    ["standup"],
+    ["assign", "--dry-run"],
+    ["sprint-plan"],
+    ["analyze"],
+    ["parity"],
+    ["suggest"],
+    ["pipeline"],
+]
+
+
+def seed_tasks(data_dir: Path, count: int):
+    store = JsonTaskStore(data_dir=str(data_dir))
+    statuses = list(TaskStatus)
+    priorities = list(TaskPriority)
+    now = datetime.now()
+    for i in range(count):
+        store.add(Task(
+            id=f"TASK-{i + 1:04d}",
+            title=f"Task {i + 1}",
+            description="Seeded by the startup benchmark",
+            priority=priorities[i % len(priorities)],
+            status=statuses[i % len(statuses)],
+            platform=("ios", "android", "both")[i % 3],
+            estimated_hours=float(1 + i % 8),
+            created_at=now,
+            updated_at=now
+        ))
+    store.save()
+    store.close()
+
+
+def median_ms(argv, cwd: Path, env: dict, runs: int) -> float:
+    """Median wall time of running ``python argv`` to completion"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *argv],
+            cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def import_profile(top: int):
+    """Cumulative import time of src.project_manager and its slowest dependencies"""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.project_manager"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    ).stderr
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        rows.append((int(cumulative), name.strip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=1000, help="Tasks in the seeded store")
+    parser.add_argument("--runs", type=int, default=7, help="Runs per command")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.pop("ANTHROPIC_API_KEY", None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        shutil.copytree(PROJECT_ROOT / "config", workdir / "config")
+        seed_tasks(workdir / "data", args.tasks)
+
+        print(f"{args.tasks} tasks, median of {args.runs} runs")
+        print(f"{'command':<30} {'ms':>8}")
+        print(f"{'(python -c pass)':<30} {median_ms(['-c', 'pass'], workdir, env, args.runs):>8.1f}")
+        for command in COMMANDS:
+            print(f"{command[0]:<30} {median_ms([RUN_AGENT, *command], workdir, env, args.runs):>8.1f}")
+
+    print("\nSlowest imports under src.project_manager (cumulative ms):")
+    for cumulative, name in import_profile(args.top):
+        print(f"  {cumulative / 1000:>8.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Feature parity benchmark
+Writes synthetic Swift and Kotlin trees for the same features, with some
+renamed on one platform and some left out of one platform, then times the
+scan and diff, checks the planted gaps were found and compares the tokens of
+the residual prompt with sending both platforms' full feature lists.
+
+Usage: python benchmarks/bench_feature_parity.py [--features 1000] [--missing 0.05] [--renamed 0.1]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.codebase_scanner import CodebaseScanner
+from src.feature_parity import compare_platforms
+from src.prompt_budget import TokenEstimator
+
+AREAS = ["Quest", "Focus", "Streak", "Reward", "Character", "Reminder", "Sync", "Settings", "Onboarding",
+         "Leaderboard", "Achievement", "Journal", "Habit", "Mood", "Calendar", "Profile"]
+PARTS = ["Log", "Timer", "Detail", "List", "Editor", "Summary", "History", "Picker", "Badge", "Chart",
+         "Export", "Import", "Share", "Filter", "Search", "Widget"]
+QUALIFIERS = ["", "Daily", "Weekly", "Team", "Offline", "Quick", "Custom", "Advanced"]
+PANELS = ["", "Panel", "Card", "Sheet", "Flow"]
+
+# Platform-specific spellings of the same feature
+RENAMES = [("Tracker", "Tracking"), ("Colour", "Color"), ("Details", "Detail"), ("Stats", "Statistics")]
+
+SWIFT_SCREEN = """import SwiftUI
+
+struct {name}View: View {{
+    @EnvironmentObject var manager: {name}Manager
+
+    var body: some View {{
+        Text("{name}")
+    }}
+}}
+
+private struct {name}Row: View {{
+    var body: some View {{ EmptyView() }}
+}}
+"""
+
+SWIFT_MANAGER = """import Foundation
+
+@MainActor
+final class {name}Manager: ObservableObject {{
+    @Published var items: [{name}] = []
+}}
+
+struct {name}: Codable, Identifiable {{
+    let id: UUID
+}}
+"""
+
+KOTLIN_SCREEN = """package com.mindlabs.quest.ui
+
+import androidx.compose.runtime.Composable
+
+@Composable
+fun {name}Screen(viewModel: {name}ViewModel) {{
+    Row()
+}}
+
+@Composable
+private fun Row() {{
+}}
+"""
+
+KOTLIN_VIEW_MODEL = """package com.mindlabs.quest.ui
+
+import androidx.lifecycle.ViewModel
+
+class {name}ViewModel(private val repository: QuestRepository) : ViewModel() {{
+}}
+"""
+
+KOTLIN_ENTITY = """package com.mindlabs.quest.data
+
+import androidx.room.Entity
+import androidx.room.PrimaryKey
+
+@Entity(tableName = "{table}")
+data class {name}Entity(
+    @PrimaryKey val id: Long
+)
+"""
+
+
+def feature_names(count: int, rng: random.Random):
+    names = [qualifier + area + part + panel
+             for qualifier in QUALIFIERS for area in AREAS for part in PARTS for panel in PANELS]
+    return sorted(rng.sample(names, count))
+
+
+def build_trees(root: Path, count: int, missing: float, renamed: float, seed: int = 17):
+    """Write both trees; returns the planted gaps as sets of (platform missing it, name)"""
+    rng = random.Random(seed)
+    planted = set()
+    for n, name in enumerate(feature_names(count, rng)):
+        ios_name = android_name = name
+        roll = rng.random()
+        if roll < renamed:
+            left, right = rng.choice(RENAMES)
+            ios_name, android_name = name + left, name + right
+        elif roll < renamed + missing:
+            gap = rng.choice(["ios", "android"])
+            planted.add((gap, name))
+        module = f"module{n % 32}"
+        if ("ios", name) not in planted:
+            directory = root / "swiftui" / module
+            directory.mkdir(parents=True, exist_ok=True)
+            (directory / f"{ios_name}View.swift").write_text(SWIFT_SCREEN.format(name=ios_name))
+            (directory / f"{ios_name}Manager.swift").write_text(SWIFT_MANAGER.format(name=ios_name))
+        if ("android", name) not in planted:
+            directory = root / "android" / module
+            directory.mkdir(parents=True, exist_ok=True)
+            (directory / f"{android_name}Screen.kt").write_text(KOTLIN_SCREEN.format(name=android_name))
+            (directory / f"{android_name}ViewModel.kt").write_text(KOTLIN_VIEW_MODEL.format(name=android_name))
+            (directory / f"{android_name}Entity.kt").write_text(
+                KOTLIN_ENTITY.format(name=android_name, table=android_name.lower())
+            )
+    return planted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--features", type=int, default=1000, help="Features per platform")
+    parser.add_argument("--missing", type=float, default=0.05, help="Share of features left out of one platform")
+    parser.add_argument("--renamed", type=float, default=0.1, help="Share of features named differently per platform")
+    args = parser.parse_args()
+    capacity = len(QUALIFIERS) * len(AREAS) * len(PARTS) * len(PANELS)
+    if args.features > capacity:
+        parser.error(f"--features can be at most {capacity}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        planted = build_trees(root, args.features, args.missing, args.renamed)
+        roots = {"swiftui": root / "swiftui", "android": root / "android"}
+        index_path = str(root / "parity_scan_index.json")
+
+        timings = []
+        for label in ("first check", "unchanged check"):
+            scanner = CodebaseScanner(roots, index_path=index_path)
+            started = time.perf_counter()
+            scan = scanner.scan()
+            scanned = time.perf_counter() - started
+            diff = compare_platforms(scan.files, ["swiftui"], ["android"])
+            timings.append((label, scanned, time.perf_counter() - started - scanned))
+            scanner.save_index()
+
+    found = {("android", feature.name.removesuffix("Manager").removesuffix("View")) for feature in diff.missing_in_android}
+    found |= {("ios", feature.name.removesuffix("Entity").removesuffix("ViewModel").removesuffix("Screen"))
+              for feature in diff.missing_in_ios}
+    print(f"{len(diff.ios_features)} iOS and {len(diff.android_features)} Android features "
+          f"({args.features} planted per platform, {len(planted)} left out of one)")
+    print(f"  {'':<16} {'scan s':>8} {'diff s':>8}")
+    for label, scanned, compared in timings:
+        print(f"  {label:<16} {scanned:>8.3f} {compared:>8.3f}")
+    print(f"  matched {len(diff.matched)}, {len(diff.fuzzy)} of them by similar names")
+    print(f"  planted gaps found: {len(planted & found)} of {len(planted)}; "
+          f"other unmatched features: {len(found - planted)}")
+
+    estimator = TokenEstimator()
+    full = "\n".join(f"- {feature.kind} {feature.name} ({feature.path})"
+                     for feature in diff.ios_features + diff.android_features)
+    residual = diff.residual()
+    print(f"  prompt tokens: residual diff {estimator.count(residual):,}, "
+          f"both full feature lists {estimator.count(full):,}")
+
+
+if __name__ == "__main__":
+    main()
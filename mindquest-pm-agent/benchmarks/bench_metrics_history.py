@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Metrics history benchmark
+Times a multi-year trend query over the columnar metrics history against
+reading the equivalent per-day metrics JSON reports.
+
+Usage: python benchmarks/bench_metrics_history.py [--years 5] [--per-day 4]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.metrics_history import SAMPLE_DTYPE, MetricsHistory, compute_trends
+
+
+def synthetic_history(days: int, per_day: int) -> np.ndarray:
+    """A growing backlog with steady completions and a fluctuating blocked count"""
+    rng = np.random.default_rng(7)
+    count = days * per_day
+    start = (datetime.now() - timedelta(days=days)).timestamp()
+    history = np.zeros(count, dtype=SAMPLE_DTYPE)
+    history["ts"] = start + np.arange(count) * (86400 / per_day)
+    history["total"] = 50 + np.arange(count) // per_day * 3
+    history["completed"] = np.cumsum(rng.poisson(2.5 / per_day, count))
+    history["completed"] = np.minimum(history["completed"], history["total"])
+    history["in_progress"] = rng.integers(0, 10, count)
+    history["blocked"] = rng.integers(0, 6, count)
+    history["remaining_hours"] = (history["total"] - history["completed"]) * 4.0
+    history["velocity"] = 30.0
+    history["cycle_hours"] = 20.0
+    history["lead_hours"] = 40.0
+    return history
+
+
+def write_daily_reports(history: np.ndarray, per_day: int, directory: Path):
+    for sample in history[per_day - 1::per_day]:
+        moment = datetime.fromtimestamp(float(sample["ts"]))
+        with open(directory / f"metrics_{moment:%Y%m%d}.json", 'w') as f:
+            json.dump({
+                "timestamp": moment.isoformat(),
+                "total_tasks": int(sample["total"]),
+                "completed_tasks": int(sample["completed"]),
+                "blocked_tasks": int(sample["blocked"]),
+                "remaining_hours": float(sample["remaining_hours"]),
+            }, f, indent=2)
+
+
+def trends_from_json(directory: Path, window: int):
+    """The previous approach: open every daily report and loop in Python"""
+    reports = []
+    for path in sorted(directory.glob("metrics_*.json")):
+        with open(path) as f:
+            reports.append(json.load(f))
+    throughput, rolling, blocked_ratio = [], [], []
+    previous = reports[0]["completed_tasks"] if reports else 0
+    for report in reports:
+        throughput.append(max(0, report["completed_tasks"] - previous))
+        previous = report["completed_tasks"]
+        rolling.append(sum(throughput[-window:]))
+        blocked_ratio.append(report["blocked_tasks"] / max(report["total_tasks"], 1))
+    return rolling, blocked_ratio
+
+
+def best_of(runs: int, fn) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return min(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, default=5, help="Years of history")
+    parser.add_argument("--per-day", type=int, default=4, help="Snapshots recorded per day")
+    parser.add_argument("--window", type=int, default=7, help="Trailing throughput window in days")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    days = args.years * 365
+    history = synthetic_history(days, args.per_day)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MetricsHistory(str(Path(tmp) / "metrics_history.bin"))
+        started = time.perf_counter()
+        store.append(history)
+        append_seconds = time.perf_counter() - started
+
+        reports_dir = Path(tmp) / "metrics"
+        reports_dir.mkdir()
+        write_daily_reports(history, args.per_day, reports_dir)
+
+        since = datetime.now() - timedelta(days=days)
+        columnar = best_of(args.runs, lambda: compute_trends(store.load(), since=since, window=args.window))
+        from_json = best_of(args.runs, lambda: trends_from_json(reports_dir, args.window))
+        size_kb = store.path.stat().st_size / 1024
+
+    print(f"{args.years} years, {len(history)} snapshots ({days} daily reports), best of {args.runs} runs")
+    print(f"  history file            {size_kb:>10.0f} KB, appended in {append_seconds * 1000:.1f} ms")
+    print(f"  columnar load + trends  {columnar * 1000:>10.1f} ms")
+    print(f"  daily JSON + loop       {from_json * 1000:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Model gateway throttling benchmark
+Sends a burst of prompts, some of them duplicates, to a fake model API that
+enforces a requests-per-minute limit and fails a share of calls, first
+fire-once (as the agent used to) and then through the agent's gateway.
+Reports results lost, useful throughput, retries and coalesced duplicates.
+
+Usage: python benchmarks/bench_model_gateway.py [--prompts 200] [--server-rpm 120] [--error-rate 0.05]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.model_clients import FakeModelClient
+from src.project_manager import ProjectManagerAgent
+
+CONFIG_PATH = Path(__file__).parent.parent / "config" / "agent_config.json"
+MAX_TOKENS = 256
+
+
+def make_prompts(count: int, duplicates: float, seed: int = 3):
+    rng = random.Random(seed)
+    prompts = []
+    for n in range(count):
+        if prompts and rng.random() < duplicates:
+            prompts.append(rng.choice(prompts))
+        else:
+            prompts.append(f"Summarise the status of quest feature {n} for the weekly report.")
+    return prompts
+
+
+def make_client(args) -> FakeModelClient:
+    return FakeModelClient(
+        latency_seconds=args.latency,
+        error_rate=args.error_rate,
+        jitter=0.2,
+        seed=1,
+        requests_per_minute=args.server_rpm
+    )
+
+
+async def fire_once(prompts, args) -> dict:
+    client = make_client(args)
+    slots = asyncio.Semaphore(args.concurrency)
+
+    async def call(prompt):
+        async with slots:
+            response = await client.messages.create(
+                model="fake", max_tokens=MAX_TOKENS, messages=[{"role": "user", "content": prompt}]
+            )
+            return response.content[0].text
+
+    results = await asyncio.gather(*(call(prompt) for prompt in prompts), return_exceptions=True)
+    return {
+        "completed": sum(not isinstance(result, Exception) for result in results),
+        "requests": client.requests,
+        "errors": client.errors,
+        "retries": 0,
+        "coalesced": 0,
+    }
+
+
+async def through_gateway(agent: ProjectManagerAgent, prompts) -> dict:
+    results = await asyncio.gather(
+        *(agent._complete(prompt, MAX_TOKENS, cache=False, purpose="bench") for prompt in prompts),
+        return_exceptions=True
+    )
+    counters = {}
+    for (name, _), value in agent.telemetry.counters.items():
+        counters[name] = counters.get(name, 0) + value
+    return {
+        "completed": sum(not isinstance(result, Exception) for result in results),
+        "requests": agent.client.requests,
+        "errors": agent.client.errors,
+        "retries": int(counters.get("model_retries", 0)),
+        "coalesced": int(counters.get("model_coalesced", 0)),
+    }
+
+
+def gateway_agent(args, data_dir: str) -> ProjectManagerAgent:
+    with open(CONFIG_PATH, 'r') as f:
+        config = json.load(f)
+    llm = config["llm"]
+    llm["max_concurrent_requests"] = args.concurrency
+    llm["usage_log_path"] = None
+    llm["gateway"].update({
+        # Deliberately above the server's limit: the gateway has to adapt to the 429s
+        "requests_per_minute": args.gateway_rpm or args.server_rpm * 2,
+        "input_tokens_per_minute": None,
+        "output_tokens_per_minute": None,
+        "shared_state_path": str(Path(data_dir) / "rate_limit.json"),
+        "backoff_base_seconds": 0.2,
+        "max_attempts": 10,
+    })
+    config_path = Path(data_dir) / "agent_config.json"
+    with open(config_path, 'w') as f:
+        json.dump(config, f)
+
+    agent = ProjectManagerAgent(None, config_path=str(config_path))
+    agent.client = make_client(args)
+    agent.telemetry.enabled = True
+    return agent
+
+
+def report(label: str, result: dict, total: int, wall: float):
+    lost = total - result["completed"]
+    print(
+        f"  {label:<10} {result['completed']:>9} {lost:>6} {result['completed'] / wall:>12.1f} "
+        f"{result['requests']:>9} {result['errors']:>7} {result['retries']:>8} {result['coalesced']:>10}"
+    )
+    return lost
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--prompts", type=int, default=200, help="Prompts in the burst")
+    parser.add_argument("--duplicates", type=float, default=0.1, help="Share of prompts repeating an earlier one")
+    parser.add_argument("--server-rpm", type=float, default=120, help="Fake API's requests per minute")
+    parser.add_argument("--gateway-rpm", type=float, help="Gateway's configured requests per minute (default 2x server)")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Share of calls failing with 429/529/500")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake API latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent requests")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.WARNING)
+
+    prompts = make_prompts(args.prompts, args.duplicates)
+    print(
+        f"{len(prompts)} prompts ({len(prompts) - len(set(prompts))} duplicates), "
+        f"server limit {args.server_rpm:g}/min, {args.error_rate:.0%} injected errors"
+    )
+    print(f"  {'mode':<10} {'completed':>9} {'lost':>6} {'completed/s':>12} {'requests':>9} {'errors':>7} {'retries':>8} {'coalesced':>10}")
+
+    started = time.perf_counter()
+    baseline = asyncio.run(fire_once(prompts, args))
+    report("fire-once", baseline, len(prompts), time.perf_counter() - started)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as data_dir:
+        os.chdir(data_dir)
+        try:
+            agent = gateway_agent(args, data_dir)
+            started = time.perf_counter()
+            result = asyncio.run(through_gateway(agent, prompts))
+            lost = report("gateway", result, len(prompts), time.perf_counter() - started)
+            print(f"  limiter rate scale at the end: {agent.gateway.limiter.scale:.2f}")
+            agent.close()
+        finally:
+            os.chdir(cwd)
+    sys.exit(1 if lost else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+End-to-end pipeline benchmark suite (pytest-benchmark)
+Times each pipeline phase against synthetic backlogs of 1k, 10k and 100k
+tasks with an offline model client. The benchmark's extra info holds the
+memory of the loaded backlog, the phase's peak memory on top of it, model
+calls and tokens, and calls per span.
+
+Usage: pytest benchmarks/bench_pipeline.py [--benchmark-json out.json]
+
+Environment:
+  BENCH_SIZES              backlog sizes (default 1000,10000,100000)
+  BENCH_MODEL_LATENCY      fake model time to first token in seconds (default 0)
+  BENCH_TOKENS_PER_SECOND  fake model generation rate (default 0, instant)
+  BENCH_FIXTURES_DIR       replay recorded responses from here instead of the fake
+"""
+
+import asyncio
+import logging
+import os
+import random
+import shutil
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.model_clients import FakeModelClient, ReplayClient
+from src.models import Task, TaskPriority, TaskStatus
+from src.project_manager import ProjectManagerAgent
+from src.task_store import open_task_store
+
+CONFIG_PATH = Path(__file__).parent.parent / "config" / "agent_config.json"
+SIZES = [int(size) for size in os.getenv("BENCH_SIZES", "1000,10000,100000").split(",")]
+PHASES = [
+    "run_daily_automation",
+    "generate_sprint_plan",
+    "check_feature_parity",
+    "suggest_next_tasks",
+    "run_pipeline",
+]
+ROUNDS = 3
+
+logging.disable(logging.WARNING)
+
+
+def synthetic_tasks(count: int, seed: int = 7):
+    """A backlog shaped like a real one: mostly done, some blocked, a few dependency chains"""
+    rng = random.Random(seed)
+    now = datetime.now()
+    statuses = [TaskStatus.COMPLETED] * 6 + [TaskStatus.TODO] * 2 + [
+        TaskStatus.IN_PROGRESS, TaskStatus.REVIEW, TaskStatus.BLOCKED
+    ]
+    priorities = [TaskPriority.CRITICAL] + [TaskPriority.HIGH] * 2 + [TaskPriority.MEDIUM] * 4 + [TaskPriority.LOW] * 3
+    areas = ["focus timer", "quest log", "streaks", "rewards", "character sheet", "reminders", "sync", "settings"]
+    for n in range(1, count + 1):
+        created = now - timedelta(days=rng.uniform(0, 90))
+        area = rng.choice(areas)
+        dependencies = [f"TASK-{rng.randrange(1, n):04d}"] if n > 1 and rng.random() < 0.1 else None
+        yield Task(
+            f"TASK-{n:04d}",
+            f"{rng.choice(['Fix', 'Add', 'Polish', 'Port'])} {area} {n}",
+            f"Work on the {area} flow for the {rng.choice(['ios', 'android'])} app",
+            rng.choice(priorities),
+            rng.choice(statuses),
+            rng.choice(["ios", "android", "both"]),
+            rng.choice([1.0, 2.0, 4.0, 8.0]),
+            None,
+            None,
+            dependencies,
+            [area],
+            created,
+            created + timedelta(days=rng.uniform(0, 14))
+        )
+
+
+def make_client():
+    fixtures_dir = os.getenv("BENCH_FIXTURES_DIR")
+    if fixtures_dir:
+        return ReplayClient(fixtures_dir)
+    return FakeModelClient(
+        latency_seconds=float(os.getenv("BENCH_MODEL_LATENCY", "0")),
+        tokens_per_second=float(os.getenv("BENCH_TOKENS_PER_SECOND", "0")),
+        seed=1
+    )
+
+
+@pytest.fixture(scope="module")
+def backlogs(tmp_path_factory):
+    """Data directories holding each synthetic backlog, built once per run"""
+    built = {}
+    for size in SIZES:
+        root = tmp_path_factory.mktemp(f"backlog_{size}")
+        cwd = os.getcwd()
+        os.chdir(root)
+        try:
+            store = open_task_store({"backend": "json", "data_dir": "data"})
+            store.add_many(synthetic_tasks(size))
+            store.save()
+            store.close()
+            # Seed the status-transition log so no phase pays for it
+            agent = ProjectManagerAgent(None, config_path=str(CONFIG_PATH))
+            agent.flow
+            agent.close()
+        finally:
+            os.chdir(cwd)
+        built[size] = root
+    return built
+
+
+class Workspace:
+    """A fresh copy of a backlog per round, with a loaded agent"""
+
+    def __init__(self, template: Path, root: Path):
+        self.template = template
+        self.root = root
+        self.rounds = 0
+        self.agent = None
+
+    def prepare(self, telemetry: bool = False):
+        self.close()
+        self.rounds += 1
+        directory = self.root / f"round_{self.rounds}"
+        shutil.copytree(self.template, directory)
+        os.chdir(directory)
+        agent = ProjectManagerAgent(None, config_path=str(CONFIG_PATH))
+        agent.client = make_client()
+        agent.response_cache.bypass = True
+        agent.store
+        agent.flow
+        agent.telemetry.enabled = telemetry
+        self.agent = agent
+        return agent
+
+    def close(self):
+        if self.agent is not None:
+            self.agent.close()
+            self.agent = None
+
+
+def run_phase(agent: ProjectManagerAgent, phase: str):
+    result = getattr(agent, phase)()
+    if asyncio.iscoroutine(result):
+        result = asyncio.run(result)
+    return result
+
+
+def profile_phase(workspace: Workspace, phase: str) -> dict:
+    """One untimed run with telemetry and tracemalloc on: memory and calls"""
+    tracemalloc.start()
+    try:
+        agent = workspace.prepare(telemetry=True)
+        loaded, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        run_phase(agent, phase)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    telemetry = agent.telemetry
+    counters = {}
+    for (name, _), value in telemetry.counters.items():
+        counters[name] = counters.get(name, 0) + value
+    model_calls = sum(h.count for name, h in telemetry.spans.items() if name.startswith("model."))
+    return {
+        "backlog_memory_mb": round(loaded / 2 ** 20, 1),
+        "peak_memory_mb": round((peak - loaded) / 2 ** 20, 1),
+        "model_calls": model_calls,
+        "input_tokens": counters.get("model_input_tokens", 0),
+        "output_tokens": counters.get("model_output_tokens", 0),
+        "calls": {name: histogram.count for name, histogram in sorted(telemetry.spans.items())},
+    }
+
+
+@pytest.mark.parametrize("size", SIZES, ids=lambda size: f"{size}_tasks")
+@pytest.mark.parametrize("phase", PHASES)
+def test_phase(benchmark, backlogs, tmp_path, phase, size):
+    cwd = os.getcwd()
+    workspace = Workspace(backlogs[size], tmp_path)
+    try:
+        benchmark.group = phase
+        benchmark.pedantic(
+            run_phase,
+            setup=lambda: ((workspace.prepare(), phase), {}),
+            rounds=ROUNDS,
+            iterations=1
+        )
+        benchmark.extra_info.update(profile_phase(workspace, phase))
+    finally:
+        workspace.close()
+        os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", *sys.argv[1:]]))
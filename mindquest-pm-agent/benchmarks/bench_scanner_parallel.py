@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Codebase scanner benchmark
+Measures full-parse throughput of the scanner for increasing worker counts on
+a synthetic Swift/Kotlin tree, plus the cost of an unchanged rescan.
+
+Usage: python benchmarks/bench_scanner_parallel.py [--files 5000] [--jobs 1,2,4,8]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.codebase_scanner import CodebaseScanner
+
+SWIFT_TEMPLATE = """import SwiftUI
+import Combine
+
+struct {name}View: View {{
+    @EnvironmentObject var gameManager: GameManager
+
+    var body: some View {{
+        VStack {{
+            Text("{name}")
+        }}
+    }}
+
+    func refresh{name}() {{
+        gameManager.objectWillChange.send()
+    }}
+}}
+
+class {name}Manager: ObservableObject {{
+    @Published var items: [String] = []
+
+    func load() {{
+        items = (0..<100).map {{ "item\\($0)" }}
+    }}
+}}
+"""
+
+KOTLIN_TEMPLATE = """package com.mindlabs.quest.{package}
+
+import androidx.compose.runtime.Composable
+import androidx.lifecycle.ViewModel
+
+data class {name}State(val items: List<String> = emptyList())
+
+class {name}ViewModel : ViewModel() {{
+    fun load{name}() {{
+        println("{name}")
+    }}
+}}
+
+@Composable
+fun {name}Screen(viewModel: {name}ViewModel) {{
+    viewModel.load{name}()
+}}
+"""
+
+
+def build_tree(root: Path, files: int, repeat: int):
+    """Write ``files`` synthetic sources, each body repeated ``repeat`` times"""
+    for i in range(files):
+        name = f"Feature{i}"
+        directory = root / f"module{i % 64}"
+        directory.mkdir(parents=True, exist_ok=True)
+        if i % 2:
+            (directory / f"{name}.swift").write_text(SWIFT_TEMPLATE.format(name=name) * repeat)
+        else:
+            (directory / f"{name}.kt").write_text(
+                KOTLIN_TEMPLATE.format(name=name, package=f"module{i % 64}") * repeat
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20, help="Template repetitions per file")
+    parser.add_argument("--jobs", default=None, help="Comma separated worker counts")
+    args = parser.parse_args()
+
+    cpu_count = os.cpu_count() or 1
+    job_counts = (
+        [int(j) for j in args.jobs.split(",")] if args.jobs
+        else sorted({1, 2, 4, 8, 16, cpu_count} & set(range(1, cpu_count + 1)))
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "src"
+        build_tree(root, args.files, args.repeat)
+        print(f"{args.files} files, {cpu_count} CPUs")
+        print(f"{'jobs':>5} {'seconds':>9} {'files/s':>9} {'speedup':>8}")
+
+        baseline = None
+        for jobs in job_counts:
+            index_path = Path(tmp) / f"index_{jobs}.json"
+            scanner = CodebaseScanner({"android": root}, index_path=str(index_path), jobs=jobs)
+            started = time.perf_counter()
+            result = scanner.scan()
+            elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+            print(f"{jobs:>5} {elapsed:>9.3f} {result.parsed_files / elapsed:>9.0f} {baseline / elapsed:>7.2f}x")
+            scanner.save_index()
+
+        rescanner = CodebaseScanner({"android": root}, index_path=str(index_path))
+        started = time.perf_counter()
+        rescanner.scan()
+        print(f"unchanged rescan: {time.perf_counter() - started:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
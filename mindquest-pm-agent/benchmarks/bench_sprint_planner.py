@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Sprint planner benchmark
+Compares the dependency-aware knapsack planner with the previous greedy loop
+on synthetic backlogs: runtime, hours scheduled, critical hours scheduled and
+dependency violations. Capacities above 256h are planned with coarser
+knapsack units, so they are measured as well.
+
+Usage: python benchmarks/bench_sprint_planner.py [--sizes 1000,10000,50000] [--capacities 84,840,8400]
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models import Task, TaskPriority, TaskStatus
+from src.sprint_planner import plan_sprint
+
+# One developer for a two-week sprint, then ten and a hundred of them
+CAPACITY_HOURS = "84,840,8400"
+
+
+def make_backlog(size: int, seed: int = 7):
+    """Random backlog where ~30% of tasks depend on one or two earlier tasks"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    priorities = list(TaskPriority)
+    statuses = [TaskStatus.TODO] * 6 + [TaskStatus.IN_PROGRESS, TaskStatus.COMPLETED]
+    tasks = []
+    for i in range(size):
+        dependencies = []
+        if i and rng.random() < 0.3:
+            dependencies = [f"TASK-{rng.randrange(max(0, i - 500), i):05d}" for _ in range(rng.randint(1, 2))]
+        tasks.append(Task(
+            id=f"TASK-{i:05d}",
+            title=f"Task {i}",
+            description="",
+            priority=rng.choice(priorities),
+            status=rng.choice(statuses),
+            platform="both",
+            estimated_hours=rng.choice([1, 2, 3, 4, 6, 8, 12, 16]) + rng.choice([0, 0.5]),
+            dependencies=dependencies,
+            created_at=start + timedelta(minutes=i),
+            updated_at=start + timedelta(minutes=i)
+        ))
+    return tasks
+
+
+def greedy_plan(tasks, capacity_hours):
+    """The previous generate_sprint_plan selection loop"""
+    priority_tasks = [
+        task for task in tasks
+        if task.status in [TaskStatus.TODO, TaskStatus.IN_PROGRESS]
+        and task.priority in [TaskPriority.CRITICAL, TaskPriority.HIGH]
+    ]
+    priority_tasks.sort(key=lambda x: (x.priority.value, x.created_at))
+    selected = []
+    total_hours = 0
+    for task in priority_tasks:
+        if total_hours + task.estimated_hours <= capacity_hours:
+            selected.append(task)
+            total_hours += task.estimated_hours
+    return selected
+
+
+def describe(selected, by_id):
+    chosen = {task.id for task in selected}
+    hours = sum(task.estimated_hours for task in selected)
+    critical = sum(t.estimated_hours for t in selected if t.priority == TaskPriority.CRITICAL)
+    violations = sum(
+        1 for task in selected for dep in task.dependencies
+        if dep not in chosen and by_id[dep].status != TaskStatus.COMPLETED
+    )
+    return hours, critical, violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1000,10000,50000")
+    parser.add_argument("--capacities", default=CAPACITY_HOURS, help="Sprint capacities in hours")
+    args = parser.parse_args()
+
+    print(f"{'tasks':>7} {'capacity':>8} {'planner':>8} {'seconds':>8} {'hours':>7} {'critical h':>10} "
+          f"{'dep violations':>15}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        tasks = make_backlog(size)
+        by_id = {task.id: task for task in tasks}
+        for capacity in (float(c) for c in args.capacities.split(",")):
+            started = time.perf_counter()
+            greedy = greedy_plan(tasks, capacity)
+            greedy_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            selection = plan_sprint(
+                [t for t in tasks if t.status in (TaskStatus.TODO, TaskStatus.IN_PROGRESS)],
+                capacity,
+                resolve_status=lambda task_id: by_id[task_id].status if task_id in by_id else None
+            )
+            planner_seconds = time.perf_counter() - started
+
+            for name, selected, seconds in (
+                ("greedy", greedy, greedy_seconds),
+                ("knapsack", selection.tasks, planner_seconds),
+            ):
+                hours, critical, violations = describe(selected, by_id)
+                print(f"{size:>7} {capacity:>8.0f} {name:>8} {seconds:>8.3f} {hours:>7.1f} {critical:>10.1f} "
+                      f"{violations:>15}")
+
+
+if __name__ == "__main__":
+    main()
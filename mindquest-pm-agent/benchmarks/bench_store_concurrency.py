@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Task store concurrency stress benchmark
+Runs N processes against one store, each creating tasks and incrementing the
+hours of a few shared tasks with compare-and-swap updates, then checks that
+no increment was lost and no id was handed out twice. ``--no-cas`` does the
+same read-modify-write without a version check, for comparison.
+
+Usage: python benchmarks/bench_store_concurrency.py [--processes 8] [--ops 300] [--backend json]
+"""
+
+import argparse
+import multiprocessing
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models import Task, TaskPriority, TaskStatus
+from src.task_store import VersionConflict, open_task_store
+
+SHARED_TASKS = 10
+
+
+def storage_config(backend: str, data_dir: str, compact_after: int) -> dict:
+    return {
+        "backend": backend,
+        "data_dir": data_dir,
+        "sqlite_path": str(Path(data_dir) / "tasks.db"),
+        # Small enough that processes compact underneath each other
+        "compact_after": compact_after,
+        "lock_timeout_seconds": 60,
+    }
+
+
+def increment(store, task_id: str, cas: bool) -> int:
+    """Add one hour to a task; returns the number of version conflicts hit"""
+    conflicts = 0
+    while True:
+        store.refresh()
+        task = store.get(task_id)
+        hours = task.estimated_hours + 1
+        try:
+            store.update(task_id, expected_version=task.version if cas else None, estimated_hours=hours)
+            return conflicts
+        except VersionConflict:
+            conflicts += 1
+
+
+def worker(args) -> dict:
+    config, worker_id, ops, cas = args
+    rng = random.Random(worker_id)
+    store = open_task_store(config)
+    created, increments, conflicts = [], 0, 0
+    started = time.perf_counter()
+    for n in range(ops):
+        if n % 2:
+            task_id = store.allocate_id()
+            store.add(Task(task_id, f"Worker {worker_id} task {n}", "", TaskPriority.MEDIUM, TaskStatus.TODO, "ios", 1.0))
+            created.append(task_id)
+        else:
+            conflicts += increment(store, f"SHARED-{rng.randrange(SHARED_TASKS)}", cas)
+            increments += 1
+    elapsed = time.perf_counter() - started
+    store.close()
+    return {"created": created, "increments": increments, "conflicts": conflicts, "elapsed": elapsed}
+
+
+def run(backend: str, processes: int, ops: int, cas: bool, compact_after: int) -> dict:
+    with tempfile.TemporaryDirectory() as data_dir:
+        config = storage_config(backend, data_dir, compact_after)
+        store = open_task_store(config)
+        store.add_many(
+            Task(f"SHARED-{n}", f"Shared {n}", "", TaskPriority.MEDIUM, TaskStatus.TODO, "both", 0.0)
+            for n in range(SHARED_TASKS)
+        )
+        store.close()
+
+        started = time.perf_counter()
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.map(worker, [(config, n, ops, cas) for n in range(processes)])
+        wall = time.perf_counter() - started
+
+        store = open_task_store(config)
+        hours = sum(store.get(f"SHARED-{n}").estimated_hours for n in range(SHARED_TASKS))
+        stored = len(store)
+        store.close()
+
+    created = [task_id for result in results for task_id in result["created"]]
+    return {
+        "wall": wall,
+        "ops": processes * ops,
+        "increments": sum(result["increments"] for result in results),
+        "hours": hours,
+        "created": len(created),
+        "unique_ids": len(set(created)),
+        "stored": stored - SHARED_TASKS,
+        "conflicts": sum(result["conflicts"] for result in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processes", type=int, default=8, help="Concurrent worker processes")
+    parser.add_argument("--ops", type=int, default=300, help="Operations per process (half creates, half increments)")
+    parser.add_argument("--backend", choices=["json", "sqlite", "both"], default="both")
+    parser.add_argument("--compact-after", type=int, default=200, help="Journal records before compaction")
+    parser.add_argument("--no-cas", action="store_true", help="Also run unchecked read-modify-write updates")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.WARNING)
+
+    backends = ["json", "sqlite"] if args.backend == "both" else [args.backend]
+    modes = [True, False] if args.no_cas else [True]
+    print(f"{args.processes} processes x {args.ops} operations, {SHARED_TASKS} shared tasks")
+    print(f"  {'store':<14} {'ops/s':>8} {'conflicts':>10} {'lost updates':>13} {'ids':>12}")
+    failed = False
+    for backend in backends:
+        for cas in modes:
+            result = run(backend, args.processes, args.ops, cas, args.compact_after)
+            lost = result["increments"] - round(result["hours"])
+            ids_ok = result["unique_ids"] == result["created"] == result["stored"]
+            label = backend + ("" if cas else " (no CAS)")
+            print(
+                f"  {label:<14} {result['ops'] / result['wall']:>8.0f} {result['conflicts']:>10} "
+                f"{lost:>13} {'unique' if ids_ok else 'DUPLICATED':>12}"
+            )
+            if cas and (lost or not ids_ok):
+                failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
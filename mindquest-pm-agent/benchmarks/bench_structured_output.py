@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Structured output benchmark
+Compares the streaming array parser with buffering the whole response and
+extracting it with the previous non-greedy regex: time to the first
+suggested task at a simulated generation rate, and how many suggestions
+survive a set of awkward but common response shapes.
+
+Usage: python benchmarks/bench_structured_output.py [--tokens-per-second 60]
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.structured_output import StructuredArrayParser, TaskSuggestion
+
+SUGGESTIONS = [
+    {
+        "title": f"Suggestion {n}",
+        "description": "Bring the focus timer, streak rewards and reminder settings to parity across platforms",
+        "platform": "ios" if n % 2 else "android",
+        "priority": "high",
+        "estimated_hours": 6,
+    }
+    for n in range(5)
+]
+
+# Response shapes seen in practice: prose around the array, a fence, nested
+# arrays, brackets inside strings, trailing commas, a cut-off last element
+CASES = {
+    "plain": json.dumps(SUGGESTIONS),
+    "prose and fence": "Here are five tasks [ranked]:\n```json\n" + json.dumps(SUGGESTIONS, indent=2) + "\n```",
+    "nested arrays": json.dumps([dict(s, tags=["ux", "parity"]) for s in SUGGESTIONS]),
+    "bracket in string": json.dumps([dict(s, title=f"[{s['platform']}] {s['title']}") for s in SUGGESTIONS]),
+    "trailing commas": json.dumps(SUGGESTIONS, indent=2).replace('"estimated_hours": 6', '"estimated_hours": 6,').replace("\n]", ",\n]"),
+    "truncated": json.dumps(SUGGESTIONS)[:-40],
+}
+
+
+def regex_extract(content: str):
+    """The previous approach"""
+    match = re.search(r'\[.*?\]', content, re.DOTALL)
+    if not match:
+        return []
+    try:
+        return [TaskSuggestion.model_validate(s) for s in json.loads(match.group())]
+    except (json.JSONDecodeError, ValueError, TypeError, AttributeError):
+        return []
+
+
+async def generate(text: str, chars_per_second: float, chunk_chars: int = 12):
+    """Yield text at a steady rate, like a streamed model response"""
+    delay = chunk_chars / chars_per_second
+    for start in range(0, len(text), chunk_chars):
+        await asyncio.sleep(delay)
+        yield text[start:start + chunk_chars]
+
+
+async def first_task_buffered(text: str, chars_per_second: float) -> float:
+    started = time.perf_counter()
+    parts = [chunk async for chunk in generate(text, chars_per_second)]
+    regex_extract("".join(parts))
+    return time.perf_counter() - started
+
+
+async def first_task_streamed(text: str, chars_per_second: float) -> float:
+    started = time.perf_counter()
+    parser = StructuredArrayParser(TaskSuggestion)
+    async for chunk in generate(text, chars_per_second):
+        if parser.feed(chunk):
+            return time.perf_counter() - started
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tokens-per-second", type=float, default=60, help="Simulated generation rate")
+    args = parser.parse_args()
+
+    # Roughly four characters per output token
+    chars_per_second = args.tokens_per_second * 4
+    text = CASES["prose and fence"]
+    buffered = asyncio.run(first_task_buffered(text, chars_per_second))
+    streamed = asyncio.run(first_task_streamed(text, chars_per_second))
+    print(f"Time to first task, {len(text)} chars at {args.tokens_per_second:g} tokens/s")
+    print(f"  buffer + regex     {buffered:>6.2f} s")
+    print(f"  streaming parser   {streamed:>6.2f} s")
+
+    print(f"\nSuggestions recovered (of {len(SUGGESTIONS)})")
+    print(f"  {'case':<20} {'regex':>6} {'parser':>7}")
+    for name, content in CASES.items():
+        recovered = StructuredArrayParser(TaskSuggestion).parse(content)
+        print(f"  {name:<20} {len(regex_extract(content)):>6} {len(recovered):>7}")
+
+    content = CASES["nested arrays"]
+    runs = 200
+    started = time.perf_counter()
+    for _ in range(runs):
+        StructuredArrayParser(TaskSuggestion).parse(content)
+    per_kb = (time.perf_counter() - started) / runs / (len(content) / 1024)
+    print(f"\nParser cost: {per_kb * 1000:.2f} ms per KB of response")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection benchmark
+Builds the persistent MinHash/LSH index over a synthetic backlog with planted
+near-duplicates, then times duplicate checks against a scan of every task
+and clusters the backlog, reporting how many planted duplicates were found.
+
+Usage: python benchmarks/bench_task_dedupe.py [--tasks 100000] [--duplicates 0.05] [--checks 200]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models import Task, TaskPriority, TaskStatus
+from src.task_dedupe import DedupeIndex, cluster_duplicates, jaccard, shingles
+
+WORDS = ("focus timer quest log streak reward shop character sheet reminder sync settings onboarding "
+         "notification leaderboard achievement widget haptics layout crash launch dark mode colour voiceover "
+         "label state restoration background refresh deep link memory leak scrolling migration schema analytics "
+         "event ipad pixel galaxy tablet landscape portrait animation sound badge calendar export import").split()
+SYLLABLES = "ka lo mi ren tu sa vo ni pe dra gul fen ish ta mor zi".split()
+
+
+def vocabulary(size: int, rng: random.Random):
+    """App words plus made-up ones, with Zipf weights so a few words are common and most are rare"""
+    words = list(WORDS)
+    while len(words) < size:
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        if word not in words:
+            words.append(word)
+    return words, [1 / rank for rank in range(1, size + 1)]
+
+
+def synthetic_tasks(count: int, duplicates: float, seed: int = 13):
+    """Random tasks; a share of them are reworded copies of an earlier task. Returns (tasks, planted pairs)"""
+    rng = random.Random(seed)
+    words, weights = vocabulary(5000, rng)
+
+    def sample(k: int):
+        return list(dict.fromkeys(rng.choices(words, weights, k=k)))
+
+    tasks, planted = [], []
+    for n in range(1, count + 1):
+        task_id = f"TASK-{n:04d}"
+        if tasks and rng.random() < duplicates:
+            original = rng.choice(tasks)
+            reworded = original.description.split()
+            # Reword: drop one description word and add another
+            reworded.pop(rng.randrange(len(reworded)))
+            reworded.insert(rng.randrange(len(reworded) + 1), sample(1)[0])
+            title, description = original.title, " ".join(reworded)
+            planted.append((original.id, task_id))
+        else:
+            title = " ".join(sample(5)).capitalize()
+            description = " ".join(sample(16))
+        tasks.append(Task(task_id, title, description, TaskPriority.MEDIUM, TaskStatus.TODO, "both", 2.0))
+    return tasks, planted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=100000, help="Synthetic backlog size")
+    parser.add_argument("--duplicates", type=float, default=0.05, help="Share of tasks that reword an earlier one")
+    parser.add_argument("--checks", type=int, default=200, help="Duplicate checks to time")
+    args = parser.parse_args()
+
+    tasks, planted = synthetic_tasks(args.tasks, args.duplicates)
+    by_id = {task.id: task for task in tasks}
+    terms = {task.id: shingles(task.title, task.description) for task in tasks}
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        index = DedupeIndex(path=str(Path(data_dir) / "dedupe_index.db"))
+        started = time.perf_counter()
+        index.sync(tasks)
+        build = time.perf_counter() - started
+        started = time.perf_counter()
+        DedupeIndex(path=index.path).sync(tasks)
+        resync = time.perf_counter() - started
+        print(f"{len(tasks)} tasks, {len(planted)} planted near-duplicates")
+        print(f"  index built in {build:.2f}s; reopened and synced unchanged in {resync:.2f}s")
+
+        rng = random.Random(3)
+        probes = [rng.choice(tasks) for _ in range(args.checks)]
+
+        def lsh_check(task):
+            tokens = terms[task.id]
+            return [
+                task_id for task_id in index.candidates(tokens)
+                if task_id != task.id and jaccard(tokens, terms[task_id]) >= index.threshold
+            ]
+
+        def scan_check(task):
+            tokens = terms[task.id]
+            return [
+                other.id for other in tasks
+                if other.id != task.id and jaccard(tokens, terms[other.id]) >= index.threshold
+            ]
+
+        lsh_times, agreed, found_by_scan = [], 0, 0
+        for task in probes:
+            started = time.perf_counter()
+            lsh_check(task)
+            lsh_times.append((time.perf_counter() - started) * 1000)
+        scan_times = []
+        for task in probes[:max(3, args.checks // 40)]:
+            started = time.perf_counter()
+            expected = set(scan_check(task))
+            scan_times.append((time.perf_counter() - started) * 1000)
+            found_by_scan += len(expected)
+            agreed += len(expected & set(lsh_check(task)))
+        print(f"  {'check':<16} {'p50 ms':>8} {'p95 ms':>8}")
+        lsh_times.sort()
+        print(f"  {'lsh':<16} {statistics.median(lsh_times):>8.2f} {lsh_times[int(len(lsh_times) * 0.95) - 1]:>8.2f}")
+        print(f"  {'linear scan':<16} {statistics.median(scan_times):>8.2f} {max(scan_times):>8.2f}")
+        if found_by_scan:
+            print(f"  lsh found {agreed} of the {found_by_scan} duplicates the scan found")
+
+        started = time.perf_counter()
+        clusters = cluster_duplicates(index, lambda task_id: terms.get(task_id) if task_id in by_id else None)
+        elapsed = time.perf_counter() - started
+        index.close()
+
+    cluster_of = {task_id: n for n, cluster in enumerate(clusters) for task_id in cluster}
+    recovered = sum(1 for a, b in planted if a in cluster_of and cluster_of.get(a) == cluster_of.get(b))
+    pairs = len(tasks) * (len(tasks) - 1) // 2
+    print(f"  dedupe: {len(clusters)} clusters in {elapsed:.2f}s (all-pairs would compare {pairs:,} pairs)")
+    print(f"  planted pairs recovered: {recovered} of {len(planted)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Task journal benchmark
+Compares per-mutation cost of full snapshot rewrites against journal appends
+as the task store grows.
+
+Usage: python benchmarks/bench_task_journal.py [--sizes 1000,10000,50000]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.task_journal import TaskJournal
+
+
+def make_task(index: int) -> dict:
+    now = datetime.now().isoformat()
+    return {
+        "id": f"TASK-{index:04d}",
+        "title": f"Benchmark task {index}",
+        "description": "Synthetic task used to measure storage cost",
+        "priority": "medium",
+        "status": "todo",
+        "platform": "both",
+        "estimated_hours": 4.0,
+        "assigned_to": None,
+        "due_date": None,
+        "dependencies": [],
+        "tags": ["benchmark"],
+        "created_at": now,
+        "updated_at": now
+    }
+
+
+def bench_full_rewrite(directory: Path, tasks: dict, mutations: int) -> float:
+    """Previous behaviour: rewrite data/tasks.json with indent=2 per mutation"""
+    path = directory / "tasks.json"
+    start = time.perf_counter()
+    for i in range(mutations):
+        tasks[f"TASK-{i:04d}"]["status"] = "in_progress"
+        with open(path, 'w') as f:
+            json.dump(tasks, f, indent=2)
+    return (time.perf_counter() - start) / mutations
+
+
+def bench_journal(directory: Path, tasks: dict, mutations: int) -> float:
+    """Journal behaviour: append one compact record per mutation"""
+    journal = TaskJournal(data_dir=str(directory), compact_after=10_000_000)
+    journal.write_snapshot(tasks)
+    start = time.perf_counter()
+    for i in range(mutations):
+        journal.append_set(f"TASK-{i:04d}", {
+            "status": "in_progress",
+            "updated_at": datetime.now().isoformat()
+        })
+    elapsed = (time.perf_counter() - start) / mutations
+    journal.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1000,10000,50000")
+    parser.add_argument("--mutations", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} {'rewrite ms/op':>15} {'journal ms/op':>15} {'speedup':>9}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        tasks = {f"TASK-{i:04d}": make_task(i) for i in range(size)}
+        with tempfile.TemporaryDirectory() as tmp:
+            rewrite = bench_full_rewrite(Path(tmp), tasks, args.mutations)
+        with tempfile.TemporaryDirectory() as tmp:
+            journal = bench_journal(Path(tmp), tasks, args.mutations)
+        print(f"{size:>8} {rewrite * 1000:>15.3f} {journal * 1000:>15.3f} {rewrite / journal:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Task model benchmark
+Compares memory per task and snapshot load/save throughput of the slotted Task
+and its record codec against the previous dataclass with asdict/ISO strings.
+
+Tasks are decoded from strings the way a store reads them, so repeated
+values are separate objects unless the model interns them.
+
+Usage: python benchmarks/bench_task_model.py [--tasks 100000] [--runs 3]
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models import Task, TaskPriority, TaskStatus
+
+
+@dataclass
+class LegacyTask:
+    """The Task dataclass and codec as they were before the slotted model"""
+    id: str
+    title: str
+    description: str
+    priority: TaskPriority
+    status: TaskStatus
+    platform: str
+    estimated_hours: float
+    assigned_to: Optional[str] = None
+    due_date: Optional[datetime] = None
+    dependencies: List[str] = None
+    tags: List[str] = None
+    created_at: datetime = None
+    updated_at: datetime = None
+
+    def __post_init__(self):
+        if self.created_at is None:
+            self.created_at = datetime.now()
+        if self.updated_at is None:
+            self.updated_at = datetime.now()
+        if self.dependencies is None:
+            self.dependencies = []
+        if self.tags is None:
+            self.tags = []
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data['priority'] = self.priority.value
+        data['status'] = self.status.value
+        data['created_at'] = self.created_at.isoformat()
+        data['updated_at'] = self.updated_at.isoformat()
+        if self.due_date:
+            data['due_date'] = self.due_date.isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LegacyTask":
+        data = dict(data)
+        data['priority'] = TaskPriority(data['priority'])
+        data['status'] = TaskStatus(data['status'])
+        data['created_at'] = datetime.fromisoformat(data['created_at'])
+        data['updated_at'] = datetime.fromisoformat(data['updated_at'])
+        if data.get('due_date'):
+            data['due_date'] = datetime.fromisoformat(data['due_date'])
+        return cls(**data)
+
+
+def legacy_snapshot(count: int) -> str:
+    """Snapshot text in the previous format (ISO timestamps, every key present)"""
+    statuses = list(TaskStatus)
+    priorities = list(TaskPriority)
+    start = datetime(2025, 1, 1)
+    tasks = {}
+    for i in range(count):
+        task = LegacyTask(
+            id=f"TASK-{i + 1:04d}",
+            title=f"Benchmark task {i + 1}",
+            description="Synthetic task used to measure model cost",
+            priority=priorities[i % len(priorities)],
+            status=statuses[i % len(statuses)],
+            platform=("ios", "android", "both")[i % 3],
+            estimated_hours=float(1 + i % 8),
+            assigned_to=("ios_dev", "android_dev", None)[i % 3],
+            dependencies=[f"TASK-{i:04d}"] if i else [],
+            tags=["benchmark", ("ui", "api", "data")[i % 3]],
+            created_at=start + timedelta(minutes=i),
+            updated_at=start + timedelta(minutes=i, seconds=30)
+        )
+        tasks[task.id] = task.to_dict()
+    return json.dumps(tasks)
+
+
+def measure_memory(decode, text: str) -> float:
+    """Bytes still held per task once the snapshot is decoded and the parsed JSON dropped"""
+    gc.collect()
+    tracemalloc.start()
+    tasks = [decode(record) for record in json.loads(text).values()]
+    gc.collect()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_task = allocated / len(tasks)
+    del tasks
+    return per_task
+
+
+def best_of(runs: int, fn) -> float:
+    samples = []
+    for _ in range(runs):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return min(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=100000, help="Tasks in the snapshot")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    legacy_text = legacy_snapshot(args.tasks)
+    legacy_records = json.loads(legacy_text)
+    slotted_text = json.dumps({
+        task_id: Task.from_record(record).to_record() for task_id, record in legacy_records.items()
+    })
+    slotted_records = json.loads(slotted_text)
+
+    legacy_tasks = [LegacyTask.from_dict(record) for record in legacy_records.values()]
+    slotted_tasks = [Task.from_record(record) for record in slotted_records.values()]
+
+    variants = [
+        ("dataclass + asdict/ISO", LegacyTask.from_dict, legacy_text, legacy_tasks,
+         lambda task: task.to_dict()),
+        ("slotted + record codec", Task.from_record, slotted_text, slotted_tasks,
+         lambda task: task.to_record()),
+    ]
+
+    print(f"{args.tasks} tasks, best of {args.runs} runs")
+    print(f"{'model':<24} {'bytes/task':>11} {'snapshot KB':>12} {'load tasks/s':>13} {'save tasks/s':>13}")
+    for name, decode, text, tasks, encode in variants:
+        per_task = measure_memory(decode, text)
+        load = best_of(args.runs, lambda: [decode(r) for r in json.loads(text).values()])
+        save = best_of(args.runs, lambda: json.dumps({task.id: encode(task) for task in tasks}))
+        print(
+            f"{name:<24} {per_task:>11.0f} {len(text) / 1024:>12.0f} "
+            f"{args.tasks / load:>13.0f} {args.tasks / save:>13.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
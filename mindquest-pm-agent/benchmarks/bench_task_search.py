@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Task search benchmark
+Builds the inverted index over a synthetic backlog and times queries (with
+and without filters and paging) against a linear substring scan of every
+task, then times incremental index updates against a full rebuild.
+
+Usage: python benchmarks/bench_task_search.py [--tasks 100000] [--queries 200]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models import Task, TaskPriority, TaskStatus
+from src.task_search import TaskSearchIndex
+
+AREAS = ["focus timer", "quest log", "streak tracking", "rewards shop", "character sheet", "reminders",
+         "offline sync", "settings", "onboarding", "notifications", "leaderboard", "achievements"]
+VERBS = ["Fix", "Add", "Polish", "Port", "Refactor", "Test", "Localise", "Animate"]
+DETAILS = ["crash on launch", "layout on small screens", "dark mode colours", "VoiceOver labels",
+           "state restoration", "background refresh", "widget", "haptics", "empty state", "deep links",
+           "memory leak", "slow scrolling", "Core Data migration", "Room schema", "analytics events"]
+QUERIES = ["focus timer crash", "offline sync", "dark mode", "quest rewards animation", "memory leak",
+           "voiceover labels settings", "streak", "deep links notifications", "room schema migration",
+           "leaderboard slow scrolling"]
+
+
+def synthetic_tasks(count: int, seed: int = 11):
+    rng = random.Random(seed)
+    for n in range(1, count + 1):
+        area = rng.choice(AREAS)
+        detail = rng.choice(DETAILS)
+        yield Task(
+            f"TASK-{n:04d}",
+            f"{rng.choice(VERBS)} {area} {detail}",
+            f"The {area} screen has a problem with {rng.choice(DETAILS)}; also check {rng.choice(DETAILS)} "
+            f"on {rng.choice(['iPhone', 'iPad', 'Pixel', 'Galaxy'])} devices.",
+            rng.choice(list(TaskPriority)),
+            rng.choice(list(TaskStatus)),
+            rng.choice(["ios", "android", "both"]),
+            rng.choice([1.0, 2.0, 4.0, 8.0]),
+            tags=[area.split()[0], rng.choice(["ui", "data", "perf", "a11y"])]
+        )
+
+
+def linear_scan(tasks, query: str, status=None):
+    """What grepping tasks.json amounts to: substring match on every task, no ranking"""
+    words = query.lower().split()
+    found = []
+    for task in tasks:
+        if status is not None and task.status.value != status:
+            continue
+        text = f"{task.title} {task.description} {' '.join(task.tags)}".lower()
+        if any(word in text for word in words):
+            found.append(task.id)
+    return found
+
+
+def timed(fn, repeat: int):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    times.sort()
+    return statistics.median(times), times[int(len(times) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=100000, help="Synthetic backlog size")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per case")
+    args = parser.parse_args()
+
+    tasks = list(synthetic_tasks(args.tasks))
+    index = TaskSearchIndex()
+    started = time.perf_counter()
+    index.rebuild(tasks)
+    build = time.perf_counter() - started
+    # Memory from a second, traced build; tracing would distort the timing above
+    tracemalloc.start()
+    traced = TaskSearchIndex()
+    traced.rebuild(tasks)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{len(tasks)} tasks: index built in {build:.2f}s, {size / 2 ** 20:.1f} MB")
+
+    rng = random.Random(5)
+    cases = [
+        ("ranked, top 20", lambda: index.search(rng.choice(QUERIES))),
+        ("status=todo", lambda: index.search(rng.choice(QUERIES), status="todo")),
+        ("ios, high/critical", lambda: index.search(rng.choice(QUERIES), priority=["high", "critical"], platform="ios")),
+        ("page 50", lambda: index.search(rng.choice(QUERIES), limit=20, offset=980)),
+    ]
+    print(f"  {'query':<20} {'p50 ms':>8} {'p95 ms':>8}")
+    for label, query in cases:
+        p50, p95 = timed(query, args.queries)
+        print(f"  {label:<20} {p50:>8.2f} {p95:>8.2f}")
+    p50, p95 = timed(lambda: linear_scan(tasks, rng.choice(QUERIES)), max(3, args.queries // 20))
+    print(f"  {'linear scan':<20} {p50:>8.2f} {p95:>8.2f}")
+
+    # Status changes only touch filter columns; a retitle re-indexes one task
+    def update_status():
+        task = rng.choice(tasks)
+        task.status = rng.choice(list(TaskStatus))
+        index.observe(task)
+
+    def retitle():
+        task = rng.choice(tasks)
+        task.title = f"{rng.choice(VERBS)} {rng.choice(AREAS)} {rng.choice(DETAILS)}"
+        index.observe(task)
+
+    print(f"  {'update':<20} {'p50 ms':>8} {'p95 ms':>8}")
+    for label, update in (("status change", update_status), ("retitle", retitle)):
+        p50, p95 = timed(update, args.queries * 10)
+        print(f"  {label:<20} {p50:>8.3f} {p95:>8.3f}")
+    print(f"  {'full rebuild':<20} {build * 1000:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Telemetry overhead benchmark
+Times a traced method call with telemetry disabled and enabled against the
+undecorated method, both for an empty method and for creating tasks.
+
+Usage: python benchmarks/bench_telemetry.py [--calls 200000] [--tasks 5000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.project_manager import ProjectManagerAgent
+from src.telemetry import Telemetry, traced
+
+
+class Probe:
+    def __init__(self, telemetry: Telemetry):
+        self.telemetry = telemetry
+
+    def plain(self):
+        pass
+
+    @traced()
+    def traced(self):
+        pass
+
+
+def per_call(fn, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - started) / calls
+
+
+def create_tasks(enabled: bool, undecorated: bool, count: int) -> float:
+    """Seconds per create_task on a fresh JSON store"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            agent = ProjectManagerAgent(None, config_path=str(Path(cwd) / "config" / "agent_config.json"))
+            agent.telemetry.enabled = enabled
+            create = ProjectManagerAgent.create_task.__wrapped__ if undecorated else ProjectManagerAgent.create_task
+            agent.store  # open before timing
+            started = time.perf_counter()
+            with agent.bulk():
+                for n in range(count):
+                    create(agent, f"Task {n}", "Benchmark task", platform="ios")
+            elapsed = time.perf_counter() - started
+            agent.close()
+        finally:
+            os.chdir(cwd)
+    return elapsed / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200000, help="Calls of the empty method")
+    parser.add_argument("--tasks", type=int, default=5000, help="Tasks created per run")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.INFO)
+
+    disabled, enabled = Probe(Telemetry(enabled=False)), Probe(Telemetry(enabled=True))
+    plain = per_call(disabled.plain, args.calls)
+    print(f"Empty method, {args.calls} calls")
+    print(f"  undecorated          {plain * 1e9:>8.0f} ns/call")
+    print(f"  traced, disabled     {per_call(disabled.traced, args.calls) * 1e9:>8.0f} ns/call")
+    print(f"  traced, enabled      {per_call(enabled.traced, args.calls) * 1e9:>8.0f} ns/call")
+
+    print(f"\ncreate_task, {args.tasks} tasks in one batch")
+    for label, is_enabled, undecorated in (
+        ("undecorated", False, True),
+        ("traced, disabled", False, False),
+        ("traced, enabled", True, False),
+    ):
+        print(f"  {label:<20} {create_tasks(is_enabled, undecorated, args.tasks) * 1e6:>8.1f} µs/task")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,30 +6,95 @@ Provides command-line interface for agent operations
 
 import click
 import asyncio
+import functools
+import math
 import os
+import shutil
 import sys
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
 from dotenv import load_dotenv
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.model_clients import CLIENT_MODES
 from src.project_manager import ProjectManagerAgent, TaskPriority, TaskStatus
+from src.scheduler import AgentScheduler
+from src.task_io import detect_format
+from src.task_store import migrate_json_to_sqlite
 
 # Load environment variables
 load_dotenv()
 
 
+def report_and_close(agent, profile: bool = False):
+    """Print response cache and token usage statistics for this run and release resources"""
+    stats = agent.response_cache.stats()
+    if stats["hits"] or stats["misses"]:
+        click.echo(
+            f"\nResponse cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['saved_latency_seconds']}s model latency saved",
+            err=True
+        )
+    usage = agent.token_usage.totals()
+    if usage:
+        calls = sum(entry["calls"] for entry in usage.values())
+        tokens_in = sum(entry["input_tokens"] for entry in usage.values())
+        tokens_out = sum(entry["output_tokens"] for entry in usage.values())
+        click.echo(f"Model usage: {calls} calls, {tokens_in} tokens in, {tokens_out} tokens out", err=True)
+    if profile:
+        click.echo(f"\n{agent.telemetry.format_profile()}", err=True)
+    agent.close()
+
+
+def requires_model(command):
+    """Exit before running a command that calls the live model when no API key is set"""
+    @functools.wraps(command)
+    def wrapper(agent, *args, **kwargs):
+        if agent.needs_api_key and not agent.api_key:
+            click.echo("Error: ANTHROPIC_API_KEY not found in environment variables", err=True)
+            sys.exit(1)
+        return command(agent, *args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def _open_stream(path: str, mode: str):
+    """Open ``path`` for text I/O, or stdin/stdout for '-' (left open)"""
+    if path == '-':
+        yield sys.stdin if 'r' in mode else sys.stdout
+        return
+    with open(path, mode, encoding='utf-8', newline='') as f:
+        yield f
+
+
+def _or_dash(value) -> str:
+    return "-" if value is None else str(value)
+
+
 @click.group()
+@click.option('--no-cache', is_flag=True, help='Ignore cached model responses for this run')
+@click.option('--profile', is_flag=True, help='Print a per-phase timing breakdown when the command finishes')
+@click.option('--telemetry-out', type=click.Path(), default=None,
+              help='Write spans and counters to this file (.json, otherwise OpenMetrics text)')
+@click.option('--model-client', type=click.Choice(CLIENT_MODES), default=None,
+              help='Live API, record fixtures, replay fixtures, or an offline fake (default: llm.client.mode)')
 @click.pass_context
-def cli(ctx):
+def cli(ctx, no_cache, profile, telemetry_out, model_client):
     """MindQuest Project Manager Agent CLI"""
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
-        click.echo("Error: ANTHROPIC_API_KEY not found in environment variables", err=True)
-        sys.exit(1)
-    
-    ctx.obj = ProjectManagerAgent(api_key)
+    # Cheap to build: the model client and task store are created on first use
+    agent = ProjectManagerAgent(os.getenv("ANTHROPIC_API_KEY"))
+    agent.response_cache.bypass = no_cache
+    if model_client:
+        agent.model_client_config["mode"] = model_client
+    if profile or telemetry_out:
+        agent.telemetry.enabled = True
+    if telemetry_out:
+        agent.telemetry.export_path = Path(telemetry_out)
+    ctx.obj = agent
+    ctx.call_on_close(lambda: report_and_close(agent, profile))
 
 
 @cli.command()
@@ -45,6 +110,7 @@ def standup(agent):
 
 @cli.command()
 @click.pass_obj
+@requires_model
 def sprint_plan(agent):
     """Generate sprint plan"""
     async def run():
@@ -62,9 +128,14 @@ def sprint_plan(agent):
 
 @cli.command()
 @click.option('--platform', default='both', help='Platform to analyze (ios/android/both)')
+@click.option('--jobs', type=int, default=None, help='Parser processes (default: one per CPU)')
 @click.pass_obj
-def analyze(agent, platform):
+@requires_model
+def analyze(agent, platform, jobs):
     """Analyze codebase for issues and improvements"""
+    if jobs:
+        agent.scanner.jobs = jobs
+    
     async def run():
         click.echo(f"Analyzing {platform} codebase...")
         analysis = await agent.analyze_codebase(platform)
@@ -78,12 +149,20 @@ def analyze(agent, platform):
 
 @cli.command()
 @click.pass_obj
+@requires_model
 def parity(agent):
     """Check feature parity between platforms"""
     async def run():
         click.echo("Checking feature parity between iOS and Android...")
         report = await agent.check_feature_parity()
         click.echo("Parity check complete. Report saved to reports/")
+        click.echo(
+            f"{len(report['ios_features'])} iOS and {len(report['android_features'])} Android features, "
+            f"{report['matched']} matched; {len(report['missing_in_android'])} missing in Android, "
+            f"{len(report['missing_in_ios'])} missing in iOS"
+        )
+        if report['tasks_created']:
+            click.echo(f"Created {len(report['tasks_created'])} parity tasks: {', '.join(report['tasks_created'])}")
         if 'analysis' in report:
             click.echo("\nAnalysis:")
             click.echo(report['analysis'][:500] + "...")
@@ -114,12 +193,12 @@ def create_task(agent, title, description, platform, priority, hours):
 @click.pass_obj
 def list_tasks(agent):
     """List all tasks"""
-    if not agent.tasks:
+    if not agent.store:
         click.echo("No tasks found")
         return
     
     click.echo("\nTasks:")
-    for task in agent.tasks.values():
+    for task in agent.store.values():
         status_emoji = {
             TaskStatus.TODO: "📝",
             TaskStatus.IN_PROGRESS: "🔄",
@@ -143,6 +222,60 @@ def list_tasks(agent):
         )
 
 
+@cli.command()
+@click.argument('query')
+@click.option('--status', multiple=True, type=click.Choice([s.value for s in TaskStatus]), help='Only tasks with this status (repeatable)')
+@click.option('--priority', multiple=True, type=click.Choice([p.value for p in TaskPriority]), help='Only tasks with this priority (repeatable)')
+@click.option('--platform', multiple=True, help='Only tasks on this platform (repeatable)')
+@click.option('--limit', default=20, show_default=True, help='Results per page')
+@click.option('--page', default=1, show_default=True, help='Page of results')
+@click.pass_obj
+def search(agent, query, status, priority, platform, limit, page):
+    """Search task titles, descriptions and tags"""
+    results = agent.search_tasks(
+        query, status=status, priority=priority, platform=platform, limit=limit, offset=(page - 1) * limit
+    )
+    if not results.total:
+        click.echo("No matching tasks")
+        return
+    
+    pages = (results.total + limit - 1) // limit
+    click.echo(f"\n{results.total} matching tasks (page {page} of {pages}):")
+    for hit in results.hits:
+        task = hit.task
+        if task is None:
+            continue
+        click.echo(
+            f"[{task.id}] {task.title} ({task.priority.value}) "
+            f"- {task.status.value} - {task.platform}  {click.style(f'{hit.score:.2f}', dim=True)}"
+        )
+
+
+@cli.command()
+@click.option('--link', is_flag=True, help='Tag each duplicate duplicate-of:<id> of the oldest task in its cluster')
+@click.option('--limit', default=20, show_default=True, help='Clusters to print')
+@click.pass_obj
+def dedupe(agent, link, limit):
+    """Find clusters of near-duplicate tasks"""
+    clusters = agent.find_duplicate_clusters()
+    if not clusters:
+        click.echo("No near-duplicate tasks found")
+        return
+    
+    duplicates = sum(len(cluster) - 1 for cluster in clusters)
+    click.echo(f"\n{len(clusters)} clusters, {duplicates} duplicate tasks:")
+    for canonical, *others in clusters[:limit]:
+        click.echo(f"[{canonical.id}] {canonical.title} ({canonical.status.value})")
+        for task in others:
+            click.echo(f"    [{task.id}] {task.title} ({task.status.value})")
+    if len(clusters) > limit:
+        click.echo(f"... and {len(clusters) - limit} more clusters")
+    
+    if link:
+        linked = agent.link_duplicates(clusters)
+        click.echo(f"Linked {linked} duplicate tasks")
+
+
 @cli.command()
 @click.argument('task_id')
 @click.argument('status', type=click.Choice(['todo', 'in_progress', 'review', 'completed', 'blocked']))
@@ -156,6 +289,7 @@ def update_status(agent, task_id, status):
 @cli.command()
 @click.option('--context', default='', help='Additional context for suggestions')
 @click.pass_obj
+@requires_model
 def suggest(agent, context):
     """Get AI-powered task suggestions"""
     async def run():
@@ -181,26 +315,251 @@ def daily(agent):
 
 
 @cli.command()
+@click.option('--days', type=int, default=None, help='Scheduling horizon in days (default: sprint length)')
+@click.option('--timeline', is_flag=True, help='Print each member\'s day-by-day timeline')
+@click.option('--dry-run', is_flag=True, help='Do not save assignments')
 @click.pass_obj
-def metrics(agent):
+def assign(agent, days, timeline, dry_run):
+    """Assign open tasks to team members"""
+    plan = agent.assign_tasks(horizon_days=days, persist=not dry_run)
+    
+    click.echo(f"\nAssigned {len(plan.assignments)} tasks, {len(plan.unassigned)} unassigned")
+    for member, hours in sorted(plan.member_hours.items()):
+        click.echo(f"  {member}: {hours:.1f}h")
+    
+    if timeline:
+        for member, member_days in sorted(plan.timeline.items()):
+            click.echo(f"\n{member}:")
+            for day in member_days:
+                entries = ", ".join(f"{entry['task_id']} ({entry['hours']}h)" for entry in day["tasks"])
+                click.echo(f"  {day['date']}: {entries}")
+
+
+@cli.command()
+@click.option('--context', default='', help='Additional context for suggestions')
+@click.option('--concurrency', type=int, default=None, help='Maximum concurrent model calls')
+@click.pass_obj
+@requires_model
+def pipeline(agent, context, concurrency):
+    """Run daily automation, sprint plan, parity check and suggestions concurrently"""
+    if concurrency:
+        agent.max_concurrent_requests = concurrency
+    
+    async def run():
+        click.echo("Running full pipeline...")
+        results = await agent.run_pipeline(context)
+        for phase, result in results.items():
+            click.echo(f"  {phase}: {'ok' if result is not None else 'failed'}")
+    
+    asyncio.run(run())
+
+
+@cli.command()
+@click.option('--sprints', default=4, help='Number of recent sprints to show')
+@click.pass_obj
+def metrics(agent, sprints):
     """Display project metrics"""
     click.echo("\nProject Metrics:")
-    click.echo(f"Total Tasks: {len(agent.tasks)}")
+    metrics = agent.metrics
+    click.echo(f"Total Tasks: {metrics.total}")
+    click.echo(f"Completed: {metrics.count(TaskStatus.COMPLETED)}")
+    click.echo(f"In Progress: {metrics.count(TaskStatus.IN_PROGRESS)}")
+    click.echo(f"Blocked: {metrics.count(TaskStatus.BLOCKED)}")
+    
+    if metrics.total:
+        click.echo(f"Completion Rate: {metrics.completion_rate:.1f}%")
+    
+    click.echo(f"Average Cycle Time: {agent.calculate_average_completion_time()} hours")
+    click.echo(f"Average Lead Time: {agent.flow.average_lead_time_hours()} hours")
+    click.echo(f"Sprint Velocity: {agent.calculate_sprint_velocity()} points")
     
-    completed = len([t for t in agent.tasks.values() if t.status == TaskStatus.COMPLETED])
-    in_progress = len([t for t in agent.tasks.values() if t.status == TaskStatus.IN_PROGRESS])
-    blocked = len([t for t in agent.tasks.values() if t.status == TaskStatus.BLOCKED])
+    report = agent.flow.sprint_report(last=sprints)
+    if report:
+        click.echo("\nSprint  Dates                    Done  Points  Lead h  Cycle h")
+        for sprint in report:
+            click.echo(
+                f"{sprint['sprint']:>6}  {sprint['start']} - {sprint['end']}  "
+                f"{sprint['throughput']:>4}  {sprint['points']:>6}  "
+                f"{_or_dash(sprint['lead_time_hours']):>6}  {_or_dash(sprint['cycle_time_hours']):>7}"
+            )
+
+
+@cli.command()
+@click.option('--days', default=90, help='Days of history to cover')
+@click.option('--window', default=7, help='Trailing throughput window in days')
+@click.option('--chart', 'chart_path', default=None, type=click.Path(),
+              help='Chart PNG path (default: reports/charts/trends_YYYYMMDD.png)')
+@click.option('--no-chart', is_flag=True, help='Print the table without rendering charts')
+@click.option('--rows', default=14, help='Most recent days to print')
+@click.pass_obj
+def trends(agent, days, window, chart_path, no_chart, rows):
+    """Burndown, rolling throughput and blocked-task ratio over time"""
+    trends = agent.get_trends(days=days, window=window)
+    if not len(trends):
+        click.echo("No metrics history yet; it is recorded by the daily automation")
+        return
     
-    click.echo(f"Completed: {completed}")
-    click.echo(f"In Progress: {in_progress}")
-    click.echo(f"Blocked: {blocked}")
+    click.echo(f"\n{'day':<10} {'total':>6} {'done':>6} {'blocked':>8} {'remaining h':>12} {f'done/{window}d':>9}")
+    for i in range(max(0, len(trends) - rows), len(trends)):
+        remaining = trends.remaining_hours[i]
+        click.echo(
+            f"{str(trends.days[i]):<10} {trends.total[i]:>6} {trends.completed[i]:>6} "
+            f"{trends.blocked_ratio[i]:>7.1%} {'-' if math.isnan(remaining) else f'{remaining:.1f}':>12} "
+            f"{trends.rolling_throughput[i]:>9}"
+        )
     
-    if agent.tasks:
-        completion_rate = (completed / len(agent.tasks)) * 100
-        click.echo(f"Completion Rate: {completion_rate:.1f}%")
+    if not no_chart:
+        path = agent.save_trends_chart(trends, chart_path)
+        click.echo(f"\nCharts saved to {path}")
+
+
+@cli.command()
+@click.option('--db', 'db_path', default=None, help='SQLite database path (default: storage.sqlite_path)')
+@click.pass_obj
+def migrate_store(agent, db_path):
+    """Copy tasks from data/tasks.json into a SQLite store"""
+    storage = agent.config.get("storage", {})
+    data_dir = storage.get("data_dir", "data")
+    db_path = db_path or storage.get("sqlite_path", os.path.join(data_dir, "tasks.db"))
     
-    click.echo(f"Average Completion Time: {agent.calculate_average_completion_time()} hours")
-    click.echo(f"Sprint Velocity: {agent.calculate_sprint_velocity()} points")
+    migrated = migrate_json_to_sqlite(data_dir, db_path)
+    click.echo(f"Migrated {migrated} tasks to {db_path}")
+    click.echo('Set "storage": {"backend": "sqlite"} in config/agent_config.json to use it')
+
+
+@cli.command()
+@click.option('--run-now', multiple=True, help='Also run this job immediately (repeatable)')
+@click.pass_obj
+@requires_model
+def daemon(agent, run_now):
+    """Stay resident and run jobs on the analysis_schedule"""
+    scheduler = AgentScheduler.for_agent(agent)
+    if not scheduler.jobs:
+        click.echo("No jobs configured in analysis_schedule", err=True)
+        sys.exit(1)
+    
+    # Load tasks, metrics and the model client once; every run reuses them
+    agent.metrics
+    agent.client
+    
+    click.echo(f"Scheduler running {len(scheduler.jobs)} jobs; Ctrl+C to stop")
+    try:
+        asyncio.run(scheduler.run(run_now=list(run_now)))
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.pass_obj
+def schedule(agent):
+    """Show scheduled jobs, their next run and latency stats"""
+    scheduler = AgentScheduler.for_agent(agent)
+    click.echo(f"\n{'job':<16} {'schedule':<10} {'next run':<17} {'runs':>5} {'fail':>5} {'skip':>5} "
+               f"{'p50 s':>7} {'p95 s':>7} {'max s':>7}  last")
+    for job in scheduler.jobs.values():
+        stats = job.stats.to_dict()
+        click.echo(
+            f"{job.name:<16} {job.schedule.spec:<10} {job.next_run:%Y-%m-%d %H:%M} "
+            f"{stats['runs']:>5} {stats['failures']:>5} {stats['skipped']:>5} "
+            f"{_or_dash(stats['p50_seconds']):>7} {_or_dash(stats['p95_seconds']):>7} "
+            f"{_or_dash(stats['max_seconds']):>7}  {stats['last_status'] or '-'}"
+        )
+
+
+@cli.command()
+@click.option('--type', 'report_type', default=None, help='Only this report type (sprint/analysis/parity/standup/metrics)')
+@click.option('--limit', default=20, help='Number of recent reports to list')
+@click.option('--reindex', is_flag=True, help='Rebuild the index from the reports directory first')
+@click.pass_obj
+def reports(agent, report_type, limit, reindex):
+    """List recent reports from the report index"""
+    if reindex:
+        click.echo(f"Indexed {agent.reports.reindex()} reports")
+    
+    click.echo(f"\n{'type':<9} {'reports':>8} {'archived':>9} {'KB':>9}  {'oldest':<16}  newest")
+    for row in agent.reports.stats():
+        click.echo(
+            f"{row['type']:<9} {row['reports']:>8} {row['archived']:>9} {row['bytes'] / 1024:>9.1f}  "
+            f"{row['oldest']:%Y-%m-%d %H:%M}  {row['newest']:%Y-%m-%d %H:%M}"
+        )
+    
+    click.echo(f"\nLatest {limit}:")
+    for entry in agent.reports.latest(report_type, limit=limit):
+        where = f" [{entry.archive}]" if entry.archive else ""
+        summary = ", ".join(f"{key}={value}" for key, value in entry.summary.items())
+        click.echo(f"  {entry.created:%Y-%m-%d %H:%M}  {entry.path}{where}  {summary}")
+
+
+@cli.command()
+@click.option('--dry-run', is_flag=True, help='Only count what would be archived or deleted')
+@click.pass_obj
+def archive_reports(agent, dry_run):
+    """Apply report retention: archive old reports and delete expired ones"""
+    result = agent.reports.apply_retention(dry_run=dry_run)
+    prefix = "Would archive" if dry_run else "Archived"
+    click.echo(
+        f"{prefix} {result['archived']} reports ({result['archived_bytes'] / 1024:.1f} KB), "
+        f"{'would delete' if dry_run else 'deleted'} {result['deleted']}"
+    )
+
+
+@cli.command(name='import')
+@click.argument('source', type=click.Path(allow_dash=True))
+@click.option('--format', 'fmt', type=click.Choice(['jsonl', 'csv']), default=None,
+              help='Input format (default: from the file suffix, else jsonl)')
+@click.option('--on-conflict', type=click.Choice(['skip', 'replace']), default='skip',
+              help='What to do with records whose id already exists')
+@click.option('--batch-size', type=int, default=500, help='Records validated and written per batch')
+@click.option('--strict', is_flag=True, help='Validate everything first; import nothing if any record is invalid')
+@click.option('--dry-run', is_flag=True, help='Validate and count without writing')
+@click.option('--allow-duplicates', is_flag=True, help='Create near-duplicates of existing tasks instead of merging them')
+@click.pass_obj
+def import_tasks(agent, source, fmt, on_conflict, batch_size, strict, dry_run, allow_duplicates):
+    """Import tasks from a JSONL or CSV file ('-' for stdin)"""
+    fmt = detect_format(source, fmt)
+    with _open_stream(source, 'r') as f:
+        if strict and not f.seekable():
+            # Strict mode reads the input twice; spool stdin to disk first
+            spooled = tempfile.TemporaryFile('w+', encoding='utf-8', newline='')
+            shutil.copyfileobj(f, spooled)
+            spooled.seek(0)
+            f = spooled
+        result = agent.import_tasks(
+            f, fmt, on_conflict=on_conflict, batch_size=batch_size, strict=strict, dry_run=dry_run,
+            deduplicate=not allow_duplicates
+        )
+    
+    verb = "Would import" if result.dry_run else "Imported"
+    click.echo(
+        f"{verb} {result.imported} tasks ({result.replaced} replaced, "
+        f"{result.skipped} skipped as duplicates, {result.merged} merged into similar tasks, "
+        f"{result.invalid} invalid)"
+    )
+    for line_number, message in result.errors:
+        click.echo(f"  line {line_number}: {message}", err=True)
+    if result.invalid > len(result.errors):
+        click.echo(f"  ... and {result.invalid - len(result.errors)} more", err=True)
+    if strict and result.invalid:
+        click.echo("Nothing imported (--strict)", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.option('--output', '-o', default='-', type=click.Path(allow_dash=True), help="Output file ('-' for stdout)")
+@click.option('--format', 'fmt', type=click.Choice(['jsonl', 'csv']), default=None,
+              help='Output format (default: from the file suffix, else jsonl)')
+@click.option('--status', multiple=True, help='Only tasks with this status (repeatable)')
+@click.option('--priority', multiple=True, help='Only tasks with this priority (repeatable)')
+@click.option('--platform', multiple=True, help='Only tasks on this platform (repeatable)')
+@click.pass_obj
+def export(agent, output, fmt, status, priority, platform):
+    """Export tasks as JSONL or CSV"""
+    fmt = detect_format(None if output == '-' else output, fmt)
+    with _open_stream(output, 'w') as f:
+        written = agent.export_tasks(f, fmt, status=status, priority=priority, platform=platform)
+    if output != '-':
+        click.echo(f"Exported {written} tasks to {output}")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,408 @@
+"""
+MindQuest Project Manager Agent - Codebase Scanner
+Incremental source tree scanner backed by a persistent file-hash index
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 3
+
+# Below this many files to parse, process start-up costs more than it saves
+PARALLEL_THRESHOLD = 200
+
+LANGUAGES = {
+    ".swift": "swift",
+    ".kt": "kotlin",
+    ".kts": "kotlin",
+    ".java": "java",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+}
+
+SKIP_DIRS = {
+    ".git", ".gradle", ".idea", ".expo", ".build", "build", "Build",
+    "DerivedData", "Pods", "node_modules", "__pycache__",
+}
+
+TYPE_PATTERNS = {
+    "swift": re.compile(
+        r"^\s*(?:(?:public|private|internal|fileprivate|open|final|indirect)\s+)*"
+        r"(?:class|struct|enum|protocol|actor|extension)\s+([A-Za-z_]\w*)",
+        re.MULTILINE
+    ),
+    "kotlin": re.compile(
+        r"^\s*(?:(?:public|private|internal|protected|open|abstract|sealed|data|enum|"
+        r"annotation|inner|value|inline)\s+)*(?:class|interface|object)\s+([A-Za-z_]\w*)",
+        re.MULTILINE
+    ),
+    "java": re.compile(
+        r"^\s*(?:(?:public|private|protected|static|final|abstract)\s+)*"
+        r"(?:class|interface|enum|record)\s+([A-Za-z_]\w*)",
+        re.MULTILINE
+    ),
+    "javascript": re.compile(r"^\s*(?:export\s+)?(?:default\s+)?class\s+([A-Za-z_$][\w$]*)", re.MULTILINE),
+}
+TYPE_PATTERNS["typescript"] = re.compile(
+    r"^\s*(?:export\s+)?(?:default\s+)?(?:abstract\s+)?(?:class|interface|enum|type)\s+([A-Za-z_$][\w$]*)",
+    re.MULTILINE
+)
+
+FUNCTION_PATTERNS = {
+    "swift": re.compile(r"\bfunc\s+([A-Za-z_]\w*)"),
+    "kotlin": re.compile(r"\bfun\s+(?:<[^>]*>\s*)?(?:[\w.]+\.)?([A-Za-z_]\w*)\s*\("),
+    "java": re.compile(
+        r"^\s*(?:(?:public|private|protected|static|final|abstract|synchronized)\s+)+"
+        r"[\w<>\[\],\s]+?\s+([A-Za-z_]\w*)\s*\(",
+        re.MULTILINE
+    ),
+    "javascript": re.compile(
+        r"\bfunction\s+([A-Za-z_$][\w$]*)|\b(?:const|let)\s+([A-Za-z_$][\w$]*)\s*=\s*(?:async\s+)?\([^)]*\)\s*=>"
+    ),
+}
+FUNCTION_PATTERNS["typescript"] = FUNCTION_PATTERNS["javascript"]
+
+IMPORT_PATTERNS = {
+    "swift": re.compile(
+        r"^\s*(?:@testable\s+)?import\s+(?:(?:class|struct|enum|protocol|func|var|let|typealias)\s+)?([\w.]+)",
+        re.MULTILINE
+    ),
+    "kotlin": re.compile(r"^\s*import\s+([\w.]+(?:\.\*)?)", re.MULTILINE),
+    "java": re.compile(r"^\s*import\s+(?:static\s+)?([\w.]+(?:\.\*)?)\s*;", re.MULTILINE),
+    "javascript": re.compile(
+        r"^\s*import\s+(?:[^'\"]*?\s+from\s+)?['\"]([^'\"]+)['\"]|\brequire\(\s*['\"]([^'\"]+)['\"]\s*\)",
+        re.MULTILINE
+    ),
+}
+IMPORT_PATTERNS["typescript"] = IMPORT_PATTERNS["javascript"]
+
+# Top-level declarations with their attributes (possibly on the lines above) and modifiers
+_ATTRIBUTES = r"^((?:@\w+(?:\((?:[^()]|\([^()]*\))*\))?\s+)*)"
+DECLARATION_PATTERNS = {
+    "swift": re.compile(
+        _ATTRIBUTES + r"((?:(?:public|private|internal|fileprivate|open|final)\s+)*)"
+        r"(class|struct|enum|actor)\s+([A-Za-z_]\w*)(?:\s*<[^>{\n]*>)?(?:\s*:\s*([^{\n]+))?",
+        re.MULTILINE
+    ),
+    "kotlin": re.compile(
+        _ATTRIBUTES + r"((?:(?:public|private|internal|protected|open|abstract|sealed|data|enum|inner|value)\s+)*)"
+        r"(class|object|fun)\s+(?:<[^>]*>\s*)?([A-Za-z_]\w*)()",
+        re.MULTILINE
+    ),
+}
+
+SCREEN_SUFFIXES = ("ViewController", "Screen", "View", "Activity", "Fragment")
+MANAGER_SUFFIXES = ("Manager", "Service", "Repository", "Store", "ViewModel", "Controller")
+ENTITY_ATTRIBUTES = {"@Entity", "@Model"}
+MODEL_PROTOCOLS = re.compile(r"\b(?:Codable|Decodable|Encodable|Identifiable)\b")
+
+
+def _first_group(match) -> str:
+    """Return the matched group from a findall result with alternatives"""
+    return match if isinstance(match, str) else next(group for group in match if group)
+
+
+def count_loc(text: str) -> int:
+    """Count non-blank lines that are not line comments"""
+    return sum(
+        1 for line in text.splitlines()
+        if line.strip() and not line.lstrip().startswith("//")
+    )
+
+
+def _feature_kind(attributes: str, modifiers: str, keyword: str, name: str, supertypes: str) -> Optional[str]:
+    """Classify a top-level declaration as a screen, manager, entity, model or other type"""
+    if "private" in modifiers.split():
+        return None
+    if ENTITY_ATTRIBUTES & {attribute.split("(")[0] for attribute in attributes.split()} or "NSManagedObject" in supertypes:
+        return "entity"
+    if keyword == "fun":
+        # Compose screens are functions; other top-level functions are not features
+        return "screen" if "@Composable" in attributes and name.endswith("Screen") else None
+    if name.endswith(SCREEN_SUFFIXES) or re.search(r"\bView\b", supertypes):
+        return "screen"
+    if name.endswith(MANAGER_SUFFIXES):
+        return "manager"
+    if "data" in modifiers.split() or MODEL_PROTOCOLS.search(supertypes):
+        return "model"
+    return "type"
+
+
+def extract_features(text: str, language: str) -> List[List[str]]:
+    """[kind, name] for each top-level screen, manager, entity, model or other type a file declares"""
+    pattern = DECLARATION_PATTERNS.get(language)
+    if pattern is None:
+        return []
+    features = []
+    for attributes, modifiers, keyword, name, supertypes in pattern.findall(text):
+        kind = _feature_kind(attributes, modifiers, keyword, name, supertypes)
+        if kind is not None:
+            features.append([kind, name])
+    return features
+
+
+def parse_source(text: str, language: str) -> Dict[str, Any]:
+    """Extract LOC, type and function declarations, imports and features from a source file"""
+    types = TYPE_PATTERNS[language].findall(text)
+    functions = [_first_group(match) for match in FUNCTION_PATTERNS[language].findall(text)]
+    imports = [_first_group(match) for match in IMPORT_PATTERNS[language].findall(text)]
+    return {
+        "loc": count_loc(text),
+        "types": sorted(set(types)),
+        "functions": sorted(set(functions)),
+        "imports": sorted(set(imports)),
+        "features": extract_features(text, language),
+    }
+
+
+def parse_file(path: str, known_hash: Optional[str] = None) -> Optional[Tuple[str, Optional[Dict[str, Any]]]]:
+    """Hash a file and parse it unless its content matches ``known_hash``.
+
+    Returns ``(hash, summary)`` where summary is None for unchanged content,
+    or None if the file could not be read.
+    """
+    try:
+        with open(path, 'rb') as f:
+            content = f.read()
+    except OSError as e:
+        logger.warning(f"Cannot read {path}: {e}")
+        return None
+    digest = hashlib.sha1(content).hexdigest()
+    if digest == known_hash:
+        return digest, None
+    language = LANGUAGES[os.path.splitext(path)[1]]
+    return digest, {"language": language, **parse_source(content.decode("utf-8", errors="replace"), language)}
+
+
+def _parse_chunk(chunk: List[Tuple[str, str, Optional[str]]]) -> List[Tuple[str, Any]]:
+    """Worker entry point: parse a chunk of (key, path, known_hash) items"""
+    return [(key, parse_file(path, known_hash)) for key, path, known_hash in chunk]
+
+
+@dataclass
+class ScanResult:
+    """Outcome of an incremental scan"""
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    missing_roots: List[str] = field(default_factory=list)
+    parsed_files: int = 0
+    duration: float = 0.0
+    totals: Dict[str, Dict[str, Dict[str, int]]] = field(default_factory=dict)
+    previous: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    files: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
+
+
+class CodebaseScanner:
+    """Walks source roots and keeps a path -> (mtime, size, hash, language, LOC, symbols) index.
+
+    Files whose mtime and size are unchanged are never opened, so rescanning
+    an unchanged tree costs one ``stat`` per file. Changed files are hashed and
+    only re-parsed when their content actually differs. Large batches are
+    parsed in chunks on a process pool of ``jobs`` workers (default: one per
+    CPU) and merged back into the index.
+    """
+
+    def __init__(
+        self,
+        roots: Dict[str, Path],
+        index_path: str = "data/scan_index.json",
+        jobs: Optional[int] = None
+    ):
+        self.roots = {name: Path(path) for name, path in roots.items()}
+        self.index_path = Path(index_path)
+        self.jobs = jobs or os.cpu_count() or 1
+        self.files: Dict[str, Dict[str, Any]] = self._load_index()
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        if not self.index_path.exists():
+            return {}
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable scan index {self.index_path}: {e}")
+            return {}
+        if index.get("version") != INDEX_VERSION:
+            return {}
+        return index.get("files", {})
+
+    def reload_index(self):
+        """Discard what scans since the last ``save_index`` changed in the index"""
+        self.files = self._load_index()
+
+    def save_index(self):
+        """Persist the file index"""
+        os.makedirs(self.index_path.parent, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({"version": INDEX_VERSION, "files": self.files}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.index_path)
+
+    def _walk(self, root: Path) -> Iterator[Tuple[str, os.stat_result]]:
+        """Yield (path, stat) for every source file below ``root``"""
+        stack = [str(root)]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = os.scandir(directory)
+            except OSError as e:
+                logger.warning(f"Cannot read {directory}: {e}")
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS and not entry.name.startswith("."):
+                            stack.append(entry.path)
+                    elif os.path.splitext(entry.name)[1] in LANGUAGES:
+                        yield entry.path, entry.stat()
+
+    def scan(self, root_names: Optional[List[str]] = None) -> ScanResult:
+        """Rescan the selected roots and update the index in place"""
+        started = time.perf_counter()
+        result = ScanResult()
+        root_names = root_names or list(self.roots)
+        seen = set()
+        pending: List[Tuple[str, str, Optional[str]]] = []
+        stats: Dict[str, Tuple[int, int]] = {}
+
+        for name in root_names:
+            root = self.roots[name]
+            if not root.is_dir():
+                result.missing_roots.append(name)
+                continue
+
+            for path, stat in self._walk(root):
+                key = f"{name}/{os.path.relpath(path, root)}"
+                seen.add(key)
+                entry = self.files.get(key)
+                if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                    continue
+                pending.append((key, path, entry["hash"] if entry else None))
+                stats[key] = (stat.st_mtime_ns, stat.st_size)
+
+        for key, parsed in self._parse_files(pending):
+            if parsed is None:
+                continue
+            digest, summary = parsed
+            mtime, size = stats[key]
+            entry = self.files.get(key)
+            if summary is None:
+                # Touched but identical: refresh the stat fields only
+                entry["mtime"] = mtime
+                entry["size"] = size
+                continue
+
+            result.parsed_files += 1
+            if entry:
+                result.previous[key] = entry
+                result.modified.append(key)
+            else:
+                result.added.append(key)
+            self.files[key] = {"mtime": mtime, "size": size, "hash": digest, **summary}
+
+        scanned_prefixes = tuple(f"{name}/" for name in root_names if name not in result.missing_roots)
+        for key in [k for k in self.files if k.startswith(scanned_prefixes) and k not in seen]:
+            result.previous[key] = self.files.pop(key)
+            result.removed.append(key)
+
+        for key, entry in self.files.items():
+            root_name = key.split("/", 1)[0]
+            if root_name not in root_names:
+                continue
+            language_totals = result.totals.setdefault(root_name, {}).setdefault(
+                entry["language"], {"files": 0, "loc": 0, "types": 0}
+            )
+            language_totals["files"] += 1
+            language_totals["loc"] += entry["loc"]
+            language_totals["types"] += len(entry["types"])
+
+        result.files = self.files
+        result.duration = time.perf_counter() - started
+        logger.info(
+            f"Scanned {len(seen)} files in {result.duration:.3f}s "
+            f"({len(result.added)} added, {len(result.modified)} modified, "
+            f"{len(result.removed)} removed, {result.parsed_files} parsed)"
+        )
+        return result
+
+    def _parse_files(self, pending: List[Tuple[str, str, Optional[str]]]) -> Iterator[Tuple[str, Any]]:
+        """Parse pending files, fanning out over a process pool for large batches"""
+        from concurrent.futures import ProcessPoolExecutor
+
+        jobs = min(self.jobs, max(1, len(pending) // 16))
+        if jobs <= 1 or len(pending) < PARALLEL_THRESHOLD:
+            yield from _parse_chunk(pending)
+            return
+
+        # Several chunks per worker keep the pool balanced when file sizes vary
+        chunk_size = max(16, len(pending) // (jobs * 4))
+        chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for parsed_chunk in pool.map(_parse_chunk, chunks):
+                yield from parsed_chunk
+
+
+def summarize_scan(result: ScanResult, max_files: int = 40) -> str:
+    """Render a compact, model-friendly summary of a scan and its changes"""
+    lines = ["Codebase totals:"]
+    for root_name, languages in sorted(result.totals.items()):
+        parts = [
+            f"{language}: {stats['files']} files, {stats['loc']} LOC, {stats['types']} types"
+            for language, stats in sorted(languages.items())
+        ]
+        lines.append(f"- {root_name}: " + "; ".join(parts))
+    for root_name in result.missing_roots:
+        lines.append(f"- {root_name}: source tree not found")
+
+    if not result.changed:
+        lines.append("\nNo source changes since the last analysis.")
+        return "\n".join(lines)
+
+    lines.append(
+        f"\nChanges since last analysis: {len(result.added)} added, "
+        f"{len(result.modified)} modified, {len(result.removed)} removed"
+    )
+
+    def describe(key: str) -> str:
+        entry = result.files.get(key)
+        old = result.previous.get(key)
+        if entry is None:
+            return f"- removed {key} (types: {', '.join(old['types']) or 'none'})"
+        if old is None:
+            return f"- added {key} ({entry['loc']} LOC, types: {', '.join(entry['types']) or 'none'})"
+        new_types = sorted(set(entry["types"]) - set(old["types"]))
+        gone_types = sorted(set(old["types"]) - set(entry["types"]))
+        detail = f"{old['loc']} -> {entry['loc']} LOC"
+        if new_types:
+            detail += f", new types: {', '.join(new_types)}"
+        if gone_types:
+            detail += f", removed types: {', '.join(gone_types)}"
+        return f"- modified {key} ({detail})"
+
+    changed = result.modified + result.added + result.removed
+    lines.extend(describe(key) for key in changed[:max_files])
+    if len(changed) > max_files:
+        remaining: Dict[str, int] = {}
+        for key in changed[max_files:]:
+            directory = os.path.dirname(key)
+            remaining[directory] = remaining.get(directory, 0) + 1
+        lines.append(f"- ... and {len(changed) - max_files} more files:")
+        for directory, count in sorted(remaining.items(), key=lambda item: -item[1])[:10]:
+            lines.append(f"  - {directory}/: {count} files")
+    return "\n".join(lines)
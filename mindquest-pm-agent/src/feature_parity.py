@@ -0,0 +1,275 @@
+"""
+MindQuest Project Manager Agent - Feature Parity
+Static feature fingerprints of the iOS and Android sources and their fuzzy set difference
+"""
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Tuple
+
+from src.task_search import tokenize
+
+# Features are only compared within a group: entities and plain models are both data
+KIND_GROUPS = {"screen": "screen", "manager": "manager", "entity": "data", "model": "data"}
+
+# Suffixes saying what kind of declaration it is rather than which feature, longest first
+KIND_SUFFIXES = {
+    "screen": ("ViewController", "Screen", "View", "Activity", "Fragment", "Page"),
+    "manager": ("ViewModel", "Repository", "Controller", "Manager", "Service", "Store"),
+    "entity": ("Entity", "Record", "Model", "MO"),
+    "model": ("Model", "DTO"),
+}
+
+# Words naming a platform or framework, which say nothing about the feature
+NOISE_WORDS = frozenset("ios android swift swiftui compose kotlin ui impl default".split())
+
+# Directories whose other types count as models
+MODEL_DIRECTORIES = frozenset("model models entity entities domain".split())
+
+_CAMEL = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+
+def feature_key(kind: str, name: str) -> Tuple[str, ...]:
+    """Normalised words of a declaration name, without its kind suffix: QuestListView -> (quest, list)"""
+    for suffix in KIND_SUFFIXES.get(kind, ()):
+        if name.endswith(suffix) and len(name) > len(suffix):
+            name = name[:-len(suffix)]
+            break
+    words = tokenize(" ".join(_CAMEL.findall(name)))
+    return tuple(word for word in words if word not in NOISE_WORDS) or tuple(words)
+
+
+@dataclass
+class Feature:
+    """A screen, manager, entity or model declared on one platform"""
+    platform: str
+    kind: str
+    name: str
+    path: str
+    key: Tuple[str, ...]
+
+    @property
+    def group(self) -> str:
+        return KIND_GROUPS[self.kind]
+
+    @property
+    def label(self) -> str:
+        return " ".join(self.key)
+
+    @property
+    def tag(self) -> str:
+        """Stable tag for the parity task porting this feature"""
+        return f"parity:{self.other_platform}:{self.group}:{'-'.join(self.key)}"
+
+    @property
+    def other_platform(self) -> str:
+        return "android" if self.platform == "ios" else "ios"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "name": self.name, "path": self.path}
+
+
+@dataclass
+class FeatureMatch:
+    """The same feature found on both platforms"""
+    ios: Feature
+    android: Feature
+    score: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"ios": self.ios.name, "android": self.android.name, "score": round(self.score, 2)}
+
+
+@dataclass
+class ParityDiff:
+    """Features matched across platforms and those found on only one"""
+    revision: str
+    ios_features: List[Feature] = field(default_factory=list)
+    android_features: List[Feature] = field(default_factory=list)
+    matched: List[FeatureMatch] = field(default_factory=list)
+    missing_in_android: List[Feature] = field(default_factory=list)
+    missing_in_ios: List[Feature] = field(default_factory=list)
+
+    @property
+    def fuzzy(self) -> List[FeatureMatch]:
+        """Matches by similar rather than equal names"""
+        return [match for match in self.matched if match.score < 1.0]
+
+    @property
+    def empty(self) -> bool:
+        """Nothing left for the model to explain"""
+        return not (self.missing_in_android or self.missing_in_ios or self.fuzzy)
+
+    def residual(self, max_items: int = 40) -> str:
+        """The gaps and inexact matches as compact text for the model"""
+        lines = [
+            f"Static comparison: {len(self.ios_features)} iOS and {len(self.android_features)} Android features, "
+            f"{len(self.matched)} matched."
+        ]
+        sections = (
+            ("Only on iOS (missing in Android)", [_describe(feature) for feature in self.missing_in_android]),
+            ("Only on Android (missing in iOS)", [_describe(feature) for feature in self.missing_in_ios]),
+            ("Matched by similar names", [
+                f"- {match.ios.name} ({match.ios.kind}) ~ {match.android.name} ({match.android.kind})"
+                for match in self.fuzzy
+            ]),
+        )
+        for heading, items in sections:
+            if not items:
+                continue
+            lines.append(f"\n{heading}:")
+            lines.extend(items[:max_items])
+            if len(items) > max_items:
+                lines.append(f"- ... and {len(items) - max_items} more")
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "revision": self.revision,
+            "ios_features": [feature.to_dict() for feature in self.ios_features],
+            "android_features": [feature.to_dict() for feature in self.android_features],
+            "matched": len(self.matched),
+            "fuzzy_matches": [match.to_dict() for match in self.fuzzy],
+            "missing_in_android": [feature.to_dict() for feature in self.missing_in_android],
+            "missing_in_ios": [feature.to_dict() for feature in self.missing_in_ios],
+        }
+
+
+def _describe(feature: Feature) -> str:
+    return f"- {feature.kind} {feature.name} ({feature.path})"
+
+
+def source_revision(files: Dict[str, Dict[str, Any]], roots: Iterable[str]) -> str:
+    """Digest of the content hashes of every file under ``roots``; changes whenever a source does"""
+    prefixes = tuple(f"{root}/" for root in roots)
+    digest = hashlib.sha1()
+    for key in sorted(key for key in files if key.startswith(prefixes)):
+        digest.update(f"{key}\0{files[key]['hash']}\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def extract_features(files: Dict[str, Dict[str, Any]], roots: Iterable[str], platform: str) -> List[Feature]:
+    """Features declared in the scanned files under ``roots``, one per group and name.
+
+    Other types are kept as models when they live in a models directory.
+    """
+    prefixes = tuple(f"{root}/" for root in roots)
+    language = "swift" if platform == "ios" else "kotlin"
+    features: Dict[Tuple[str, Tuple[str, ...]], Feature] = {}
+    for path in sorted(key for key in files if key.startswith(prefixes)):
+        entry = files[path]
+        if entry.get("language") != language:
+            continue
+        for kind, name in entry.get("features", ()):
+            if kind == "type":
+                directories = {part.lower() for part in path.split("/")[1:-1]}
+                if not directories & MODEL_DIRECTORIES:
+                    continue
+                kind = "model"
+            key = feature_key(kind, name)
+            if not key:
+                continue
+            # Entities win over models of the same name, then the first declaration
+            existing = features.get((KIND_GROUPS[kind], key))
+            if existing is None or (kind == "entity" and existing.kind != "entity"):
+                features[(KIND_GROUPS[kind], key)] = Feature(platform, kind, name, path, key)
+    return list(features.values())
+
+
+@lru_cache(maxsize=1 << 16)
+def _word_similarity(a: str, b: str) -> float:
+    if a == b:
+        return 1.0
+    # Same stem or an abbreviation: tracker / tracking, stat / statistic
+    prefix = len(os.path.commonprefix((a, b)))
+    if prefix >= 5 or (prefix >= 4 and prefix == min(len(a), len(b))):
+        return 0.9
+    # Spelling variants: colour / color
+    ratio = SequenceMatcher(None, a, b).ratio()
+    return ratio if ratio >= 0.85 else 0.0
+
+
+def name_similarity(a: Tuple[str, ...], b: Tuple[str, ...]) -> float:
+    """Jaccard similarity of two feature keys, counting near-identical words as partly shared"""
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    unmatched = list(b)
+    shared = 0.0
+    for word in a:
+        scored = [(_word_similarity(word, other), n) for n, other in enumerate(unmatched)]
+        best, n = max(scored, default=(0.0, -1))
+        if best:
+            shared += best
+            del unmatched[n]
+    return shared / (len(a) + len(b) - shared)
+
+
+def diff_features(
+    ios_features: List[Feature],
+    android_features: List[Feature],
+    threshold: float = 0.8,
+    revision: str = ""
+) -> ParityDiff:
+    """Match features across platforms: equal keys first, then the most similar remaining pairs"""
+    diff = ParityDiff(revision, ios_features, android_features)
+    android_by_key = {(feature.group, feature.key): feature for feature in android_features}
+    ios_left: List[Feature] = []
+    for feature in ios_features:
+        other = android_by_key.pop((feature.group, feature.key), None)
+        if other is None:
+            ios_left.append(feature)
+        else:
+            diff.matched.append(FeatureMatch(feature, other, 1.0))
+
+    # Only leftovers in the same group that share a word's first letters are compared
+    android_left = list(android_by_key.values())
+    blocks: Dict[Tuple[str, str], List[int]] = {}
+    for j, android in enumerate(android_left):
+        for prefix in {word[:3] for word in android.key}:
+            blocks.setdefault((android.group, prefix), []).append(j)
+    pairs: List[Tuple[float, int, int]] = []
+    for i, ios in enumerate(ios_left):
+        # Words sharing first letters bound the words two names can share, and so their similarity
+        hits: Dict[int, int] = {}
+        for word in ios.key:
+            for j in blocks.get((ios.group, word[:3]), ()):
+                hits[j] = hits.get(j, 0) + 1
+        for j, shared in sorted(hits.items()):
+            other = android_left[j].key
+            if shared < threshold * (len(ios.key) + len(other)) / (1 + threshold):
+                continue
+            score = name_similarity(ios.key, other)
+            if score >= threshold:
+                pairs.append((score, i, j))
+    paired_ios, paired_android = set(), set()
+    for score, i, j in sorted(pairs, key=lambda pair: (-pair[0], pair[1], pair[2])):
+        if i in paired_ios or j in paired_android:
+            continue
+        paired_ios.add(i)
+        paired_android.add(j)
+        diff.matched.append(FeatureMatch(ios_left[i], android_left[j], score))
+
+    diff.missing_in_android = [feature for i, feature in enumerate(ios_left) if i not in paired_ios]
+    diff.missing_in_ios = [feature for j, feature in enumerate(android_left) if j not in paired_android]
+    return diff
+
+
+def compare_platforms(
+    files: Dict[str, Dict[str, Any]],
+    ios_roots: List[str],
+    android_roots: List[str],
+    threshold: float = 0.8
+) -> ParityDiff:
+    """Fingerprint both platforms from a scan index and diff them"""
+    return diff_features(
+        extract_features(files, ios_roots, "ios"),
+        extract_features(files, android_roots, "android"),
+        threshold=threshold,
+        revision=source_revision(files, [*ios_roots, *android_roots])
+    )
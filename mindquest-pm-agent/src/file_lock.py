@@ -0,0 +1,110 @@
+"""
+MindQuest Project Manager Agent - File Lock
+Advisory inter-process file locks for stores shared by the daemon, cron jobs and the CLI
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to process-local locking
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class LockTimeout(TimeoutError):
+    """The lock was not acquired within the timeout"""
+
+
+class FileLock:
+    """Exclusive ``flock`` on a lock file, re-entrant within the process.
+
+    ``flock`` locks belong to the open file, so a process holds one
+    ``FileLock`` per lock file and nested ``with lock:`` blocks (and other
+    threads) go through the same object. Waiting polls with a short backoff
+    so a stuck holder surfaces as ``LockTimeout`` instead of a hang. Where
+    ``fcntl`` is unavailable only threads of this process are excluded.
+    """
+
+    def __init__(self, path: str, timeout: Optional[float] = 30.0):
+        self.path = Path(path)
+        self.timeout = timeout
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self._depth > 0
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """Take the lock; with ``blocking=False`` return False instead of waiting"""
+        if not self._thread_lock.acquire(blocking=blocking):
+            return False
+        if self._depth:
+            self._depth += 1
+            return True
+        try:
+            if fcntl is not None:
+                self._lock_file(blocking)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        if self._fd is None and fcntl is not None:
+            self._thread_lock.release()
+            return False
+        self._depth = 1
+        return True
+
+    def _lock_file(self, blocking: bool):
+        os.makedirs(self.path.parent, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        delay = 0.001
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                self._fd = fd
+                return
+            except BlockingIOError:
+                if not blocking:
+                    os.close(fd)
+                    return
+                if deadline is not None and time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise LockTimeout(f"Timed out after {self.timeout}s waiting for {self.path}")
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+    @contextmanager
+    def attempt(self):
+        """Yield True holding the lock if it is free right now, else yield False"""
+        acquired = self.acquire(blocking=False)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self.release()
@@ -0,0 +1,92 @@
+"""
+MindQuest Project Manager Agent - Metrics
+Single-pass task metrics with running totals kept current on every mutation
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, Tuple
+
+from src.models import Task, TaskStatus
+
+IOS_PLATFORMS = ("ios", "both")
+ANDROID_PLATFORMS = ("android", "both")
+# Statuses whose estimated hours still count towards the burndown
+REMAINING_STATUSES = tuple(status for status in TaskStatus if status is not TaskStatus.COMPLETED)
+
+
+class MetricsAggregator:
+    """Running task counters.
+
+    ``rebuild`` computes every counter in one pass over the store. After that
+    ``observe`` is called with each created or updated task: it subtracts the
+    task's previous contribution and adds the new one, so reading metrics
+    never touches the task store.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.by_status: Counter = Counter()
+        self.by_platform: Counter = Counter()
+        # task id -> (status, platform) as last counted
+        self._contributions: Dict[str, Tuple[TaskStatus, str]] = {}
+
+    def rebuild(self, tasks: Iterable[Task]):
+        """Recount everything in a single pass"""
+        self.__init__()
+        for task in tasks:
+            self._add(task.id, (task.status, task.platform))
+
+    def observe(self, task: Task):
+        """Account for a created or updated task"""
+        contribution = (task.status, task.platform)
+        previous = self._contributions.get(task.id)
+        if previous == contribution:
+            return
+        if previous is not None:
+            self._remove(previous)
+        self._add(task.id, contribution)
+
+    def _add(self, task_id: str, contribution: Tuple[TaskStatus, str]):
+        status, platform = contribution
+        self._contributions[task_id] = contribution
+        self.total += 1
+        self.by_status[status] += 1
+        self.by_platform[platform] += 1
+
+    def _remove(self, contribution: Tuple[TaskStatus, str]):
+        status, platform = contribution
+        self.total -= 1
+        self.by_status[status] -= 1
+        self.by_platform[platform] -= 1
+
+    def count(self, status: TaskStatus) -> int:
+        return self.by_status[status]
+
+    def platform_count(self, platforms: Iterable[str]) -> int:
+        return sum(self.by_platform[platform] for platform in platforms)
+
+    @property
+    def completion_rate(self) -> float:
+        """Percentage of all tasks that are completed"""
+        if not self.total:
+            return 0.0
+        return round(self.by_status[TaskStatus.COMPLETED] / self.total * 100, 1)
+
+    @property
+    def sprint_progress(self) -> float:
+        """Percentage of started tasks that are completed"""
+        started = self.total - self.by_status[TaskStatus.TODO]
+        if not started:
+            return 0
+        return round(self.by_status[TaskStatus.COMPLETED] / started * 100, 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current counters in the daily metrics report layout"""
+        return {
+            "total_tasks": self.total,
+            "completed_tasks": self.by_status[TaskStatus.COMPLETED],
+            "in_progress_tasks": self.by_status[TaskStatus.IN_PROGRESS],
+            "blocked_tasks": self.by_status[TaskStatus.BLOCKED],
+            "ios_tasks": self.platform_count(IOS_PLATFORMS),
+            "android_tasks": self.platform_count(ANDROID_PLATFORMS),
+        }
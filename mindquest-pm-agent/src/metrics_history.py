@@ -0,0 +1,267 @@
+"""
+MindQuest Project Manager Agent - Metrics History
+Append-only columnar store of metrics snapshots with vectorized trend queries
+"""
+
+import logging
+import math
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"MQMH"
+FORMAT_VERSION = 1
+HEADER_SIZE = 16
+SECONDS_PER_DAY = 86400
+
+# One fixed-width record per snapshot; NaN marks a value the snapshot did not have
+SAMPLE_DTYPE = np.dtype([
+    ("ts", "<f8"),
+    ("total", "<i4"),
+    ("completed", "<i4"),
+    ("in_progress", "<i4"),
+    ("blocked", "<i4"),
+    ("remaining_hours", "<f4"),
+    ("velocity", "<f4"),
+    ("cycle_hours", "<f4"),
+    ("lead_hours", "<f4"),
+])
+
+# Metrics report key -> sample field
+REPORT_FIELDS = {
+    "total_tasks": "total",
+    "completed_tasks": "completed",
+    "in_progress_tasks": "in_progress",
+    "blocked_tasks": "blocked",
+    "remaining_hours": "remaining_hours",
+    "sprint_velocity": "velocity",
+    "average_completion_time": "cycle_hours",
+    "average_lead_time": "lead_hours",
+}
+
+
+def _header() -> bytes:
+    return MAGIC + bytes([FORMAT_VERSION]) + bytes(HEADER_SIZE - len(MAGIC) - 1)
+
+
+def sample_from_report(metrics: Dict[str, Any]) -> Optional[np.ndarray]:
+    """One history record from a metrics report, or None if it has no timestamp"""
+    timestamp = metrics.get("timestamp")
+    if not timestamp:
+        return None
+    sample = np.zeros(1, dtype=SAMPLE_DTYPE)
+    sample["ts"] = datetime.fromisoformat(timestamp).timestamp()
+    for key, name in REPORT_FIELDS.items():
+        value = metrics.get(key)
+        if SAMPLE_DTYPE[name].kind == "f":
+            sample[name] = math.nan if value is None else value
+        else:
+            sample[name] = value or 0
+    return sample
+
+
+class MetricsHistory:
+    """Metrics snapshots as fixed-width NumPy records in one binary file.
+
+    ``append`` writes a record to the end of the file; ``load`` reads the
+    whole history as a structured array with a single ``np.fromfile``. At
+    40 bytes a snapshot, years of history load in milliseconds. A partial
+    trailing record left by an interrupted write is ignored on read and cut
+    off before the next append.
+    """
+
+    def __init__(self, path: str = "data/metrics_history.bin"):
+        self.path = Path(path)
+
+    @classmethod
+    def from_config(cls, history_config: Optional[Dict[str, Any]] = None) -> "MetricsHistory":
+        """Create a history from the ``metrics_history`` config section"""
+        history_config = history_config or {}
+        return cls(path=history_config.get("path", "data/metrics_history.bin"))
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _records_size(self) -> int:
+        """Bytes of complete records after the header (0 for a missing file)"""
+        if not self.path.exists():
+            return 0
+        size = self.path.stat().st_size - HEADER_SIZE
+        return max(0, size - size % SAMPLE_DTYPE.itemsize)
+
+    def __len__(self) -> int:
+        return self._records_size() // SAMPLE_DTYPE.itemsize
+
+    def append(self, samples: np.ndarray):
+        """Append one or more records"""
+        samples = np.asarray(samples, dtype=SAMPLE_DTYPE)
+        if not len(samples):
+            return
+        os.makedirs(self.path.parent, exist_ok=True)
+        if not self.path.exists():
+            with open(self.path, 'wb') as f:
+                f.write(_header())
+        with open(self.path, 'r+b') as f:
+            f.seek(HEADER_SIZE + self._records_size())
+            f.write(samples.tobytes())
+            f.truncate()
+
+    def record(self, metrics: Dict[str, Any]):
+        """Append the snapshot from a metrics report"""
+        sample = sample_from_report(metrics)
+        if sample is not None:
+            self.append(sample)
+
+    def extend(self, reports: Iterable[Dict[str, Any]]) -> int:
+        """Append many metrics reports in time order; returns how many were added"""
+        samples = [sample for sample in map(sample_from_report, reports) if sample is not None]
+        if not samples:
+            return 0
+        history = np.concatenate(samples)
+        history.sort(order="ts")
+        self.append(history)
+        return len(history)
+
+    def load(self) -> np.ndarray:
+        """Whole history as a structured array, oldest first"""
+        count = len(self)
+        if not count:
+            return np.zeros(0, dtype=SAMPLE_DTYPE)
+        with open(self.path, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+            if header[:len(MAGIC)] != MAGIC or header[len(MAGIC)] != FORMAT_VERSION:
+                raise ValueError(f"{self.path} is not a version {FORMAT_VERSION} metrics history")
+            history = np.fromfile(f, dtype=SAMPLE_DTYPE, count=count)
+        if len(history) > 1 and np.any(np.diff(history["ts"]) < 0):
+            history = history[np.argsort(history["ts"], kind="stable")]
+        return history
+
+
+@dataclass
+class Trends:
+    """Daily series over a period; values carry forward over days without a snapshot"""
+    days: np.ndarray  # datetime64[D]
+    total: np.ndarray
+    completed: np.ndarray
+    blocked: np.ndarray
+    remaining_hours: np.ndarray
+    throughput: np.ndarray  # tasks completed each day
+    rolling_throughput: np.ndarray  # tasks completed over the trailing window
+    blocked_ratio: np.ndarray
+    window: int
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+
+def _local_days(ts: np.ndarray) -> np.ndarray:
+    offset = datetime.now().astimezone().utcoffset().total_seconds()
+    return np.floor((ts + offset) / SECONDS_PER_DAY).astype(np.int64)
+
+
+def compute_trends(
+    history: np.ndarray,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    window: int = 7
+) -> Trends:
+    """Burndown, rolling throughput and blocked ratio per day, without Python loops"""
+    ts = history["ts"]
+    # The trailing window (and the first day's throughput) need snapshots before the period
+    lead_in = since.timestamp() - window * SECONDS_PER_DAY if since is not None else None
+    start = 0 if lead_in is None else max(0, np.searchsorted(ts, lead_in, side="left") - 1)
+    end = len(ts) if until is None else np.searchsorted(ts, until.timestamp(), side="right")
+    history = history[start:end]
+
+    if not len(history):
+        empty = np.zeros(0)
+        return Trends(np.zeros(0, dtype="datetime64[D]"), *([empty] * 7), window=window)
+
+    # Last snapshot of each day, then forward-filled onto a continuous day range
+    days = _local_days(history["ts"])
+    last_of_day = np.r_[days[1:] != days[:-1], True]
+    days, daily = days[last_of_day], history[last_of_day]
+    first_day = days[0] if since is None else max(days[0], _local_days(np.array([since.timestamp()]))[0])
+    all_days = np.arange(days[0], days[-1] + 1)
+    daily = daily[np.searchsorted(days, all_days, side="right") - 1]
+
+    completed = daily["completed"].astype(np.int64)
+    # Reopened tasks lower the completed count; they are not negative throughput
+    throughput = np.clip(np.diff(completed, prepend=completed[0]), 0, None)
+    cumulative = np.cumsum(throughput)
+    rolling = cumulative - np.r_[np.zeros(window, dtype=np.int64), cumulative[:-window]][:len(cumulative)]
+
+    total = daily["total"].astype(np.int64)
+    blocked = daily["blocked"].astype(np.int64)
+    blocked_ratio = blocked / np.maximum(total, 1)
+
+    keep = all_days >= first_day
+    return Trends(
+        days=all_days[keep].astype("datetime64[D]"),
+        total=total[keep],
+        completed=completed[keep],
+        blocked=blocked[keep],
+        remaining_hours=daily["remaining_hours"].astype(np.float64)[keep],
+        throughput=throughput[keep],
+        rolling_throughput=rolling[keep],
+        blocked_ratio=blocked_ratio[keep],
+        window=window
+    )
+
+
+def render_trends(
+    trends: Trends,
+    output: str,
+    sprint_start: Optional[datetime] = None,
+    sprint_days: Optional[int] = None
+) -> Path:
+    """Save burndown, throughput and blocked-ratio charts to a PNG.
+
+    With ``sprint_start``, the burndown panel also shows the ideal line from
+    the remaining hours on that day to zero at the end of the sprint.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    days = trends.days.astype("datetime64[s]").astype(datetime)
+    fig, (burndown, throughput, blocked) = plt.subplots(3, 1, sharex=True, figsize=(10, 9))
+
+    burndown.plot(days, trends.remaining_hours, label="Remaining hours")
+    if sprint_start is not None and sprint_days and len(trends):
+        start_day = np.datetime64(sprint_start.date(), "D")
+        end_day = start_day + np.timedelta64(sprint_days, "D")
+        at_start = np.searchsorted(trends.days, start_day)
+        if at_start < len(trends) and not np.isnan(trends.remaining_hours[at_start]):
+            burndown.plot(
+                [start_day.astype(datetime), end_day.astype(datetime)],
+                [trends.remaining_hours[at_start], 0],
+                linestyle="--", label="Ideal (current sprint)"
+            )
+    burndown.set_ylabel("Hours")
+    burndown.set_title("Burndown")
+    burndown.legend(loc="upper right")
+
+    throughput.bar(days, trends.throughput, color="lightsteelblue", label="Completed per day")
+    throughput.plot(days, trends.rolling_throughput, color="navy", label=f"Trailing {trends.window} days")
+    throughput.set_ylabel("Tasks")
+    throughput.set_title("Throughput")
+    throughput.legend(loc="upper left")
+
+    blocked.plot(days, trends.blocked_ratio * 100, color="firebrick")
+    blocked.set_ylabel("% of tasks")
+    blocked.set_title("Blocked ratio")
+
+    fig.autofmt_xdate()
+    fig.tight_layout()
+    path = Path(output)
+    os.makedirs(path.parent, exist_ok=True)
+    fig.savefig(path, dpi=100)
+    plt.close(fig)
+    return path
@@ -0,0 +1,440 @@
+"""
+MindQuest Project Manager Agent - Model Clients
+Pluggable model clients: live API, fixture recording and replay, and an offline fake
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import re
+import time
+from collections import deque
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CLIENT_MODES = ("anthropic", "record", "replay", "fake")
+
+# Roughly four characters per token, as in the prompt budget estimator
+_CHARS_PER_TOKEN = 4
+
+
+class FixtureNotFound(KeyError):
+    """A replayed request has no recorded response"""
+
+
+class InjectedError(Exception):
+    """Error raised by ``FakeModelClient``, shaped like the SDK's API status errors"""
+
+    def __init__(self, status_code: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(f"{status_code} {message}")
+        self.status_code = status_code
+        headers = {} if retry_after is None else {"retry-after": f"{retry_after:g}"}
+        self.response = SimpleNamespace(status_code=status_code, headers=headers)
+
+
+# ----------------------------------------------------------------------
+# Response objects
+# ----------------------------------------------------------------------
+# The agent reads ``message.content[0].text`` and ``message.usage``; these
+# mirror the SDK's message shape closely enough for both.
+
+def make_message(text: str, input_tokens: int, output_tokens: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="text", text=text)],
+        usage=SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens),
+        stop_reason="end_turn"
+    )
+
+
+def request_key(params: Dict[str, Any]) -> str:
+    """Stable fixture key for a request: everything that affects the response"""
+    canonical = json.dumps({
+        "model": params.get("model"),
+        "max_tokens": params.get("max_tokens"),
+        "temperature": params.get("temperature"),
+        "system": params.get("system"),
+        "messages": params.get("messages"),
+    }, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+
+def _prompt_text(params: Dict[str, Any]) -> str:
+    parts = []
+    for message in params.get("messages", []):
+        content = message.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(block.get("text", "") for block in content or [])
+    return "\n".join(parts)
+
+
+def _chunks(text: str, size: int) -> List[str]:
+    return [text[start:start + size] for start in range(0, len(text), size)] or [""]
+
+
+class _ReplayedStream:
+    """Async context manager with the ``text_stream``/``get_final_message`` surface of an SDK stream"""
+
+    def __init__(self, message_factory: Callable, chunk_chars: int, chunk_delay: float = 0.0):
+        self._message_factory = message_factory
+        self._chunk_chars = chunk_chars
+        self._chunk_delay = chunk_delay
+        self._message = None
+
+    async def __aenter__(self) -> "_ReplayedStream":
+        self._message = await self._message_factory()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    @property
+    async def text_stream(self) -> AsyncIterator[str]:
+        for chunk in _chunks(self._message.content[0].text, self._chunk_chars):
+            if self._chunk_delay:
+                await asyncio.sleep(self._chunk_delay)
+            yield chunk
+
+    async def get_final_message(self):
+        return self._message
+
+
+# ----------------------------------------------------------------------
+# Fixtures
+# ----------------------------------------------------------------------
+
+class FixtureStore:
+    """Recorded responses, one JSON file per request key"""
+
+    def __init__(self, fixtures_dir: str = "data/model_fixtures"):
+        self.fixtures_dir = Path(fixtures_dir)
+
+    def path(self, key: str) -> Path:
+        return self.fixtures_dir / f"{key}.json"
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path(key), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, key: str, params: Dict[str, Any], text: str, usage: Any):
+        os.makedirs(self.fixtures_dir, exist_ok=True)
+        fixture = {
+            "request": {
+                "model": params.get("model"),
+                "max_tokens": params.get("max_tokens"),
+                "temperature": params.get("temperature"),
+                # Only the start of the prompt; enough to tell fixtures apart by eye
+                "prompt_head": _prompt_text(params)[:200],
+            },
+            "text": text,
+            "usage": {
+                "input_tokens": getattr(usage, "input_tokens", 0),
+                "output_tokens": getattr(usage, "output_tokens", 0),
+            },
+        }
+        tmp_path = self.path(key).with_suffix(".json.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(fixture, f, indent=2)
+        os.replace(tmp_path, self.path(key))
+
+    def __len__(self) -> int:
+        if not self.fixtures_dir.exists():
+            return 0
+        return sum(1 for _ in self.fixtures_dir.glob("*.json"))
+
+
+# ----------------------------------------------------------------------
+# Clients
+# ----------------------------------------------------------------------
+# Every client exposes ``client.messages.create(**params)`` and
+# ``client.messages.stream(**params)``: the part of ``AsyncAnthropic`` the
+# agent uses, so any of them can be assigned to ``agent.client``.
+
+class RecordingClient:
+    """Forwards to a live client and saves every response as a fixture"""
+
+    def __init__(self, inner, fixtures_dir: str = "data/model_fixtures"):
+        self.inner = inner
+        self.fixtures = FixtureStore(fixtures_dir)
+        self.messages = self
+        self.recorded = 0
+
+    async def create(self, **params):
+        message = await self.inner.messages.create(**params)
+        self.fixtures.save(request_key(params), params, message.content[0].text, message.usage)
+        self.recorded += 1
+        return message
+
+    def stream(self, **params):
+        return _RecordingStream(self, params)
+
+
+class _RecordingStream:
+    def __init__(self, client: RecordingClient, params: Dict[str, Any]):
+        self._client = client
+        self._params = params
+        self._context = client.inner.messages.stream(**params)
+        self._stream = None
+        self._parts: List[str] = []
+
+    async def __aenter__(self) -> "_RecordingStream":
+        self._stream = await self._context.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return await self._context.__aexit__(exc_type, exc, tb)
+
+    @property
+    async def text_stream(self) -> AsyncIterator[str]:
+        async for chunk in self._stream.text_stream:
+            self._parts.append(chunk)
+            yield chunk
+
+    async def get_final_message(self):
+        message = await self._stream.get_final_message()
+        self._client.fixtures.save(request_key(self._params), self._params, "".join(self._parts), message.usage)
+        self._client.recorded += 1
+        return message
+
+
+class ReplayClient:
+    """Answers from recorded fixtures; a request that was never recorded raises ``FixtureNotFound``.
+
+    With a ``fallback`` client, unrecorded requests go to it instead.
+    """
+
+    def __init__(
+        self,
+        fixtures_dir: str = "data/model_fixtures",
+        fallback=None,
+        chunk_chars: int = 16
+    ):
+        self.fixtures = FixtureStore(fixtures_dir)
+        self.fallback = fallback
+        self.chunk_chars = chunk_chars
+        self.messages = self
+        self.replayed = 0
+        self.missed = 0
+
+    async def create(self, **params):
+        key = request_key(params)
+        fixture = self.fixtures.load(key)
+        if fixture is None:
+            self.missed += 1
+            if self.fallback is None:
+                raise FixtureNotFound(f"No recorded response for request {key} in {self.fixtures.fixtures_dir}")
+            return await self.fallback.messages.create(**params)
+        self.replayed += 1
+        usage = fixture.get("usage", {})
+        return make_message(fixture["text"], usage.get("input_tokens", 0), usage.get("output_tokens", 0))
+
+    def stream(self, **params):
+        if self.fallback is not None and self.fixtures.load(request_key(params)) is None:
+            self.missed += 1
+            return self.fallback.messages.stream(**params)
+        return _ReplayedStream(lambda: self.create(**params), self.chunk_chars)
+
+
+class FakeModelClient:
+    """Offline stand-in for the model API with simulated latency and injected errors.
+
+    Each request waits ``latency_seconds`` before the first token, then
+    generates at ``tokens_per_second`` (0 for instant). With probability
+    ``error_rate`` it fails instead, as a rate limit (with retry-after),
+    an overload or a server error. With ``requests_per_minute`` set,
+    requests beyond that many in the last minute are rejected with a 429
+    whose retry-after is when the window frees up, like the real API.
+    ``responder(prompt)`` produces the
+    reply text; the default gives well-formed replies to the agent's own
+    prompts. ``seed`` makes latency jitter and errors reproducible.
+    """
+
+    ERRORS = (
+        (429, "rate_limit_error: Number of requests has exceeded your rate limit"),
+        (529, "overloaded_error: Overloaded"),
+        (500, "api_error: Internal server error"),
+    )
+
+    def __init__(
+        self,
+        latency_seconds: float = 0.0,
+        tokens_per_second: float = 0.0,
+        error_rate: float = 0.0,
+        jitter: float = 0.0,
+        retry_after_seconds: float = 1.0,
+        seed: Optional[int] = None,
+        responder: Optional[Callable[[str], str]] = None,
+        chunk_chars: int = 16,
+        requests_per_minute: Optional[float] = None
+    ):
+        self.latency_seconds = latency_seconds
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.jitter = jitter
+        self.retry_after_seconds = retry_after_seconds
+        self.random = random.Random(seed)
+        self.responder = responder or SyntheticResponder(seed)
+        self.chunk_chars = chunk_chars
+        self.requests_per_minute = requests_per_minute
+        self.accepted: Deque[float] = deque()
+        self.messages = self
+        self.requests = 0
+        self.errors = 0
+
+    @classmethod
+    def from_config(cls, fake_config: Optional[Dict[str, Any]] = None) -> "FakeModelClient":
+        """Create a fake client from the ``llm.client.fake`` config section"""
+        fake_config = fake_config or {}
+        return cls(
+            latency_seconds=fake_config.get("latency_seconds", 0.0),
+            tokens_per_second=fake_config.get("tokens_per_second", 0.0),
+            error_rate=fake_config.get("error_rate", 0.0),
+            jitter=fake_config.get("jitter", 0.0),
+            retry_after_seconds=fake_config.get("retry_after_seconds", 1.0),
+            seed=fake_config.get("seed"),
+            requests_per_minute=fake_config.get("requests_per_minute")
+        )
+
+    def _check_rate_limit(self):
+        if not self.requests_per_minute:
+            return
+        now = time.monotonic()
+        while self.accepted and now - self.accepted[0] >= 60:
+            self.accepted.popleft()
+        if len(self.accepted) >= self.requests_per_minute:
+            self.errors += 1
+            raise InjectedError(429, "rate_limit_error: Number of requests has exceeded your rate limit",
+                                retry_after=60 - (now - self.accepted[0]))
+        self.accepted.append(now)
+
+    async def _begin(self, params: Dict[str, Any]):
+        """Time to first token, then possibly an injected error; returns the reply"""
+        self.requests += 1
+        self._check_rate_limit()
+        latency = self.latency_seconds * (1 + self.random.uniform(-self.jitter, self.jitter))
+        if latency > 0:
+            await asyncio.sleep(latency)
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.errors += 1
+            status_code, message = self.random.choice(self.ERRORS)
+            retry_after = self.retry_after_seconds if status_code == 429 else None
+            raise InjectedError(status_code, message, retry_after)
+
+        prompt = _prompt_text(params)
+        text = self.responder(prompt)
+        max_tokens = params.get("max_tokens") or 4096
+        output_tokens = max(1, math.ceil(len(text) / _CHARS_PER_TOKEN))
+        if output_tokens > max_tokens:
+            # Only a reply longer than max_tokens is cut off, as the API would
+            output_tokens = max_tokens
+            text = text[:max_tokens * _CHARS_PER_TOKEN]
+        return make_message(text, max(1, len(prompt) // _CHARS_PER_TOKEN), output_tokens)
+
+    def _chunk_delay(self) -> float:
+        if not self.tokens_per_second:
+            return 0.0
+        return self.chunk_chars / _CHARS_PER_TOKEN / self.tokens_per_second
+
+    async def create(self, **params):
+        message = await self._begin(params)
+        if self.tokens_per_second:
+            await asyncio.sleep(message.usage.output_tokens / self.tokens_per_second)
+        return message
+
+    def stream(self, **params):
+        return _ReplayedStream(lambda: self._begin(params), self.chunk_chars, self._chunk_delay())
+
+
+class SyntheticResponder:
+    """Plausible replies to the agent's prompts, recognised by their wording"""
+
+    AREAS = ("focus timer", "quest rewards", "streak tracking", "character progression",
+             "reminder settings", "offline sync", "onboarding", "accessibility")
+
+    def __init__(self, seed: Optional[int] = None):
+        self.random = random.Random(seed)
+
+    def __call__(self, prompt: str) -> str:
+        if "sprint goals" in prompt:
+            return self.sprint_goals()
+        match = re.search(r"suggest the next (\d+)", prompt)
+        if match:
+            return self.suggestions(int(match.group(1)))
+        if "feature parity between" in prompt.lower():
+            return self.parity()
+        return self.analysis()
+
+    def _areas(self, count: int) -> List[str]:
+        return self.random.sample(self.AREAS, min(count, len(self.AREAS)))
+
+    def sprint_goals(self) -> str:
+        return json.dumps([f"Ship {area} on both platforms with tests" for area in self._areas(4)])
+
+    def suggestions(self, count: int) -> str:
+        return "Here are the suggested tasks:\n" + json.dumps([
+            {
+                "title": f"Improve {area}",
+                "description": f"Bring {area} to parity and cover it with UI tests",
+                "platform": self.random.choice(["ios", "android", "both"]),
+                "priority": self.random.choice(["high", "medium", "low"]),
+                "estimated_hours": self.random.choice([2, 4, 6, 8]),
+            }
+            for area in self._areas(count)
+        ], indent=2)
+
+    def parity(self) -> str:
+        areas = self._areas(4)
+        return json.dumps({
+            "missing_in_android": areas[:2],
+            "missing_in_ios": areas[2:3],
+            "implementation_differences": [f"{areas[3]} persists differently on each platform"],
+            "recommendations": [f"Port {area}" for area in areas[:3]],
+        }, indent=2)
+
+    def analysis(self) -> str:
+        areas = self._areas(3)
+        return json.dumps({
+            "issues": [f"{areas[0]} has no error handling for storage failures"],
+            "improvements": [f"Extract shared {areas[1]} logic"],
+            "feature_gaps": [f"{areas[2]} is iOS only"],
+            "metrics": {},
+        }, indent=2)
+
+
+def create_model_client(client_config: Optional[Dict[str, Any]], api_key: Optional[str]):
+    """Build the client selected by ``llm.client.mode``.
+
+    ``anthropic`` and ``record`` need an API key; ``replay`` and ``fake``
+    run offline.
+    """
+    client_config = client_config or {}
+    mode = client_config.get("mode", "anthropic")
+    fixtures_dir = client_config.get("fixtures_dir", "data/model_fixtures")
+
+    if mode == "fake":
+        return FakeModelClient.from_config(client_config.get("fake"))
+    if mode == "replay":
+        return ReplayClient(fixtures_dir)
+    if mode not in ("anthropic", "record"):
+        raise ValueError(f"Unknown model client mode: {mode}")
+
+    if not api_key:
+        raise RuntimeError("ANTHROPIC_API_KEY not found in environment variables")
+    import anthropic
+    # The gateway owns retries, so they stay under its rate limiter and circuit breaker
+    client = anthropic.AsyncAnthropic(api_key=api_key, max_retries=0)
+    if mode == "record":
+        logger.info(f"Recording model responses to {fixtures_dir}")
+        return RecordingClient(client, fixtures_dir)
+    return client
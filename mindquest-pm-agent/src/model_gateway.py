@@ -0,0 +1,489 @@
+"""
+MindQuest Project Manager Agent - Model Gateway
+Rate limiting, retries with backoff, a circuit breaker and request coalescing for model calls
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+from src.file_lock import FileLock
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Status codes worth retrying; 429 and 529 also mean "slow down"
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+THROTTLE_STATUS = {429, 529}
+# SDK connection errors carry no status code
+RETRYABLE_ERRORS = {"APIConnectionError", "APITimeoutError"}
+
+
+class CircuitOpen(RuntimeError):
+    """Model calls are failing fast until the circuit breaker's cool-down ends"""
+
+
+def classify_error(error: BaseException) -> Tuple[bool, bool, Optional[float]]:
+    """(retryable, throttled, retry_after seconds) for an error from a model call"""
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        retryable = status in RETRYABLE_STATUS or status >= 500
+        throttled = status in THROTTLE_STATUS
+    else:
+        retryable = isinstance(error, (asyncio.TimeoutError, ConnectionError)) or (
+            type(error).__name__ in RETRYABLE_ERRORS
+        )
+        throttled = False
+    return retryable, throttled, _retry_after(error)
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) * scale)
+        except ValueError:
+            # An HTTP date; the backoff delay applies instead
+            return None
+    return None
+
+
+class RateLimiter:
+    """Token buckets for requests and tokens per minute, adapting to throttling.
+
+    ``reserve`` takes the cost of a call out of every bucket at once and
+    returns how long the caller must wait for the buckets to refill; levels
+    may go negative, so callers queue in reservation order without a lock.
+    Output tokens are only known afterwards and are charged by ``charge``.
+
+    A 429/529 halves the effective rate (at most once a second) and pauses
+    every caller for the retry-after; each success wins back a little of
+    the rate. With a ``state_path`` the buckets live in a file under an
+    advisory lock and are shared by every process using the same path; the
+    gateway then calls the limiter from a worker thread, off the event loop.
+    """
+
+    BUCKETS = ("requests", "input_tokens", "output_tokens")
+    THROTTLE_WINDOW = 1.0
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        input_tokens_per_minute: Optional[float] = None,
+        output_tokens_per_minute: Optional[float] = None,
+        state_path: Optional[str] = None,
+        min_scale: float = 0.1,
+        recovery: float = 0.05
+    ):
+        self.limits: Dict[str, float] = {
+            name: limit for name, limit in zip(self.BUCKETS, (
+                requests_per_minute, input_tokens_per_minute, output_tokens_per_minute
+            )) if limit
+        }
+        self.state_path = Path(state_path) if state_path else None
+        self.lock = FileLock(self.state_path.with_suffix(".lock")) if self.state_path else None
+        self.min_scale = min_scale
+        self.recovery = recovery
+        self._state = self._initial_state()
+
+    def _initial_state(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "buckets": {name: {"level": limit, "updated": now} for name, limit in self.limits.items()},
+            "scale": 1.0,
+            "paused_until": 0.0,
+            "throttled_at": 0.0,
+        }
+
+    @property
+    def shared(self) -> bool:
+        """State lives in a file, so every call takes a lock and does file I/O"""
+        return self.state_path is not None
+
+    def _read_state(self) -> Dict[str, Any]:
+        if self.state_path is None:
+            return self._state
+        try:
+            with open(self.state_path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return self._initial_state()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[Dict[str, Any]]:
+        if self.state_path is None:
+            yield self._state
+            return
+        with self.lock:
+            state = self._read_state()
+            yield state
+            os.makedirs(self.state_path.parent, exist_ok=True)
+            tmp_path = self.state_path.with_suffix(".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_path)
+
+    def _refill(self, state: Dict[str, Any], name: str, now: float) -> Tuple[Dict[str, float], float]:
+        """Bring a bucket up to ``now``; returns it and its rate per second"""
+        limit = self.limits[name]
+        rate = limit * state["scale"] / 60
+        bucket = state["buckets"].setdefault(name, {"level": limit, "updated": now})
+        bucket["level"] = min(limit, bucket["level"] + max(0.0, now - bucket["updated"]) * rate)
+        bucket["updated"] = now
+        return bucket, rate
+
+    def reserve(self, requests: float = 1, input_tokens: float = 0) -> float:
+        """Take a call's cost from the buckets; returns seconds to wait before sending it.
+
+        The output token bucket is not charged here, but a call also waits
+        until earlier calls' output has been paid off.
+        """
+        costs = {"requests": requests, "input_tokens": input_tokens, "output_tokens": 0}
+        now = time.time()
+        with self._transaction() as state:
+            wait = max(0.0, state["paused_until"] - now)
+            for name, cost in costs.items():
+                if name not in self.limits:
+                    continue
+                bucket, rate = self._refill(state, name, now)
+                # A single call larger than the whole bucket waits for a full bucket, not forever
+                bucket["level"] -= min(cost, self.limits[name])
+                if bucket["level"] < 0:
+                    wait = max(wait, -bucket["level"] / rate)
+        return wait
+
+    def charge(self, output_tokens: float):
+        """Charge output tokens after the response, slowing later reservations"""
+        if "output_tokens" not in self.limits or not output_tokens:
+            return
+        now = time.time()
+        with self._transaction() as state:
+            bucket, _ = self._refill(state, "output_tokens", now)
+            bucket["level"] -= min(output_tokens, self.limits["output_tokens"])
+
+    def throttled(self, retry_after: Optional[float]):
+        """The API pushed back: slow down, and pause everyone for ``retry_after``"""
+        now = time.time()
+        with self._transaction() as state:
+            for name in self.limits:
+                self._refill(state, name, now)
+            # Calls rejected by the same burst count once
+            if now - state.get("throttled_at", 0.0) >= self.THROTTLE_WINDOW:
+                state["scale"] = max(self.min_scale, state["scale"] / 2)
+                state["throttled_at"] = now
+            if retry_after:
+                state["paused_until"] = max(state["paused_until"], now + retry_after)
+
+    def succeeded(self):
+        with self._transaction() as state:
+            if state["scale"] < 1.0:
+                now = time.time()
+                for name in self.limits:
+                    self._refill(state, name, now)
+                state["scale"] = min(1.0, state["scale"] + self.recovery)
+
+    @property
+    def scale(self) -> float:
+        # Writers replace the file atomically, so reading needs neither the lock nor a write
+        return self._read_state()["scale"]
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, never sooner than the server's retry-after"""
+
+    def __init__(self, max_attempts: int = 6, base_delay: float = 1.0, max_delay: float = 60.0, seed: Optional[int] = None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.random = random.Random(seed)
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait after failed attempt number ``attempt`` (from 0)"""
+        backoff = self.random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None:
+            # Spread callers released by the same retry-after instead of waking them together
+            return retry_after + self.random.uniform(0, self.base_delay)
+        return backoff
+
+
+class CircuitBreaker:
+    """Fail fast after repeated failures, probing again after a cool-down.
+
+    Throttling does not count as failure; the rate limiter handles it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._probing or time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def check(self):
+        """Raise ``CircuitOpen`` unless a call may go ahead"""
+        if self.opened_at is None:
+            return
+        remaining = self.reset_seconds - (time.monotonic() - self.opened_at)
+        if remaining > 0 or self._probing:
+            raise CircuitOpen(
+                f"Model calls paused after {self.failures} consecutive failures"
+                + (f"; retrying in {remaining:.0f}s" if remaining > 0 else "; a probe call is in flight")
+            )
+        # Cool-down over: let exactly one call through to probe
+        self._probing = True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def release_probe(self):
+        """The probe ended without telling us anything (throttled or cancelled)"""
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            if self.opened_at is None or self._probing:
+                logger.warning(f"Model circuit opened after {self.failures} consecutive failures")
+            self.opened_at = time.monotonic()
+            self._probing = False
+
+
+class ModelGateway:
+    """Every model call goes through here.
+
+    ``send`` and ``stream`` wait for the rate limiter and a concurrency slot,
+    retry retryable errors with backoff and fail fast while the circuit is
+    open. A stream is retried only until it opens; once chunks have been
+    delivered an error propagates. ``follow``/``lead`` merge identical
+    concurrent requests: followers ``follow`` the leader's result instead of
+    sending their own.
+    """
+
+    def __init__(
+        self,
+        limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        max_concurrent: int = 4,
+        telemetry=None
+    ):
+        self.limiter = limiter or RateLimiter()
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.max_concurrent = max_concurrent
+        self.telemetry = telemetry
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop = None
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    @classmethod
+    def from_config(cls, gateway_config: Optional[Dict[str, Any]] = None, max_concurrent: int = 4, telemetry=None) -> "ModelGateway":
+        """Create a gateway from the ``llm.gateway`` config section"""
+        gateway_config = gateway_config or {}
+        return cls(
+            limiter=RateLimiter(
+                requests_per_minute=gateway_config.get("requests_per_minute"),
+                input_tokens_per_minute=gateway_config.get("input_tokens_per_minute"),
+                output_tokens_per_minute=gateway_config.get("output_tokens_per_minute"),
+                state_path=gateway_config.get("shared_state_path")
+            ),
+            retry=RetryPolicy(
+                max_attempts=gateway_config.get("max_attempts", 6),
+                base_delay=gateway_config.get("backoff_base_seconds", 1.0),
+                max_delay=gateway_config.get("backoff_max_seconds", 60.0)
+            ),
+            breaker=CircuitBreaker(
+                failure_threshold=gateway_config.get("circuit_failure_threshold", 5),
+                reset_seconds=gateway_config.get("circuit_reset_seconds", 30.0)
+            ),
+            max_concurrent=max_concurrent,
+            telemetry=telemetry
+        )
+
+    def _count(self, name: str, value: float = 1, **labels):
+        if self.telemetry is not None:
+            self.telemetry.count(name, value, **labels)
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        """Concurrency limiter, bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+            self._slots_loop = loop
+        return self._slots
+
+    # ------------------------------------------------------------------
+    # Coalescing
+    # ------------------------------------------------------------------
+
+    async def follow(self, key: str) -> Tuple[bool, Any]:
+        """``(True, result)`` of an identical request already in flight.
+
+        ``(False, None)`` if there is none, or if its caller abandoned it,
+        in which case the caller should send its own.
+        """
+        future = self._in_flight.get(key)
+        if future is None or future.get_loop() is not asyncio.get_running_loop():
+            return False, None
+        try:
+            # Shielded so a cancelled follower does not cancel the leader's call
+            result = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if future.cancelled():
+                return False, None
+            raise
+        self._count("model_coalesced")
+        return True, result
+
+    @contextmanager
+    def lead(self, key: str) -> Iterator[Callable[[Any], None]]:
+        """Register a request as in flight; call the yielded function with its result"""
+        future = asyncio.get_running_loop().create_future()
+        # Followers are optional; an unobserved failure must not be reported as unretrieved
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._in_flight[key] = future
+
+        def publish(result: Any):
+            if not future.done():
+                future.set_result(result)
+
+        try:
+            yield publish
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            raise
+        finally:
+            # Cancelled or abandoned before a result: followers send their own
+            if not future.done():
+                future.cancel()
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    # ------------------------------------------------------------------
+    # Sending
+    # ------------------------------------------------------------------
+
+    async def _limit(self, update: Callable[..., T], *args: Any) -> T:
+        """Run a rate limiter update; a shared limiter's lock and file I/O run in a worker thread"""
+        if self.limiter.shared:
+            return await asyncio.to_thread(update, *args)
+        return update(*args)
+
+    async def _admit(self, input_tokens: int):
+        """Wait for the circuit and the rate limiter"""
+        self.breaker.check()
+        wait = await self._limit(self.limiter.reserve, 1, input_tokens)
+        if wait > 0:
+            self._count("model_throttle_wait_seconds", round(wait, 3))
+            await asyncio.sleep(wait)
+
+    async def _failed(self, error: BaseException, attempt: int) -> float:
+        """Account for a failed attempt; returns the delay before retrying or re-raises"""
+        retryable, throttled, retry_after = classify_error(error)
+        if throttled:
+            await self._limit(self.limiter.throttled, retry_after)
+            self.breaker.release_probe()
+        elif retryable:
+            self.breaker.record_failure()
+        else:
+            # The API answered; the request itself was at fault
+            self.breaker.record_success()
+        if not retryable or attempt + 1 >= self.retry.max_attempts:
+            raise error
+        delay = self.retry.delay(attempt, retry_after)
+        reason = getattr(error, "status_code", None) or type(error).__name__
+        self._count("model_retries", reason=reason)
+        logger.warning(f"Model call failed ({error}); retry {attempt + 1} in {delay:.1f}s")
+        return delay
+
+    async def _succeeded(self):
+        self.breaker.record_success()
+        await self._limit(self.limiter.succeeded)
+
+    async def record_usage(self, usage: Any):
+        """Charge a completed call's output tokens to the rate limiter"""
+        await self._limit(self.limiter.charge, getattr(usage, "output_tokens", 0))
+
+    async def send(self, request: Callable[[], Awaitable[T]], input_tokens: int = 0, timeout: Optional[float] = None) -> T:
+        """Run ``request()`` (one API call) with admission control and retries"""
+        attempt = 0
+        while True:
+            await self._admit(input_tokens)
+            try:
+                async with self._get_slots():
+                    result = await asyncio.wait_for(request(), timeout=timeout)
+            except asyncio.TimeoutError:
+                delay = await self._failed(asyncio.TimeoutError(f"Model call timed out after {timeout}s"), attempt)
+            except Exception as e:
+                delay = await self._failed(e, attempt)
+            except BaseException:
+                self.breaker.release_probe()
+                raise
+            else:
+                await self._succeeded()
+                return result
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @asynccontextmanager
+    async def stream(self, open_stream: Callable[[], Any], input_tokens: int = 0, timeout: Optional[float] = None) -> AsyncIterator[Any]:
+        """Open ``open_stream()`` (an SDK stream manager) with retries and hold a slot while it is read"""
+        attempt = 0
+        while True:
+            await self._admit(input_tokens)
+            slots = self._get_slots()
+            await slots.acquire()
+            try:
+                manager = open_stream()
+                stream = await asyncio.wait_for(manager.__aenter__(), timeout=timeout)
+            except asyncio.TimeoutError:
+                slots.release()
+                delay = await self._failed(asyncio.TimeoutError(f"Model call timed out after {timeout}s"), attempt)
+            except Exception as e:
+                slots.release()
+                delay = await self._failed(e, attempt)
+            except BaseException:
+                slots.release()
+                self.breaker.release_probe()
+                raise
+            else:
+                break
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        try:
+            yield stream
+        except BaseException as e:
+            await manager.__aexit__(type(e), e, e.__traceback__)
+            retryable, throttled, _ = classify_error(e)
+            if retryable and not throttled:
+                self.breaker.record_failure()
+            raise
+        else:
+            await manager.__aexit__(None, None, None)
+            await self._succeeded()
+        finally:
+            slots.release()
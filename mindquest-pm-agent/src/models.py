@@ -0,0 +1,251 @@
+"""
+MindQuest Project Manager Agent - Models
+Task data model shared by the agent and task stores
+"""
+
+import sys
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+
+class TaskPriority(Enum):
+    """Task priority levels"""
+    CRITICAL = "critical"
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+
+
+class TaskStatus(Enum):
+    """Task status states"""
+    TODO = "todo"
+    IN_PROGRESS = "in_progress"
+    REVIEW = "review"
+    COMPLETED = "completed"
+    BLOCKED = "blocked"
+
+
+PRIORITIES = {priority.value: priority for priority in TaskPriority}
+STATUSES = {status.value: status for status in TaskStatus}
+
+# Timestamps are held as integer microseconds since this naive epoch
+EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+Timestamp = Union[datetime, int, str]
+
+
+def to_epoch_us(value: datetime) -> int:
+    """Naive datetime (aware ones are converted to local time) as epoch microseconds"""
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return (value - EPOCH) // _MICROSECOND
+
+
+def from_epoch_us(value: int) -> datetime:
+    return EPOCH + timedelta(microseconds=value)
+
+
+def _epoch(value: Timestamp) -> int:
+    """Accept epoch microseconds, a datetime or an ISO string"""
+    if type(value) is int:
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return to_epoch_us(value)
+
+
+_intern = sys.intern
+
+
+def _interned(values: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    if not values:
+        return ()
+    return tuple(map(_intern, values))
+
+
+class Task:
+    """Represents a development task.
+
+    Slotted, with interned platform/assignee/tag/dependency strings and
+    timestamps held as epoch microseconds (``created_us`` etc.); the
+    ``created_at``/``updated_at``/``due_date`` properties convert to and
+    from ``datetime``. ``dependencies`` and ``tags`` are tuples.
+
+    ``to_record``/``from_record`` are the compact storage codec;
+    ``to_dict`` keeps the ISO-formatted form used by reports and exports.
+    ``version`` is bumped by the store on every write and is what
+    compare-and-swap updates check; it is 0 until the task is first stored.
+    """
+
+    __slots__ = (
+        "id", "title", "description", "priority", "status", "platform",
+        "estimated_hours", "assigned_to", "due_us", "_dependencies", "_tags",
+        "created_us", "updated_us", "version"
+    )
+
+    def __init__(
+        self,
+        id: str,
+        title: str,
+        description: str,
+        priority: TaskPriority,
+        status: TaskStatus,
+        platform: str,  # ios, android, both
+        estimated_hours: float,
+        assigned_to: Optional[str] = None,
+        due_date: Optional[Timestamp] = None,
+        dependencies: Optional[Iterable[str]] = None,
+        tags: Optional[Iterable[str]] = None,
+        created_at: Optional[Timestamp] = None,
+        updated_at: Optional[Timestamp] = None,
+        version: int = 0
+    ):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.priority = priority
+        self.status = status
+        self.platform = sys.intern(platform)
+        self.estimated_hours = estimated_hours
+        self.assigned_to = sys.intern(assigned_to) if assigned_to else assigned_to
+        self.due_us = None if due_date is None else _epoch(due_date)
+        self._dependencies = _interned(dependencies)
+        self._tags = _interned(tags)
+        if created_at is None or updated_at is None:
+            now = to_epoch_us(datetime.now())
+        self.created_us = now if created_at is None else _epoch(created_at)
+        self.updated_us = now if updated_at is None else _epoch(updated_at)
+        self.version = version
+
+    @property
+    def created_at(self) -> datetime:
+        return from_epoch_us(self.created_us)
+
+    @created_at.setter
+    def created_at(self, value: Timestamp):
+        self.created_us = _epoch(value)
+
+    @property
+    def updated_at(self) -> datetime:
+        return from_epoch_us(self.updated_us)
+
+    @updated_at.setter
+    def updated_at(self, value: Timestamp):
+        self.updated_us = _epoch(value)
+
+    @property
+    def due_date(self) -> Optional[datetime]:
+        return None if self.due_us is None else from_epoch_us(self.due_us)
+
+    @due_date.setter
+    def due_date(self, value: Optional[Timestamp]):
+        self.due_us = None if value is None else _epoch(value)
+
+    @property
+    def dependencies(self) -> Tuple[str, ...]:
+        return self._dependencies
+
+    @dependencies.setter
+    def dependencies(self, value: Optional[Iterable[str]]):
+        self._dependencies = _interned(value)
+
+    @property
+    def tags(self) -> Tuple[str, ...]:
+        return self._tags
+
+    @tags.setter
+    def tags(self, value: Optional[Iterable[str]]):
+        self._tags = _interned(value)
+
+    def _key(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._key() == other._key()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"Task(id={self.id!r}, title={self.title!r}, priority={self.priority}, "
+            f"status={self.status}, platform={self.platform!r}, "
+            f"estimated_hours={self.estimated_hours!r})"
+        )
+
+    def to_dict(self) -> dict:
+        """Convert task to dictionary"""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "priority": self.priority.value,
+            "status": self.status.value,
+            "platform": self.platform,
+            "estimated_hours": self.estimated_hours,
+            "assigned_to": self.assigned_to,
+            "due_date": None if self.due_us is None else from_epoch_us(self.due_us).isoformat(),
+            "dependencies": list(self._dependencies),
+            "tags": list(self._tags),
+            "created_at": from_epoch_us(self.created_us).isoformat(),
+            "updated_at": from_epoch_us(self.updated_us).isoformat(),
+        }
+
+    def to_record(self) -> Dict[str, Any]:
+        """Compact storage form: epoch-microsecond timestamps, empty fields omitted"""
+        record = {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "priority": self.priority.value,
+            "status": self.status.value,
+            "platform": self.platform,
+            "estimated_hours": self.estimated_hours,
+            "created_at": self.created_us,
+            "updated_at": self.updated_us,
+        }
+        if self.version:
+            record["version"] = self.version
+        if self.assigned_to is not None:
+            record["assigned_to"] = self.assigned_to
+        if self.due_us is not None:
+            record["due_date"] = self.due_us
+        if self._dependencies:
+            record["dependencies"] = self._dependencies
+        if self._tags:
+            record["tags"] = self._tags
+        return record
+
+    @classmethod
+    def from_record(cls, data: Dict[str, Any]) -> "Task":
+        """Decode ``to_record`` or ``to_dict`` output (timestamps as ints or ISO strings)"""
+        task = cls.__new__(cls)
+        task.id = data["id"]
+        task.title = data["title"]
+        task.description = data["description"]
+        task.priority = PRIORITIES[data["priority"]]
+        task.status = STATUSES[data["status"]]
+        task.platform = _intern(data["platform"])
+        task.estimated_hours = data["estimated_hours"]
+        assigned_to = data.get("assigned_to")
+        task.assigned_to = _intern(assigned_to) if assigned_to else assigned_to
+        due = data.get("due_date")
+        task.due_us = None if due is None or due == "" else _epoch(due)
+        dependencies = data.get("dependencies")
+        task._dependencies = tuple(map(_intern, dependencies)) if dependencies else ()
+        tags = data.get("tags")
+        task._tags = tuple(map(_intern, tags)) if tags else ()
+        created = data["created_at"]
+        task.created_us = created if type(created) is int else _epoch(created)
+        updated = data["updated_at"]
+        task.updated_us = updated if type(updated) is int else _epoch(updated)
+        task.version = data.get("version", 0)
+        return task
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Task":
+        """Create a task from its dictionary form"""
+        return cls.from_record(data)
@@ -8,94 +8,109 @@ import os
 import json
 import asyncio
 import logging
+import time
+from contextlib import contextmanager, nullcontext
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Iterable, List, Optional, Any, TextIO
 from pathlib import Path
-import anthropic
-from dataclasses import dataclass, asdict
-from enum import Enum
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
+from src.metrics import REMAINING_STATUSES, MetricsAggregator
+from src.model_gateway import ModelGateway
+from src.models import Task, TaskPriority, TaskStatus
+from src.prompt_budget import CallUsage, TokenEstimator, TokenUsage, pack_tasks
+from src.report_index import ReportIndex
+from src.response_cache import ResponseCache
+from src.sprint_planner import OPEN_STATUSES, PRIORITY_RANK, plan_sprint
+from src.task_assignment import AssignmentPlan, assign_tasks, load_team, team_capacity_hours
+from src.task_events import FlowMetrics
+from src.task_io import ImportResult, import_tasks, read_records, validate_records, write_tasks
+from src.task_store import TaskStore, VersionConflict, open_task_store
+from src.telemetry import Telemetry, traced
 
+if TYPE_CHECKING:
+    from src.codebase_scanner import CodebaseScanner
+    from src.feature_parity import ParityDiff
+    from src.metrics_history import MetricsHistory, Trends
+    from src.task_dedupe import DedupeIndex
+    from src.task_search import SearchResults, TaskSearchIndex
 
-class TaskPriority(Enum):
-    """Task priority levels"""
-    CRITICAL = "critical"
-    HIGH = "high"
-    MEDIUM = "medium"
-    LOW = "low"
+# Recently completed tasks shown to the model so it does not suggest them again
+RECENTLY_COMPLETED_HEADING = "\n\n        Recently completed:\n"
+RECENTLY_COMPLETED_LIMIT = 50
+RECENTLY_COMPLETED_SHARE = 0.2
 
+# Compare-and-swap attempts before a status update gives up to a busy task
+STATUS_UPDATE_ATTEMPTS = 5
 
-class TaskStatus(Enum):
-    """Task status states"""
-    TODO = "todo"
-    IN_PROGRESS = "in_progress"
-    REVIEW = "review"
-    COMPLETED = "completed"
-    BLOCKED = "blocked"
+# Tag linking a near-duplicate to the task it duplicates
+DUPLICATE_TAG_PREFIX = "duplicate-of:"
 
+# Priority and estimated hours of a task porting each kind of feature, in the order they are created
+PARITY_TASK_DEFAULTS = {
+    "entity": (TaskPriority.HIGH, 4.0),
+    "screen": (TaskPriority.MEDIUM, 6.0),
+    "manager": (TaskPriority.MEDIUM, 8.0),
+    "model": (TaskPriority.LOW, 2.0),
+}
 
-@dataclass
-class Task:
-    """Represents a development task"""
-    id: str
-    title: str
-    description: str
-    priority: TaskPriority
-    status: TaskStatus
-    platform: str  # ios, android, both
-    estimated_hours: float
-    assigned_to: Optional[str] = None
-    due_date: Optional[datetime] = None
-    dependencies: List[str] = None
-    tags: List[str] = None
-    created_at: datetime = None
-    updated_at: datetime = None
-
-    def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now()
-        if self.updated_at is None:
-            self.updated_at = datetime.now()
-        if self.dependencies is None:
-            self.dependencies = []
-        if self.tags is None:
-            self.tags = []
-
-    def to_dict(self) -> dict:
-        """Convert task to dictionary"""
-        data = asdict(self)
-        data['priority'] = self.priority.value
-        data['status'] = self.status.value
-        data['created_at'] = self.created_at.isoformat()
-        data['updated_at'] = self.updated_at.isoformat()
-        if self.due_date:
-            data['due_date'] = self.due_date.isoformat()
-        return data
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
 
 
 class ProjectManagerAgent:
     """AI-powered project manager for MindQuest apps"""
     
-    def __init__(self, api_key: str, config_path: str = "config/agent_config.json"):
-        """Initialize the project manager agent"""
-        self.client = anthropic.Anthropic(api_key=api_key)
+    def __init__(self, api_key: Optional[str], config_path: str = "config/agent_config.json"):
+        """Initialize the project manager agent.
+        
+        Construction is cheap: the model client and the task store are created
+        on first use, so commands that never call the model need no API key.
+        """
+        self.api_key = api_key
+        self._client = None
         self.config_path = Path(config_path)
         self.config = self.load_config()
         
+        # Model call settings
+        llm_config = self.config.get("llm", {})
+        self.model = self.config.get("ai_model", "claude-sonnet-4-6")
+        self.temperature = self.config.get("temperature", 1.0)
+        self.request_timeout = llm_config.get("request_timeout_seconds", 60)
+        self.pipeline_timeout = llm_config.get("pipeline_timeout_seconds", 600)
+        self.prompt_budgets = llm_config.get("prompt_budget_tokens", {})
+        self.model_client_config = dict(llm_config.get("client", {}))
+        self.token_estimator = TokenEstimator()
+        self.token_usage = TokenUsage(llm_config.get("usage_log_path"))
+        self.telemetry = Telemetry.from_config(self.config.get("telemetry"))
+        self.gateway = ModelGateway.from_config(
+            llm_config.get("gateway"),
+            max_concurrent=llm_config.get("max_concurrent_requests", 4),
+            telemetry=self.telemetry
+        )
+        self.response_cache = ResponseCache.from_config(self.config.get("cache"))
+        self.reports = ReportIndex.from_config(self.config.get("reports"))
+        
         # Project paths
-        self.ios_path = Path("/Users/mocha/MindQuestApp")
-        self.android_path = Path("/Users/mocha/MindLabsQuestAndroid")
-        self.swiftui_path = Path("/Users/mocha/MindLabsQuestSwiftUI")
+        self.ios_path = Path(os.getenv("IOS_APP_PATH", "/Users/mocha/MindQuestApp"))
+        self.android_path = Path(os.getenv("ANDROID_APP_PATH", "/Users/mocha/MindLabsQuestAndroid"))
+        self.swiftui_path = Path(os.getenv("SWIFTUI_APP_PATH", "/Users/mocha/MindLabsQuestSwiftUI"))
+        self._scanner: Optional["CodebaseScanner"] = None
+        self._parity_scanner: Optional["CodebaseScanner"] = None
         
         # Task storage
-        self.tasks: Dict[str, Task] = {}
-        self.load_tasks()
+        self._store: Optional[TaskStore] = None
+        self._metrics: Optional[MetricsAggregator] = None
+        self._search_index: Optional["TaskSearchIndex"] = None
+        self._dedupe_index: Optional["DedupeIndex"] = None
+        self._flow: Optional[FlowMetrics] = None
+        self._metrics_history: Optional["MetricsHistory"] = None
+        
+        # Team members with platform skills and daily capacity
+        self.team = load_team(self.config)
         
         # Sprint information
         self.current_sprint = None
@@ -121,34 +136,337 @@ class ProjectManagerAgent:
         with open(self.config_path, 'w') as f:
             json.dump(self.config, f, indent=2)
     
+    @traced()
     def load_tasks(self):
-        """Load tasks from storage"""
-        tasks_file = Path("data/tasks.json")
-        if tasks_file.exists():
-            with open(tasks_file, 'r') as f:
-                tasks_data = json.load(f)
-                for task_id, task_data in tasks_data.items():
-                    # Convert string enums back to enum types
-                    task_data['priority'] = TaskPriority(task_data['priority'])
-                    task_data['status'] = TaskStatus(task_data['status'])
-                    # Convert ISO strings back to datetime
-                    task_data['created_at'] = datetime.fromisoformat(task_data['created_at'])
-                    task_data['updated_at'] = datetime.fromisoformat(task_data['updated_at'])
-                    if task_data.get('due_date'):
-                        task_data['due_date'] = datetime.fromisoformat(task_data['due_date'])
-                    
-                    self.tasks[task_id] = Task(**task_data)
+        """Open (or reopen) the configured task store"""
+        if self._store is not None:
+            self._store.close()
+        self._store = open_task_store(self.config.get("storage"))
+        self._metrics = None
+        self._search_index = None
+        if self._dedupe_index is not None:
+            self._dedupe_index.close()
+            self._dedupe_index = None
+        self.telemetry.count("tasks_loaded", len(self._store))
     
-    def save_tasks(self):
-        """Save tasks to storage"""
-        os.makedirs("data", exist_ok=True)
-        tasks_data = {
-            task_id: task.to_dict() 
-            for task_id, task in self.tasks.items()
+    @property
+    def store(self) -> TaskStore:
+        """Task store, opened on first access"""
+        if self._store is None:
+            self.load_tasks()
+        return self._store
+    
+    @property
+    def client(self):
+        """Model client selected by ``llm.client.mode``, built on the first model call.
+        
+        ``anthropic`` is the live API; ``record`` also saves every response as
+        a fixture, ``replay`` answers from those fixtures and ``fake`` is an
+        offline stand-in with simulated latency and errors.
+        """
+        if self._client is None:
+            from src.model_clients import create_model_client
+            self._client = create_model_client(self.model_client_config, self.api_key)
+        return self._client
+    
+    @client.setter
+    def client(self, client):
+        self._client = client
+    
+    @property
+    def needs_api_key(self) -> bool:
+        """Whether model calls go to the live API"""
+        return self._client is None and self.model_client_config.get("mode", "anthropic") in ("anthropic", "record")
+    
+    @property
+    def metrics(self) -> MetricsAggregator:
+        """Running task counters, built in one pass and then kept current by the store"""
+        if self._metrics is None:
+            store = self.store
+            self._metrics = MetricsAggregator()
+            with self.telemetry.span("metrics.rebuild"):
+                self._metrics.rebuild(store.values())
+            store.add_listener(self._metrics.observe)
+        else:
+            # Pick up tasks other processes wrote since the counters last looked
+            self.store.refresh()
+        return self._metrics
+    
+    @property
+    def search_index(self) -> "TaskSearchIndex":
+        """Full-text index over task titles, descriptions and tags, built once and then kept current by the store"""
+        if self._search_index is None:
+            from src.task_search import TaskSearchIndex
+            store = self.store
+            self._search_index = TaskSearchIndex()
+            with self.telemetry.span("search.rebuild"):
+                self._search_index.rebuild(store.values())
+            store.add_listener(self._search_index.observe)
+        else:
+            self.store.refresh()
+        return self._search_index
+    
+    @property
+    def dedupe_index(self) -> "DedupeIndex":
+        """Persistent near-duplicate index, caught up with the store on first use and then kept current"""
+        if self._dedupe_index is None:
+            from src.task_dedupe import DedupeIndex
+            store = self.store
+            index = DedupeIndex.from_config(self.config.get("dedupe"))
+            if index.enabled:
+                with self.telemetry.span("dedupe.sync"):
+                    rehashed = index.sync(store.values())
+                if rehashed:
+                    logger.info(f"Dedupe index: hashed {rehashed} new or changed tasks")
+                store.add_listener(index.observe)
+            self._dedupe_index = index
+        return self._dedupe_index
+    
+    @property
+    def flow(self) -> FlowMetrics:
+        """Lead/cycle time and velocity from the status-transition log"""
+        if self._flow is None:
+            self._flow = FlowMetrics.from_config(self.config)
+            if not self._flow.log.exists() and len(self.store):
+                self._flow.seed(self.store.values())
+        return self._flow
+    
+    @contextmanager
+    def bulk(self):
+        """Defer persistence of task changes until the block exits.
+        
+        The store journal is written once (or one SQLite transaction is
+        committed) and the event log flushed once for the whole block.
+        """
+        flow = self.flow
+        dedupe = self._dedupe_index.batch() if self._dedupe_index is not None else nullcontext()
+        try:
+            with self.store.batch(), flow.log.batch(), dedupe:
+                yield
+        except BaseException:
+            # A rolled-back SQLite batch leaves the running counters and indexes ahead of the store;
+            # the dedupe index catches up by version on its next sync
+            self._metrics = None
+            self._search_index = None
+            if self._dedupe_index is not None:
+                self._dedupe_index.close()
+                self._dedupe_index = None
+            raise
+    
+    @property
+    def tasks(self) -> TaskStore:
+        """Read-only mapping view of all tasks (task id -> Task)"""
+        return self.store
+    
+    @property
+    def metrics_history(self) -> "MetricsHistory":
+        """Columnar metrics history, backfilled from past metrics reports when first created"""
+        if self._metrics_history is None:
+            from src.metrics_history import MetricsHistory
+            history = MetricsHistory.from_config(self.config.get("metrics_history"))
+            if not history.exists():
+                entries = self.reports.latest("metrics", limit=None)
+                added = history.extend(self.reports.load(entry) for entry in entries)
+                if added:
+                    logger.info(f"Backfilled metrics history from {added} metrics reports")
+            self._metrics_history = history
+        return self._metrics_history
+    
+    def _source_roots(self) -> Dict[str, Path]:
+        return {
+            "ios": self.ios_path,
+            "swiftui": self.swiftui_path,
+            "android": self.android_path,
         }
-        with open("data/tasks.json", 'w') as f:
-            json.dump(tasks_data, f, indent=2)
     
+    @property
+    def scanner(self) -> "CodebaseScanner":
+        """Incremental scanner over the iOS, SwiftUI and Android source trees"""
+        if self._scanner is None:
+            from src.codebase_scanner import CodebaseScanner
+            scanner_config = self.config.get("scanner", {})
+            self._scanner = CodebaseScanner(
+                roots=self._source_roots(),
+                index_path=scanner_config.get("index_path", "data/scan_index.json"),
+                jobs=scanner_config.get("jobs")
+            )
+        return self._scanner
+    
+    @property
+    def parity_scanner(self) -> "CodebaseScanner":
+        """Scanner for parity checks, with its own index so analysis still sees every change"""
+        if self._parity_scanner is None:
+            from src.codebase_scanner import CodebaseScanner
+            self._parity_scanner = CodebaseScanner(
+                roots=self._source_roots(),
+                index_path=self.config.get("parity", {}).get("index_path", "data/parity_scan_index.json"),
+                jobs=self.config.get("scanner", {}).get("jobs")
+            )
+        return self._parity_scanner
+    
+    @traced()
+    def save_tasks(self):
+        """Write a full snapshot of all tasks"""
+        self.store.save()
+    
+    def close(self):
+        """Flush pending storage work and export telemetry"""
+        self.telemetry.flush()
+        if self._flow is not None:
+            self._flow.close()
+        if self._store is not None:
+            self._store.close()
+        if self._dedupe_index is not None:
+            self._dedupe_index.close()
+        self.response_cache.close()
+        self.reports.close()
+    
+    @property
+    def max_concurrent_requests(self) -> int:
+        return self.gateway.max_concurrent
+    
+    @max_concurrent_requests.setter
+    def max_concurrent_requests(self, value: int):
+        self.gateway.max_concurrent = value
+    
+    async def _complete(
+        self,
+        prompt: str,
+        max_tokens: int,
+        cache: bool = True,
+        purpose: str = "completion"
+    ) -> str:
+        """Send a single-turn prompt to the model and return the response text.
+        
+        The call goes through the model gateway: it waits for the rate limiter
+        and one of ``llm.max_concurrent_requests`` slots, each attempt is
+        cancelled after ``llm.request_timeout_seconds`` and throttling or
+        transient errors are retried with backoff. An identical request
+        already in flight is shared rather than sent again. With ``cache``
+        set, identical requests are answered from the response cache.
+        Tokens in and out of every model call are recorded under ``purpose``.
+        """
+        key = ResponseCache.make_key(self.model, max_tokens, self.temperature, prompt)
+        if cache:
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                self.telemetry.count("model_cache_hits", purpose=purpose)
+                return cached
+        
+        joined, content = await self.gateway.follow(key)
+        if joined:
+            return content
+        
+        with self.gateway.lead(key) as publish:
+            started = time.perf_counter()
+            with self.telemetry.span(f"model.{purpose}"):
+                response = await self.gateway.send(
+                    lambda: self.client.messages.create(
+                        model=self.model,
+                        max_tokens=max_tokens,
+                        temperature=self.temperature,
+                        messages=[{"role": "user", "content": prompt}]
+                    ),
+                    input_tokens=self.token_estimator.count(prompt),
+                    timeout=self.request_timeout
+                )
+            content = response.content[0].text
+            elapsed = time.perf_counter() - started
+            
+            await self._record_usage(purpose, prompt, getattr(response, "usage", None), elapsed)
+            if cache:
+                self.response_cache.put(key, content, elapsed)
+            publish(content)
+        return content
+    
+    async def _stream(
+        self,
+        prompt: str,
+        max_tokens: int,
+        cache: bool = True,
+        purpose: str = "completion"
+    ) -> AsyncIterator[str]:
+        """Like ``_complete``, but yields the response text as it is generated.
+        
+        The timeout covers the whole stream, not each chunk; only opening the
+        stream is retried. A cached or shared response is yielded as a single
+        chunk; a new one is cached once the stream completes.
+        """
+        key = ResponseCache.make_key(self.model, max_tokens, self.temperature, prompt)
+        if cache:
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                self.telemetry.count("model_cache_hits", purpose=purpose)
+                yield cached
+                return
+        
+        joined, content = await self.gateway.follow(key)
+        if joined:
+            yield content
+            return
+        
+        with self.gateway.lead(key) as publish:
+            started = time.perf_counter()
+            parts = []
+            # Not attached, so spans the consumer opens between chunks do not nest under the call
+            with self.telemetry.span(f"model.{purpose}", attach=False):
+                async with self.gateway.stream(
+                    lambda: self.client.messages.stream(
+                        model=self.model,
+                        max_tokens=max_tokens,
+                        temperature=self.temperature,
+                        messages=[{"role": "user", "content": prompt}]
+                    ),
+                    input_tokens=self.token_estimator.count(prompt),
+                    timeout=self.request_timeout
+                ) as stream:
+                    loop = asyncio.get_running_loop()
+                    deadline = loop.time() + self.request_timeout
+                    chunks = stream.text_stream.__aiter__()
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), timeout=max(0, deadline - loop.time()))
+                        except StopAsyncIteration:
+                            break
+                        except asyncio.TimeoutError:
+                            raise asyncio.TimeoutError(f"Model call timed out after {self.request_timeout}s")
+                        parts.append(chunk)
+                        yield chunk
+                    message = await stream.get_final_message()
+            elapsed = time.perf_counter() - started
+            content = "".join(parts)
+            
+            await self._record_usage(purpose, prompt, getattr(message, "usage", None), elapsed)
+            if cache:
+                self.response_cache.put(key, content, elapsed)
+            publish(content)
+    
+    async def _record_usage(self, purpose: str, prompt: str, usage: Any, elapsed: float):
+        """Add a call to the token ledger and calibrate the estimator on it"""
+        if usage is None:
+            return
+        await self.gateway.record_usage(usage)
+        self.telemetry.count("model_input_tokens", usage.input_tokens, purpose=purpose)
+        self.telemetry.count("model_output_tokens", usage.output_tokens, purpose=purpose)
+        self.token_usage.record(CallUsage(
+            purpose=purpose,
+            model=self.model,
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            estimated_input_tokens=self.token_estimator.count(prompt),
+            seconds=round(elapsed, 3)
+        ))
+        self.token_estimator.calibrate(prompt, usage.input_tokens)
+    
+    def _write_report(self, report_type: str, name: str, content: Any, number: Optional[int] = None) -> Path:
+        """Write and index a report, counting the bytes written"""
+        with self.telemetry.span("reports.write"):
+            path = self.reports.write(report_type, name, content, number=number)
+        if self.telemetry.enabled:
+            self.telemetry.count("report_bytes_written", path.stat().st_size, type=report_type)
+        return path
+    
+    @traced()
     async def analyze_codebase(self, platform: str = "both") -> Dict[str, Any]:
         """Analyze codebase for issues and improvements"""
         analysis = {
@@ -159,15 +477,31 @@ class ProjectManagerAgent:
             "metrics": {}
         }
         
-        prompt = f"""Analyze the following project structure and provide insights:
+        from src.codebase_scanner import summarize_scan
         
-        iOS React Native App: {self.ios_path}
-        - Stack: React Native, Expo, JavaScript
-        - Features: Character creation, quest system, XP tracking
+        # Only files whose size/mtime changed are re-read; the model sees the diff
+        roots = {
+            "ios": ["ios", "swiftui"],
+            "android": ["android"],
+        }.get(platform, ["ios", "swiftui", "android"])
+        # In a worker thread: a cold scan parses in a process pool and would block the loop
+        scan = await asyncio.to_thread(self.scanner.scan, roots)
+        analysis["metrics"] = scan.totals
+        analysis["changes"] = {
+            "added": len(scan.added),
+            "modified": len(scan.modified),
+            "removed": len(scan.removed),
+            "scan_seconds": round(scan.duration, 3)
+        }
+        max_files = self.config.get("scanner", {}).get("max_changed_files", 40)
+        saved = False
+        
+        prompt = f"""Analyze the MindQuest codebase from this scan of its source trees:
+        
+        iOS apps: {self.ios_path} (React Native), {self.swiftui_path} (SwiftUI)
+        Android app: {self.android_path} (Kotlin, Jetpack Compose, Room)
         
-        Android Native App: {self.android_path}
-        - Stack: Kotlin, Jetpack Compose, Room Database
-        - Features: Material3 design, MVVM architecture
+        {summarize_scan(scan, max_files=max_files)}
         
         Please identify:
         1. Critical issues that need immediate attention
@@ -181,36 +515,37 @@ class ProjectManagerAgent:
         """
         
         try:
-            response = self.client.messages.create(
-                model="claude-sonnet-4-6",
-                max_tokens=2000,
-                messages=[{"role": "user", "content": prompt}]
-            )
+            content = await self._complete(prompt, max_tokens=2000, purpose="analysis")
             
             # Parse response and extract insights
-            content = response.content[0].text
             logger.info(f"Codebase analysis completed for {platform}")
             
             # Store analysis results
             analysis["ai_insights"] = content
             self.save_analysis_report(analysis)
             
+            # The next analysis diffs against what this one has seen
+            self.scanner.save_index()
+            saved = True
+            
             return analysis
             
         except Exception as e:
             logger.error(f"Error analyzing codebase: {e}")
             analysis["error"] = str(e)
             return analysis
+        finally:
+            if not saved:
+                # The scan already moved the in-memory index on; the next analysis must see these changes again
+                self.scanner.reload_index()
     
     def save_analysis_report(self, analysis: dict):
         """Save analysis report to file"""
-        os.makedirs("reports", exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"reports/analysis_{timestamp}.json"
-        with open(filename, 'w') as f:
-            json.dump(analysis, f, indent=2)
-        logger.info(f"Analysis report saved to {filename}")
+        path = self._write_report("analysis", f"analysis_{timestamp}.json", analysis)
+        logger.info(f"Analysis report saved to {path}")
     
+    @traced()
     async def generate_sprint_plan(self) -> Dict[str, Any]:
         """Generate a sprint plan based on current tasks and priorities"""
         sprint_plan = {
@@ -220,30 +555,33 @@ class ProjectManagerAgent:
             "goals": [],
             "tasks": [],
             "estimated_hours": 0,
-            "capacity_hours": self.config["sprint_duration_days"] * self.config["work_hours_per_day"]
+            "capacity_hours": team_capacity_hours(self.team, self.config["sprint_duration_days"])
         }
         
-        # Get high priority and in-progress tasks
-        priority_tasks = [
-            task for task in self.tasks.values()
-            if task.status in [TaskStatus.TODO, TaskStatus.IN_PROGRESS]
-            and task.priority in [TaskPriority.CRITICAL, TaskPriority.HIGH]
-        ]
-        
-        # Sort by priority and add to sprint
-        priority_tasks.sort(key=lambda x: (x.priority.value, x.created_at))
+        # Pick critical/high tasks (plus their prerequisites) in dependency order
+        selection = plan_sprint(
+            self.store.query(status=list(OPEN_STATUSES)),
+            capacity_hours=sprint_plan["capacity_hours"],
+            resolve_status=self._task_status
+        )
         
-        total_hours = 0
-        for task in priority_tasks:
-            if total_hours + task.estimated_hours <= sprint_plan["capacity_hours"]:
-                sprint_plan["tasks"].append(task.to_dict())
-                total_hours += task.estimated_hours
+        sprint_plan["tasks"] = [task.to_dict() for task in selection.tasks]
+        sprint_plan["estimated_hours"] = selection.hours
+        sprint_plan["utilization"] = (selection.hours / sprint_plan["capacity_hours"]) * 100
+        sprint_plan["deferred"] = selection.deferred
+        sprint_plan["blocked"] = selection.blocked
+        sprint_plan["dependency_cycles"] = selection.cycles
+        for cycle in selection.cycles:
+            logger.warning(f"Dependency cycle between tasks: {', '.join(cycle)}")
         
-        sprint_plan["estimated_hours"] = total_hours
-        sprint_plan["utilization"] = (total_hours / sprint_plan["capacity_hours"]) * 100
+        # Balance the selected work across team members
+        if self.config.get("auto_assign_tasks", True):
+            assignment = self.assign_tasks(selection.tasks)
+            sprint_plan["assignments"] = assignment.to_dict()
+            sprint_plan["tasks"] = [task.to_dict() for task in selection.tasks]
         
         # Generate sprint goals using AI
-        goals = await self.generate_sprint_goals(sprint_plan["tasks"])
+        goals = await self.generate_sprint_goals(selection.tasks)
         sprint_plan["goals"] = goals
         
         # Save sprint plan
@@ -251,151 +589,234 @@ class ProjectManagerAgent:
         
         return sprint_plan
     
-    async def generate_sprint_goals(self, tasks: List[dict]) -> List[str]:
+    def _context_budget(self, purpose: str, fixed_text: str) -> int:
+        """Tokens left for packed context under ``llm.prompt_budget_tokens[purpose]``"""
+        budget = self.prompt_budgets.get(purpose, self.prompt_budgets.get("default", 4000))
+        return max(0, budget - self.token_estimator.count(fixed_text))
+    
+    @traced()
+    async def generate_sprint_goals(self, tasks: List[Task]) -> List[str]:
         """Generate sprint goals based on tasks"""
         if not tasks:
             return ["Complete backlog grooming", "Improve test coverage"]
         
-        task_summaries = [f"- {task['title']}: {task['description']}" for task in tasks[:10]]
+        header = f"""Based on these sprint tasks, generate 3-5 concise sprint goals:
         
-        prompt = f"""Based on these sprint tasks, generate 3-5 concise sprint goals:
-        
-        Tasks:
-        {chr(10).join(task_summaries)}
+        Tasks ({len(tasks)} in the sprint, most important first):
+"""
+        footer = """
         
         Generate strategic goals that encompass these tasks. Be specific and measurable.
         Return as a JSON array of strings.
         """
+        packed = pack_tasks(tasks, self._context_budget("sprint_goals", header + footer), self.token_estimator)
+        prompt = header + packed.text + footer
+        
+        from src.structured_output import SprintGoal, StructuredArrayParser
         
+        parser = StructuredArrayParser(SprintGoal)
+        goals: List[str] = []
         try:
-            response = self.client.messages.create(
-                model="claude-sonnet-4-6",
-                max_tokens=500,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            content = response.content[0].text
-            # Parse JSON array from response
-            import re
-            json_match = re.search(r'\[.*?\]', content, re.DOTALL)
-            if json_match:
-                goals = json.loads(json_match.group())
-                return goals
-            
+            async for chunk in self._stream(prompt, max_tokens=500, purpose="sprint_goals"):
+                goals.extend(parser.feed(chunk))
+            goals.extend(parser.finish())
         except Exception as e:
             logger.error(f"Error generating sprint goals: {e}")
         
+        for index, problem in parser.errors:
+            logger.warning(f"Skipped sprint goal {index}: {problem}")
+        if goals:
+            return goals
+        
         return ["Complete high-priority features", "Maintain platform parity"]
     
+    @traced()
+    def assign_tasks(
+        self,
+        tasks: Optional[List[Task]] = None,
+        horizon_days: Optional[int] = None,
+        persist: bool = True
+    ) -> AssignmentPlan:
+        """Assign tasks to team members, respecting platform skills and dependencies"""
+        if tasks is None:
+            tasks = self.store.query(status=list(OPEN_STATUSES))
+        
+        plan = assign_tasks(
+            tasks,
+            self.team,
+            horizon_days=horizon_days or self.config["sprint_duration_days"],
+            start_date=datetime.now().date(),
+            is_done=lambda task_id: self._task_status(task_id) == TaskStatus.COMPLETED
+        )
+        
+        if persist:
+            for task in tasks:
+                member = plan.assignments.get(task.id)
+                if member and task.assigned_to != member:
+                    try:
+                        self.store.update(task.id, expected_version=task.version, assigned_to=member)
+                        task.assigned_to = member
+                    except VersionConflict as e:
+                        # Changed elsewhere since the plan was made; the next run reassigns it
+                        logger.warning(f"Not assigning {task.id} to {member}: {e}")
+        
+        logger.info(f"Assigned {len(plan.assignments)} tasks across {len(self.team)} team members")
+        return plan
+    
+    def _task_status(self, task_id: str) -> Optional[TaskStatus]:
+        """Status of a task, or None if it does not exist"""
+        task = self.store.get(task_id)
+        return task.status if task else None
+    
     def get_next_sprint_number(self) -> int:
         """Get the next sprint number"""
-        sprint_files = list(Path("reports").glob("sprint_*.json"))
-        if not sprint_files:
-            return 1
-        
-        numbers = [int(f.stem.split("_")[1]) for f in sprint_files]
-        return max(numbers) + 1
+        return (self.reports.latest_number("sprint") or 0) + 1
     
     def save_sprint_plan(self, sprint_plan: dict):
         """Save sprint plan to file"""
-        os.makedirs("reports", exist_ok=True)
-        filename = f"reports/sprint_{sprint_plan['sprint_number']}.json"
-        with open(filename, 'w') as f:
-            json.dump(sprint_plan, f, indent=2)
-        logger.info(f"Sprint plan saved to {filename}")
+        number = sprint_plan['sprint_number']
+        path = self._write_report("sprint", f"sprint_{number}.json", sprint_plan, number=number)
+        logger.info(f"Sprint plan saved to {path}")
     
+    @traced()
     async def check_feature_parity(self) -> Dict[str, Any]:
-        """Check feature parity between iOS and Android apps"""
+        """Check feature parity between iOS and Android apps.
+        
+        Screens, managers, models and persistence entities are fingerprinted
+        from the Swift and Kotlin sources and matched across platforms
+        locally, and a task is created for each gap. The model is only asked
+        to explain what is left, and the same residual diff is answered from
+        the response cache. If a source tree is missing, or either platform
+        has no features, every feature would look like a gap, so only the
+        report is saved.
+        """
+        from src.feature_parity import compare_platforms
+        
+        parity_config = self.config.get("parity", {})
+        ios_roots = parity_config.get("ios_roots", ["swiftui", "ios"])
+        android_roots = parity_config.get("android_roots", ["android"])
+        
+        # Only changed files are re-parsed; fingerprints come from the scan index
+        scan = await asyncio.to_thread(self.parity_scanner.scan, [*ios_roots, *android_roots])
+        diff = compare_platforms(
+            scan.files, ios_roots, android_roots, threshold=parity_config.get("match_threshold", 0.8)
+        )
+        self.parity_scanner.save_index()
         parity_report = {
             "timestamp": datetime.now().isoformat(),
-            "ios_features": [],
-            "android_features": [],
-            "missing_in_ios": [],
-            "missing_in_android": [],
+            **diff.to_dict(),
+            "missing_roots": scan.missing_roots,
             "recommendations": []
         }
+        logger.info(
+            f"Parity diff at revision {diff.revision}: {len(diff.matched)} features matched, "
+            f"{len(diff.missing_in_android)} missing in Android, {len(diff.missing_in_ios)} missing in iOS"
+        )
+        
+        if scan.missing_roots or not diff.ios_features or not diff.android_features:
+            if scan.missing_roots:
+                logger.warning(
+                    f"Source trees not found: {', '.join(scan.missing_roots)}; check IOS_APP_PATH, "
+                    f"SWIFTUI_APP_PATH and ANDROID_APP_PATH or parity.ios_roots/android_roots"
+                )
+            else:
+                logger.warning("No Swift or Kotlin features found on one platform; not comparing")
+            parity_report["tasks_created"] = []
+            self.save_parity_report(parity_report)
+            return parity_report
+        
+        # Create tasks for missing features
+        created = self.create_parity_tasks(diff, limit=parity_config.get("max_new_tasks", 20))
+        parity_report["tasks_created"] = [task.id for task in created]
+        parity_report["recommendations"] = [task.title for task in created]
         
-        prompt = """Analyze feature parity between MindQuest iOS and Android apps:
+        if diff.empty:
+            parity_report["analysis"] = "No parity gaps: every feature has a counterpart on the other platform."
+            self.save_parity_report(parity_report)
+            return parity_report
+        
+        prompt = f"""Review feature parity between the MindQuest iOS and Android apps.
         
-        iOS (React Native):
-        - Character creation with D&D classes
-        - Quest system with XP
-        - Cross-platform (iOS/Web)
-        - AsyncStorage for persistence
+        A static comparison of their Swift and Kotlin sources (screens, managers,
+        models and persistence entities) left these differences:
         
-        Android (Kotlin):
-        - Character creation and management
-        - Quest system with categories
-        - Material3 design
-        - Room database
+        {diff.residual(max_items=parity_config.get("max_residual_items", 40))}
         
-        Identify:
-        1. Features present in iOS but missing in Android
-        2. Features present in Android but missing in iOS
-        3. Implementation differences
-        4. Priority recommendations for achieving parity
+        For each difference, say whether it looks like a missing feature or only
+        a naming or architecture difference, and which gaps to close first.
+        Parity tasks already exist for the missing features.
         
         Return as structured JSON.
         """
         
         try:
-            response = self.client.messages.create(
-                model="claude-sonnet-4-6",
-                max_tokens=1500,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            parity_report["analysis"] = response.content[0].text
-            
-            # Create tasks for missing features
-            await self.create_parity_tasks(parity_report)
-            
-            # Save report
-            self.save_parity_report(parity_report)
-            
-            return parity_report
-            
+            parity_report["analysis"] = await self._complete(prompt, max_tokens=1500, purpose="parity")
         except Exception as e:
             logger.error(f"Error checking feature parity: {e}")
             parity_report["error"] = str(e)
-            return parity_report
+        
+        # Save report
+        self.save_parity_report(parity_report)
+        
+        return parity_report
     
-    async def create_parity_tasks(self, parity_report: dict):
-        """Create tasks for achieving feature parity"""
-        # This would parse the AI response and create specific tasks
-        pass
+    def create_parity_tasks(self, diff: "ParityDiff", limit: Optional[int] = None) -> List[Task]:
+        """Create a task for each feature found on only one platform.
+        
+        Tasks are tagged with the feature they port, so a gap that already
+        has a task, open or done, is not given another. At most ``limit``
+        tasks are created per check, entities first.
+        """
+        existing = {tag for task in self.store.query() for tag in task.tags if tag.startswith("parity:")}
+        order = list(PARITY_TASK_DEFAULTS)
+        gaps = sorted(
+            diff.missing_in_android + diff.missing_in_ios,
+            key=lambda feature: (order.index(feature.kind), feature.platform, feature.name)
+        )
+        names = {"ios": "iOS", "android": "Android"}
+        created: List[Task] = []
+        with self.bulk():
+            for feature in gaps:
+                if feature.tag in existing:
+                    continue
+                if limit is not None and len(created) >= limit:
+                    break
+                priority, hours = PARITY_TASK_DEFAULTS[feature.kind]
+                source, target = names[feature.platform], names[feature.other_platform]
+                created.append(self.create_task(
+                    title=f"Port {feature.name} {feature.kind} to {target}",
+                    description=f"{feature.name} ({feature.path}) is an {source} {feature.kind} with no {target} counterpart",
+                    platform=feature.other_platform,
+                    priority=priority,
+                    estimated_hours=hours,
+                    tags=["parity", feature.kind, feature.tag]
+                ))
+                existing.add(feature.tag)
+        if created:
+            logger.info(f"Created {len(created)} parity tasks")
+        return created
     
     def save_parity_report(self, report: dict):
         """Save feature parity report"""
-        os.makedirs("reports", exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"reports/parity_{timestamp}.json"
-        with open(filename, 'w') as f:
-            json.dump(report, f, indent=2)
-        logger.info(f"Parity report saved to {filename}")
+        path = self._write_report("parity", f"parity_{timestamp}.json", report)
+        logger.info(f"Parity report saved to {path}")
     
+    @traced()
     async def generate_daily_standup(self) -> str:
         """Generate daily standup report"""
-        yesterday = datetime.now() - timedelta(days=1)
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        yesterday = today - timedelta(days=1)
         
         # Get completed tasks
-        completed = [
-            task for task in self.tasks.values()
-            if task.status == TaskStatus.COMPLETED
-            and task.updated_at.date() == yesterday.date()
-        ]
+        completed_filter = dict(status=TaskStatus.COMPLETED, updated_after=yesterday, updated_before=today)
+        completed = self.store.query(**completed_filter, limit=5)
         
         # Get in-progress tasks
-        in_progress = [
-            task for task in self.tasks.values()
-            if task.status == TaskStatus.IN_PROGRESS
-        ]
+        in_progress = self.store.query(status=TaskStatus.IN_PROGRESS, limit=5)
         
         # Get blocked tasks
-        blocked = [
-            task for task in self.tasks.values()
-            if task.status == TaskStatus.BLOCKED
-        ]
+        blocked = self.store.query(status=TaskStatus.BLOCKED, limit=5)
         
         standup = f"""
 # Daily Standup - {datetime.now().strftime('%Y-%m-%d')}
@@ -410,9 +831,9 @@ class ProjectManagerAgent:
 {self._format_task_list(blocked)}
 
 ## Metrics
-- Tasks Completed: {len(completed)}
-- Tasks In Progress: {len(in_progress)}
-- Blocked Tasks: {len(blocked)}
+- Tasks Completed: {self.store.count(**completed_filter)}
+- Tasks In Progress: {self.metrics.count(TaskStatus.IN_PROGRESS)}
+- Blocked Tasks: {self.metrics.count(TaskStatus.BLOCKED)}
 - Sprint Progress: {self.calculate_sprint_progress()}%
         """
         
@@ -430,17 +851,9 @@ class ProjectManagerAgent:
     
     def calculate_sprint_progress(self) -> float:
         """Calculate current sprint progress"""
-        sprint_tasks = [
-            task for task in self.tasks.values()
-            if task.status != TaskStatus.TODO
-        ]
-        
-        if not sprint_tasks:
-            return 0
-        
-        completed = len([t for t in sprint_tasks if t.status == TaskStatus.COMPLETED])
-        return round((completed / len(sprint_tasks)) * 100, 1)
+        return self.metrics.sprint_progress
     
+    @traced()
     def create_task(
         self,
         title: str,
@@ -451,7 +864,7 @@ class ProjectManagerAgent:
         **kwargs
     ) -> Task:
         """Create a new task"""
-        task_id = f"TASK-{len(self.tasks) + 1:04d}"
+        task_id = self._next_task_id()
         
         task = Task(
             id=task_id,
@@ -464,31 +877,268 @@ class ProjectManagerAgent:
             **kwargs
         )
         
-        self.tasks[task_id] = task
-        self.save_tasks()
+        # Open (and, on first use, seed) the event log before the new task is stored
+        flow = self.flow
+        self.store.add(task)
+        flow.record(task.id, None, task.status, task.estimated_hours, at=task.created_at)
         
         logger.info(f"Created task {task_id}: {title}")
         return task
     
+    def _next_task_id(self) -> str:
+        """Next TASK-NNNN id, unique across every process sharing the store"""
+        return self.store.allocate_id("TASK-", 4)
+    
+    def _valid_platforms(self) -> set:
+        return set(self.config.get("platforms", ["ios", "android", "web"])) | {"both"}
+    
+    @traced()
+    def import_tasks(
+        self,
+        source: TextIO,
+        fmt: str,
+        on_conflict: str = "skip",
+        batch_size: int = 500,
+        strict: bool = False,
+        dry_run: bool = False,
+        deduplicate: bool = True
+    ) -> ImportResult:
+        """Stream tasks from JSONL/CSV into the store as one bulk commit.
+        
+        With ``strict`` every record is validated first (``source`` must be
+        seekable) and nothing is written if any record is invalid. With
+        ``deduplicate`` a new task that nearly duplicates a stored one, or
+        one earlier in the import, is merged into it instead of created.
+        Written batches are found through the dedupe index, so only the
+        current batch is kept in memory; a dry run therefore only compares
+        new tasks within a batch.
+        """
+        platforms = self._valid_platforms()
+        if strict:
+            checked = validate_records(read_records(source, fmt), platforms)
+            if checked.invalid or dry_run:
+                return checked
+            source.seek(0)
+        
+        def record_history(task: Task, previous: Optional[Task]):
+            if previous is None:
+                self.flow.record(task.id, None, TaskStatus.TODO, task.estimated_hours, at=task.created_at)
+                if task.status != TaskStatus.TODO:
+                    self.flow.record(task.id, TaskStatus.TODO, task.status, task.estimated_hours, at=task.updated_at)
+            elif previous.status != task.status:
+                self.flow.record(task.id, previous.status, task.status, task.estimated_hours, at=task.updated_at)
+        
+        deduplicate = deduplicate and self.dedupe_index.enabled
+        if deduplicate:
+            from src.task_dedupe import LocalLSH, jaccard, shingles
+            threshold = self.dedupe_index.threshold
+            pending = LocalLSH(self.dedupe_index.hasher)
+            
+            def merge(task: Task) -> bool:
+                duplicate = self.find_duplicate(task.title, task.description)
+                tokens = shingles(task.title, task.description)
+                if duplicate is None:
+                    # Tasks accepted earlier in this batch are not stored yet
+                    duplicate = next((
+                        other for other in pending.candidates(tokens)
+                        if jaccard(tokens, shingles(other.title, other.description)) >= threshold
+                    ), None)
+                if duplicate is None:
+                    pending.add(task, tokens)
+                    return False
+                if not dry_run:
+                    self.merge_duplicate(duplicate, task.priority, task.tags)
+                return True
+        
+        with self.bulk():
+            result = import_tasks(
+                self.store,
+                read_records(source, fmt),
+                allocate_id=self._next_task_id,
+                platforms=platforms,
+                on_conflict=on_conflict,
+                batch_size=batch_size,
+                dry_run=dry_run,
+                on_imported=record_history,
+                deduplicate=merge if deduplicate else None,
+                # Written tasks reach the dedupe index through the store
+                on_batch=pending.clear if deduplicate else None
+            )
+        logger.info(
+            f"Imported {result.imported} tasks ({result.replaced} replaced, "
+            f"{result.skipped} skipped, {result.merged} merged, {result.invalid} invalid)"
+        )
+        return result
+    
+    @traced()
+    def export_tasks(self, out: TextIO, fmt: str, **filters) -> int:
+        """Stream tasks matching ``filters`` (status/priority/platform values) to ``out``"""
+        wanted = {name: set(values) for name, values in filters.items() if values}
+        
+        def matching():
+            for task in self.store.values():
+                if "status" in wanted and task.status.value not in wanted["status"]:
+                    continue
+                if "priority" in wanted and task.priority.value not in wanted["priority"]:
+                    continue
+                if "platform" in wanted and task.platform not in wanted["platform"]:
+                    continue
+                yield task
+        
+        return write_tasks(matching(), out, fmt)
+    
+    @traced()
+    def search_tasks(
+        self,
+        query: str,
+        status=None,
+        priority=None,
+        platform=None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> "SearchResults":
+        """BM25-ranked tasks matching ``query``, optionally filtered by status/priority/platform values.
+        
+        Returns one page of ``limit`` hits starting at ``offset``, with the
+        tasks attached, and the total number of matches.
+        """
+        results = self.search_index.search(
+            query, status=status, priority=priority, platform=platform, limit=limit, offset=offset
+        )
+        tasks = self.store.get_many(hit.task_id for hit in results.hits)
+        for hit in results.hits:
+            hit.task = tasks.get(hit.task_id)
+        return results
+    
+    def find_duplicate(self, title: str, description: str, exclude: Optional[str] = None) -> Optional[Task]:
+        """The existing task most similar to this text, if at or above ``dedupe.threshold``.
+        
+        Only tasks sharing an LSH bucket with the text are compared, by the
+        Jaccard similarity of their title and description terms.
+        """
+        index = self.dedupe_index
+        if not index.enabled:
+            return None
+        from src.task_dedupe import jaccard, shingles
+        
+        tokens = shingles(title, description)
+        best, best_score = None, index.threshold
+        for task in self.store.get_many(sorted(index.candidates(tokens))).values():
+            if task.id == exclude:
+                continue
+            score = jaccard(tokens, shingles(task.title, task.description))
+            if score >= best_score and (best is None or score > best_score):
+                best, best_score = task, score
+        return best
+    
+    def merge_duplicate(self, existing: Task, priority: TaskPriority, tags: Iterable[str] = ()) -> Task:
+        """Fold a near-duplicate into ``existing`` instead of creating it.
+        
+        An open task takes the higher of the two priorities; tags are merged.
+        """
+        fields = {}
+        if existing.status != TaskStatus.COMPLETED and PRIORITY_RANK[priority] < PRIORITY_RANK[existing.priority]:
+            fields["priority"] = priority
+        merged_tags = tuple(dict.fromkeys((*existing.tags, *tags)))
+        if merged_tags != existing.tags:
+            fields["tags"] = merged_tags
+        if fields and existing.version == 0:
+            # Not stored yet (earlier in the same import): it is stored with the merged fields
+            for name, value in fields.items():
+                setattr(existing, name, value)
+        elif fields:
+            existing = self.store.update(existing.id, updated_at=datetime.now(), **fields) or existing
+        self.telemetry.count("tasks_deduplicated")
+        return existing
+    
+    @traced()
+    def find_duplicate_clusters(self) -> List[List[Task]]:
+        """Groups of near-duplicate tasks across the backlog, oldest task first in each.
+        
+        Built from the LSH buckets with union-find, so only tasks sharing a
+        bucket are ever compared.
+        """
+        from src.task_dedupe import cluster_duplicates, shingles
+        
+        store = self.store
+        
+        def load_tokens(task_id: str):
+            task = store.get(task_id)
+            return None if task is None else shingles(task.title, task.description)
+        
+        clusters = []
+        for group in cluster_duplicates(self.dedupe_index, load_tokens):
+            tasks = sorted(store.get_many(group).values(), key=lambda task: (task.created_us, task.id))
+            if len(tasks) > 1:
+                clusters.append(tasks)
+        clusters.sort(key=len, reverse=True)
+        return clusters
+    
+    def link_duplicates(self, clusters: List[List[Task]]) -> int:
+        """Tag every task but the first in each cluster ``duplicate-of:<first id>``; returns tasks tagged"""
+        linked = 0
+        with self.bulk():
+            for canonical, *duplicates in clusters:
+                tag = f"{DUPLICATE_TAG_PREFIX}{canonical.id}"
+                for task in duplicates:
+                    if any(existing.startswith(DUPLICATE_TAG_PREFIX) for existing in task.tags):
+                        continue
+                    self.store.update(task.id, tags=(*task.tags, tag), updated_at=datetime.now())
+                    linked += 1
+        logger.info(f"Linked {linked} duplicate tasks")
+        return linked
+    
+    @traced()
     def update_task_status(self, task_id: str, status: TaskStatus):
-        """Update task status"""
-        if task_id in self.tasks:
-            self.tasks[task_id].status = status
-            self.tasks[task_id].updated_at = datetime.now()
-            self.save_tasks()
-            logger.info(f"Updated task {task_id} status to {status.value}")
+        """Update task status and record the transition"""
+        conflict = None
+        for _ in range(STATUS_UPDATE_ATTEMPTS):
+            task = self.store.get(task_id)
+            if task is None:
+                logger.error(f"Task {task_id} not found")
+                return
+            
+            previous = task.status
+            now = datetime.now()
+            try:
+                # Only applies if no other process changed the task since it was read,
+                # so the recorded transition starts from the status it really replaced
+                task = self.store.update(task_id, expected_version=task.version, status=status, updated_at=now)
+                break
+            except VersionConflict as e:
+                logger.info(f"{e}; retrying")
+                conflict = e
+                self.store.refresh()
         else:
+            raise conflict
+        if task is None:
             logger.error(f"Task {task_id} not found")
+            return
+        if previous != status:
+            self.flow.record(task_id, previous, status, task.estimated_hours, at=now)
+        logger.info(f"Updated task {task_id} status to {status.value}")
     
+    @traced()
     async def suggest_next_tasks(self, developer_context: str = "") -> List[Task]:
         """AI-powered task suggestions based on current state"""
-        prompt = f"""Based on the MindQuest project status, suggest the next 5 high-impact tasks:
+        metrics = self.metrics
+        status_line = (
+            f"{metrics.total} tasks, {metrics.count(TaskStatus.COMPLETED)} completed, "
+            f"{metrics.count(TaskStatus.IN_PROGRESS)} in progress, {metrics.count(TaskStatus.BLOCKED)} blocked"
+        )
+        header = f"""Based on the MindQuest project status, suggest the next 5 high-impact tasks:
         
         Project: Gamified ADHD productivity app
         Platforms: iOS (React Native), Android (Kotlin)
         
         Current Context: {developer_context}
         
+        Backlog: {status_line}
+        
+        Open tasks (most important first):
+"""
+        footer = """
+        
         Consider:
         1. Feature parity between platforms
         2. User experience improvements
@@ -496,54 +1146,76 @@ class ProjectManagerAgent:
         4. Bug fixes
         5. Testing coverage
         
+        Do not suggest work already covered by the tasks above.
         Return as JSON array with: title, description, platform, priority, estimated_hours
         """
         
+        # Open work gets most of the budget; recent completions fill what is left
+        budget = self._context_budget("suggestions", header + footer + RECENTLY_COMPLETED_HEADING)
+        backlog = pack_tasks(
+            self.store.query(status=list(REMAINING_STATUSES)),
+            int(budget * (1 - RECENTLY_COMPLETED_SHARE)),
+            self.token_estimator
+        )
+        recent = self.store.query(status=TaskStatus.COMPLETED, order_by="updated_at")[-RECENTLY_COMPLETED_LIMIT:]
+        completed = pack_tasks(reversed(recent), budget - backlog.tokens, self.token_estimator, ordered=True)
+        prompt = header + (backlog.text or "(none)")
+        if completed.text:
+            prompt += RECENTLY_COMPLETED_HEADING + completed.text
+        prompt += footer
+        
+        from src.structured_output import StructuredArrayParser, TaskSuggestion
+        
+        # Each task is created as soon as its array element is complete
+        parser = StructuredArrayParser(TaskSuggestion)
+        platforms = self._valid_platforms()
+        # Caught up before streaming, so the first suggestion does not wait for it
+        self.dedupe_index
+        started = time.perf_counter()
+        created_tasks = []
+        
+        def create(suggestions: List[TaskSuggestion]):
+            for suggestion in suggestions:
+                if suggestion.platform not in platforms:
+                    logger.warning(f"Suggested task '{suggestion.title}' has unknown platform '{suggestion.platform}', using 'both'")
+                    suggestion.platform = "both"
+                duplicate = self.find_duplicate(suggestion.title, suggestion.description)
+                if duplicate is not None:
+                    self.merge_duplicate(duplicate, suggestion.priority)
+                    logger.info(f"Suggested task '{suggestion.title}' duplicates {duplicate.id}; merged instead of created")
+                    continue
+                created_tasks.append(self.create_task(
+                    title=suggestion.title,
+                    description=suggestion.description,
+                    platform=suggestion.platform,
+                    priority=suggestion.priority,
+                    estimated_hours=suggestion.estimated_hours
+                ))
+                if len(created_tasks) == 1:
+                    logger.info(f"First suggested task created after {time.perf_counter() - started:.2f}s")
+        
         try:
-            response = self.client.messages.create(
-                model="claude-sonnet-4-6",
-                max_tokens=1000,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            content = response.content[0].text
-            
-            # Parse JSON and create tasks
-            import re
-            json_match = re.search(r'\[.*?\]', content, re.DOTALL)
-            if json_match:
-                suggestions = json.loads(json_match.group())
-                
-                created_tasks = []
-                for suggestion in suggestions:
-                    task = self.create_task(
-                        title=suggestion.get("title", "New Task"),
-                        description=suggestion.get("description", ""),
-                        platform=suggestion.get("platform", "both"),
-                        priority=TaskPriority(suggestion.get("priority", "medium")),
-                        estimated_hours=suggestion.get("estimated_hours", 4.0)
-                    )
-                    created_tasks.append(task)
-                
-                return created_tasks
-                
+            async for chunk in self._stream(prompt, max_tokens=1000, cache=False, purpose="suggestions"):
+                create(parser.feed(chunk))
+            create(parser.finish())
         except Exception as e:
             logger.error(f"Error suggesting tasks: {e}")
         
-        return []
+        for index, problem in parser.errors:
+            logger.warning(f"Skipped suggestion {index}: {problem}")
+        return created_tasks
     
-    async def run_daily_automation(self):
-        """Run daily automation tasks"""
+    @traced()
+    async def run_daily_automation(self) -> str:
+        """Run daily automation tasks and return the standup report"""
         logger.info("Running daily automation...")
         
         # Generate daily standup
         standup = await self.generate_daily_standup()
         
         # Save standup
-        os.makedirs("reports/standups", exist_ok=True)
         date_str = datetime.now().strftime("%Y%m%d")
-        with open(f"reports/standups/standup_{date_str}.md", 'w') as f:
-            f.write(standup)
+        self._write_report("standup", f"standups/standup_{date_str}.md", standup)
         
         # Check for stale tasks
         await self.check_stale_tasks()
@@ -551,61 +1223,114 @@ class ProjectManagerAgent:
         # Update metrics
         await self.update_project_metrics()
         
+        # Archive or drop reports past their retention
+        with self.telemetry.span("reports.apply_retention"):
+            self.reports.apply_retention()
+        
         logger.info("Daily automation completed")
+        return standup
+    
+    @traced()
+    async def run_weekly_review(self) -> Dict[str, Any]:
+        """Codebase analysis and feature parity check, run together"""
+        analysis, parity = await asyncio.gather(
+            self.analyze_codebase("both"),
+            self.check_feature_parity()
+        )
+        return {"analysis": analysis, "feature_parity": parity}
     
+    @traced()
     async def check_stale_tasks(self):
         """Check for tasks that haven't been updated recently"""
         stale_threshold = datetime.now() - timedelta(days=7)
         
-        stale_tasks = [
-            task for task in self.tasks.values()
-            if task.status == TaskStatus.IN_PROGRESS
-            and task.updated_at < stale_threshold
-        ]
+        stale_tasks = self.store.query(
+            status=TaskStatus.IN_PROGRESS,
+            updated_before=stale_threshold
+        )
         
         for task in stale_tasks:
             logger.warning(f"Stale task detected: {task.id} - {task.title}")
     
+    @traced()
     async def update_project_metrics(self):
         """Update project metrics"""
         metrics = {
             "timestamp": datetime.now().isoformat(),
-            "total_tasks": len(self.tasks),
-            "completed_tasks": len([t for t in self.tasks.values() if t.status == TaskStatus.COMPLETED]),
-            "in_progress_tasks": len([t for t in self.tasks.values() if t.status == TaskStatus.IN_PROGRESS]),
-            "blocked_tasks": len([t for t in self.tasks.values() if t.status == TaskStatus.BLOCKED]),
-            "ios_tasks": len([t for t in self.tasks.values() if t.platform in ["ios", "both"]]),
-            "android_tasks": len([t for t in self.tasks.values() if t.platform in ["android", "both"]]),
+            **self.metrics.snapshot(),
             "average_completion_time": self.calculate_average_completion_time(),
-            "sprint_velocity": self.calculate_sprint_velocity()
+            "average_lead_time": self.flow.average_lead_time_hours(),
+            "sprint_velocity": self.calculate_sprint_velocity(),
+            "remaining_hours": self.store.sum_hours(status=REMAINING_STATUSES),
+            "sprints": self.flow.sprint_report(last=self.flow.velocity_window + 1)
         }
         
-        # Save metrics
-        os.makedirs("reports/metrics", exist_ok=True)
+        # Save metrics; the history is opened first so a backfill does not count this report twice
+        history = self.metrics_history
         date_str = datetime.now().strftime("%Y%m%d")
-        with open(f"reports/metrics/metrics_{date_str}.json", 'w') as f:
-            json.dump(metrics, f, indent=2)
+        self._write_report("metrics", f"metrics/metrics_{date_str}.json", metrics)
+        history.record(metrics)
         
         logger.info("Project metrics updated")
     
     def calculate_average_completion_time(self) -> float:
-        """Calculate average task completion time in hours"""
-        completed_tasks = [
-            task for task in self.tasks.values()
-            if task.status == TaskStatus.COMPLETED
-        ]
-        
-        if not completed_tasks:
-            return 0
-        
-        total_hours = sum(task.estimated_hours for task in completed_tasks)
-        return round(total_hours / len(completed_tasks), 1)
+        """Average cycle time (in progress to completed) in hours"""
+        return self.flow.average_cycle_time_hours()
+    
+    @traced()
+    def get_trends(self, days: int = 90, window: int = 7) -> "Trends":
+        """Daily burndown, rolling throughput and blocked ratio for the last ``days`` days"""
+        from src.metrics_history import compute_trends
+        since = datetime.now() - timedelta(days=days)
+        return compute_trends(self.metrics_history.load(), since=since, window=window)
+    
+    @traced()
+    def save_trends_chart(self, trends: "Trends", path: Optional[str] = None) -> Path:
+        """Render trend charts, with the ideal burndown for the current sprint"""
+        from src.metrics_history import render_trends
+        if path is None:
+            chart_dir = self.config.get("metrics_history", {}).get("chart_dir", "reports/charts")
+            path = f"{chart_dir}/trends_{datetime.now():%Y%m%d}.png"
+        flow = self.flow
+        flow.refresh()
+        sprint_start = None
+        if flow.anchor is not None:
+            sprint_start = datetime.fromtimestamp(flow.anchor + flow.current_sprint() * flow.sprint_seconds)
+        return render_trends(trends, path, sprint_start, self.config["sprint_duration_days"])
     
     def calculate_sprint_velocity(self) -> float:
         """Calculate sprint velocity (story points per sprint)"""
-        # This would need historical sprint data
-        # For now, return estimated velocity
-        return 40.0
+        return self.flow.velocity()
+    
+    @traced()
+    async def run_pipeline(self, developer_context: str = "") -> Dict[str, Any]:
+        """Run the daily automation, sprint plan, parity check and suggestions concurrently.
+        
+        The phases are independent, so wall time is bounded by the slowest model
+        call rather than their sum. A failing phase is logged without affecting
+        the others and is reported as None; the whole run is cancelled after
+        ``llm.pipeline_timeout_seconds``.
+        """
+        phases = {
+            "daily_automation": self.run_daily_automation(),
+            "sprint_plan": self.generate_sprint_plan(),
+            "feature_parity": self.check_feature_parity(),
+            "suggestions": self.suggest_next_tasks(developer_context),
+        }
+        
+        outcomes = await asyncio.wait_for(
+            asyncio.gather(*phases.values(), return_exceptions=True),
+            timeout=self.pipeline_timeout
+        )
+        
+        results = {}
+        for name, outcome in zip(phases, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Pipeline phase {name} failed: {outcome!r}")
+                results[name] = None
+            else:
+                results[name] = outcome
+        return results
 
 
 async def main():
@@ -619,20 +1344,19 @@ async def main():
     # Initialize agent
     agent = ProjectManagerAgent(api_key)
     
-    # Run daily automation
-    await agent.run_daily_automation()
-    
-    # Generate sprint plan
-    sprint_plan = await agent.generate_sprint_plan()
-    logger.info(f"Sprint plan generated: {sprint_plan['sprint_number']}")
-    
-    # Check feature parity
-    parity_report = await agent.check_feature_parity()
-    logger.info("Feature parity check completed")
-    
-    # Suggest next tasks
-    suggestions = await agent.suggest_next_tasks("Focus on improving Android app features")
-    logger.info(f"Generated {len(suggestions)} task suggestions")
+    try:
+        # Daily automation, sprint plan, parity check and suggestions run concurrently
+        results = await agent.run_pipeline("Focus on improving Android app features")
+        
+        if results["sprint_plan"]:
+            logger.info(f"Sprint plan generated: {results['sprint_plan']['sprint_number']}")
+        if results["feature_parity"]:
+            logger.info("Feature parity check completed")
+        if results["suggestions"] is not None:
+            logger.info(f"Generated {len(results['suggestions'])} task suggestions")
+    finally:
+        logger.info(f"Response cache: {agent.response_cache.stats()}")
+        agent.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,273 @@
+"""
+MindQuest Project Manager Agent - Prompt Budget
+Token estimation, budgeted task packing for prompts and per-call token accounting
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import time
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.models import Task, TaskStatus
+from src.sprint_planner import PRIORITY_RANK
+
+logger = logging.getLogger(__name__)
+
+# Work in flight is the most useful context, finished work the least
+STATUS_RANK = {
+    TaskStatus.IN_PROGRESS: 0,
+    TaskStatus.BLOCKED: 1,
+    TaskStatus.REVIEW: 2,
+    TaskStatus.TODO: 3,
+    TaskStatus.COMPLETED: 4,
+}
+
+MAX_TITLE_CHARS = 100
+MAX_DESCRIPTION_CHARS = 160
+# Share of a task budget held back for the summary of tasks that did not fit
+OVERFLOW_SHARE = 0.15
+# Word-set Jaccard similarity above which two tasks are treated as duplicates
+DUPLICATE_SIMILARITY = 0.8
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and as at be by for from in into is it of on or the to with add fix update "
+    "implement support make use new".split()
+)
+
+
+class TokenEstimator:
+    """Characters-per-token estimate, calibrated against the usage the API reports.
+
+    Starts slightly pessimistic so early prompts stay under budget; each
+    ``calibrate`` call moves the ratio towards what the model actually
+    counted for a prompt.
+    """
+
+    def __init__(self, chars_per_token: float = 3.5):
+        self.chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        return math.ceil(len(text) / self.chars_per_token)
+
+    def calibrate(self, text: str, actual_tokens: int):
+        if actual_tokens <= 0 or not text:
+            return
+        observed = len(text) / actual_tokens
+        self.chars_per_token = min(6.0, max(2.0, 0.8 * self.chars_per_token + 0.2 * observed))
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def _fingerprint(task: Task) -> frozenset:
+    words = _WORD.findall(f"{task.title} {task.description}".lower())
+    return frozenset(word for word in words if word not in _STOPWORDS)
+
+
+def render_task(task: Task) -> str:
+    """One compact prompt line for a task"""
+    line = f"- [{task.priority.value}/{task.platform}/{task.status.value}] {_clip(task.title, MAX_TITLE_CHARS)}"
+    if task.description:
+        line += f": {_clip(task.description, MAX_DESCRIPTION_CHARS)}"
+    return line + f" ({task.estimated_hours:g}h)"
+
+
+def relevance_order(tasks: Iterable[Task]) -> List[Task]:
+    """Most relevant first: priority, then status, then how many tasks wait on it, then recency"""
+    tasks = list(tasks)
+    dependents = Counter(dep for task in tasks for dep in task.dependencies)
+    return sorted(tasks, key=lambda task: (
+        PRIORITY_RANK[task.priority],
+        STATUS_RANK[task.status],
+        -dependents[task.id],
+        -task.updated_us
+    ))
+
+
+def summarize_overflow(tasks: List[Task], budget_tokens: int, estimator: TokenEstimator) -> str:
+    """Summary of tasks left out, at the most detailed level that fits the budget.
+
+    Level 2 groups by platform and priority with the most common tags, level
+    1 by platform only, level 0 is a single total line.
+    """
+    if not tasks:
+        return ""
+    by_platform: Dict[str, List[Task]] = defaultdict(list)
+    for task in tasks:
+        by_platform[task.platform].append(task)
+
+    def group_line(label: str, group: List[Task], indent: str = "", terms: bool = False) -> str:
+        count = f"{len(group)} task" if len(group) == 1 else f"{len(group)} tasks"
+        line = f"{indent}- {label}: {count}, {sum(t.estimated_hours for t in group):g}h"
+        if terms:
+            tags = Counter(tag for task in group for tag in task.tags)
+            if not tags:
+                tags = Counter(w for task in group for w in _fingerprint(task) if not w.isdigit())
+            if tags:
+                line += f" (mostly: {', '.join(tag for tag, _ in tags.most_common(4))})"
+        return line
+
+    levels = []
+    detailed = []
+    for platform, group in sorted(by_platform.items(), key=lambda item: -len(item[1])):
+        detailed.append(group_line(platform, group))
+        by_priority: Dict[str, List[Task]] = defaultdict(list)
+        for task in group:
+            by_priority[task.priority.value].append(task)
+        for priority, subgroup in sorted(by_priority.items(), key=lambda item: PRIORITY_RANK[item[1][0].priority]):
+            detailed.append(group_line(priority, subgroup, indent="  ", terms=True))
+    levels.append(detailed)
+    levels.append([
+        group_line(platform, group)
+        for platform, group in sorted(by_platform.items(), key=lambda item: -len(item[1]))
+    ])
+
+    heading = f"Not listed ({len(tasks)} more tasks):"
+    for lines in levels:
+        text = "\n".join([heading, *lines])
+        if estimator.count(text) <= budget_tokens:
+            return text
+    return f"...and {len(tasks)} more tasks ({sum(t.estimated_hours for t in tasks):g}h)"
+
+
+@dataclass
+class PackedTasks:
+    """Prompt text for a task list and what was included, merged or summarised"""
+    text: str
+    tokens: int
+    included: int = 0
+    duplicates: int = 0
+    overflow: int = 0
+
+
+def pack_tasks(
+    tasks: Iterable[Task],
+    budget_tokens: int,
+    estimator: TokenEstimator,
+    ordered: bool = False
+) -> PackedTasks:
+    """Fit as many of the most relevant tasks as the budget allows.
+
+    Near-identical tasks (same or heavily overlapping title/description
+    words) are listed once with a count. Whatever does not fit is described
+    by ``summarize_overflow`` in the share of the budget held back for it.
+    Pass ``ordered=True`` if ``tasks`` are already in relevance order.
+    """
+    ranked = list(tasks) if ordered else relevance_order(tasks)
+    line_budget = budget_tokens - int(budget_tokens * OVERFLOW_SHARE)
+
+    # Listed entries: [line, tokens, duplicate count]
+    kept: List[List[Any]] = []
+    by_fingerprint: Dict[frozenset, int] = {}
+    buckets: Dict[str, List[Tuple[frozenset, int]]] = defaultdict(list)
+    overflow: List[Task] = []
+    used = 0
+    duplicates = 0
+
+    for position, task in enumerate(ranked):
+        fingerprint = _fingerprint(task)
+        match = by_fingerprint.get(fingerprint)
+        title_words = [w for w in _WORD.findall(task.title.lower()) if w not in _STOPWORDS]
+        bucket = title_words[0] if title_words else ""
+        if match is None and fingerprint:
+            for other, index in buckets[bucket]:
+                if len(fingerprint & other) / len(fingerprint | other) >= DUPLICATE_SIMILARITY:
+                    match = index
+                    break
+        if match is not None:
+            kept[match][2] += 1
+            duplicates += 1
+            continue
+
+        line = render_task(task)
+        tokens = estimator.count(line)
+        if used + tokens > line_budget:
+            overflow = ranked[position:]
+            break
+        by_fingerprint[fingerprint] = len(kept)
+        buckets[bucket].append((fingerprint, len(kept)))
+        kept.append([line, tokens, 0])
+        used += tokens
+
+    # Exact duplicates of listed tasks are counted there rather than summarised
+    remaining = []
+    for task in overflow:
+        match = by_fingerprint.get(_fingerprint(task))
+        if match is None:
+            remaining.append(task)
+        else:
+            kept[match][2] += 1
+            duplicates += 1
+
+    lines = [line if count == 0 else f"{line} (+{count} similar)" for line, _, count in kept]
+    if remaining:
+        used = estimator.count("\n".join(lines))
+        lines.append(summarize_overflow(remaining, budget_tokens - used, estimator))
+
+    text = "\n".join(lines)
+    return PackedTasks(
+        text=text,
+        tokens=estimator.count(text),
+        included=len(kept),
+        duplicates=duplicates,
+        overflow=len(remaining)
+    )
+
+
+@dataclass
+class CallUsage:
+    """Tokens and latency of one model call"""
+    purpose: str
+    model: str
+    input_tokens: int
+    output_tokens: int
+    estimated_input_tokens: int
+    seconds: float
+    at: float = field(default_factory=time.time)
+
+
+class TokenUsage:
+    """Per-call token ledger.
+
+    Every call is kept for the current run and, with ``log_path``, appended
+    as one JSON line so usage can be tracked across runs.
+    """
+
+    def __init__(self, log_path: Optional[str] = None):
+        self.log_path = Path(log_path) if log_path else None
+        self.calls: List[CallUsage] = []
+
+    def record(self, usage: CallUsage):
+        self.calls.append(usage)
+        logger.debug(
+            f"{usage.purpose}: {usage.input_tokens} tokens in "
+            f"(estimated {usage.estimated_input_tokens}), {usage.output_tokens} out, {usage.seconds:.2f}s"
+        )
+        if self.log_path is None:
+            return
+        try:
+            os.makedirs(self.log_path.parent, exist_ok=True)
+            with open(self.log_path, 'a') as f:
+                f.write(json.dumps(asdict(usage), separators=(",", ":")) + "\n")
+        except OSError as e:
+            logger.warning(f"Could not write token usage log: {e}")
+
+    def totals(self) -> Dict[str, Dict[str, Any]]:
+        """Calls and tokens per purpose for this run"""
+        totals: Dict[str, Dict[str, Any]] = {}
+        for usage in self.calls:
+            entry = totals.setdefault(usage.purpose, {"calls": 0, "input_tokens": 0, "output_tokens": 0, "seconds": 0.0})
+            entry["calls"] += 1
+            entry["input_tokens"] += usage.input_tokens
+            entry["output_tokens"] += usage.output_tokens
+            entry["seconds"] += usage.seconds
+        return totals
@@ -0,0 +1,419 @@
+"""
+MindQuest Project Manager Agent - Report Index
+SQLite index of generated reports with retention, archiving and fast lookups
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+import zipfile
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = "archive"
+
+# Filename prefix -> report type, for indexing files written before the index existed
+FILENAME_TYPES = (
+    ("sprint_", "sprint"),
+    ("analysis_", "analysis"),
+    ("parity_", "parity"),
+    ("standup_", "standup"),
+    ("metrics_", "metrics"),
+)
+
+# Payload fields copied into the index so listings need not open the report
+SUMMARY_FIELDS = {
+    "sprint": ("start_date", "end_date", "estimated_hours", "capacity_hours", "utilization"),
+    "analysis": ("platform", "changes"),
+    "metrics": (
+        "total_tasks", "completed_tasks", "in_progress_tasks", "blocked_tasks",
+        "average_completion_time", "average_lead_time", "sprint_velocity"
+    ),
+}
+
+SECONDS_PER_DAY = 24 * 3600
+
+
+def summarize_report(report_type: str, payload: Any) -> Dict[str, Any]:
+    """Key fields of a report payload"""
+    if not isinstance(payload, dict):
+        return {}
+    summary = {name: payload[name] for name in SUMMARY_FIELDS.get(report_type, ()) if name in payload}
+    if report_type == "sprint":
+        summary["tasks"] = len(payload.get("tasks", []))
+    if "error" in payload:
+        summary["error"] = payload["error"]
+    return summary
+
+
+def classify_report(name: str) -> Tuple[Optional[str], Optional[int]]:
+    """Report type and sprint number from a report filename"""
+    stem = Path(name).stem
+    for prefix, report_type in FILENAME_TYPES:
+        if stem.startswith(prefix):
+            number = None
+            if report_type == "sprint":
+                try:
+                    number = int(stem[len(prefix):])
+                except ValueError:
+                    return None, None
+            return report_type, number
+    return None, None
+
+
+@dataclass
+class ReportEntry:
+    """One indexed report; ``archive`` is set once it has been rolled into a zip"""
+    path: str
+    type: str
+    created_at: float
+    size: int
+    number: Optional[int] = None
+    summary: Dict[str, Any] = field(default_factory=dict)
+    archive: Optional[str] = None
+
+    @property
+    def created(self) -> datetime:
+        return datetime.fromtimestamp(self.created_at)
+
+
+class ReportIndex:
+    """Index of everything written under ``reports/``.
+
+    Each report is written through ``write``, which stores the file and
+    records its type, time, size and summary fields in a SQLite table
+    indexed on (type, created_at) and (type, number). "Latest sprint
+    number" or "last 30 metrics snapshots" are then index lookups instead
+    of directory scans. An index created next to existing reports is
+    backfilled from the directory once.
+
+    ``apply_retention`` rolls reports older than ``archive_after_days[type]``
+    into monthly zip archives under ``reports/archive/`` and drops them
+    entirely after ``delete_after_days[type]``. Types without a setting are
+    kept as they are. Archived reports stay indexed and readable.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS reports (
+        path TEXT PRIMARY KEY,
+        type TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        size INTEGER NOT NULL,
+        number INTEGER,
+        summary TEXT NOT NULL DEFAULT '{}',
+        archive TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_reports_type_created ON reports(type, created_at);
+    CREATE INDEX IF NOT EXISTS idx_reports_type_number ON reports(type, number);
+    """
+
+    COLUMNS = ("path", "type", "created_at", "size", "number", "summary", "archive")
+
+    def __init__(
+        self,
+        root: str = "reports",
+        index_path: str = "data/report_index.db",
+        archive_after_days: Optional[Dict[str, Optional[float]]] = None,
+        delete_after_days: Optional[Dict[str, Optional[float]]] = None
+    ):
+        self.root = Path(root)
+        self.index_path = Path(index_path)
+        self.archive_after_days = archive_after_days or {}
+        self.delete_after_days = delete_after_days or {}
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @classmethod
+    def from_config(cls, reports_config: Optional[Dict[str, Any]] = None) -> "ReportIndex":
+        """Create an index from the ``reports`` config section"""
+        reports_config = reports_config or {}
+        return cls(
+            root=reports_config.get("dir", "reports"),
+            index_path=reports_config.get("index_path", "data/report_index.db"),
+            archive_after_days=reports_config.get("archive_after_days"),
+            delete_after_days=reports_config.get("delete_after_days")
+        )
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.index_path.parent, exist_ok=True)
+            is_new = not self.index_path.exists()
+            self._conn = sqlite3.connect(str(self.index_path))
+            self._conn.executescript(self.SCHEMA)
+            if is_new and self.root.exists():
+                self.reindex()
+        return self._conn
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def write(
+        self,
+        report_type: str,
+        name: str,
+        content: Union[str, Dict[str, Any]],
+        number: Optional[int] = None
+    ) -> Path:
+        """Write a report to ``reports/<name>`` and index it.
+
+        Dict content is saved as indented JSON and its summary fields are
+        indexed; strings (e.g. Markdown standups) are saved as they are.
+        """
+        if isinstance(content, str):
+            text, summary = content, {}
+        else:
+            text, summary = json.dumps(content, indent=2), summarize_report(report_type, content)
+
+        path = self.root / name
+        os.makedirs(path.parent, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+        self._record(ReportEntry(
+            path=Path(name).as_posix(),
+            type=report_type,
+            created_at=time.time(),
+            size=len(text.encode("utf-8")),
+            number=number,
+            summary=summary
+        ))
+        return path
+
+    def _record(self, *entries: ReportEntry):
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO reports ({', '.join(self.COLUMNS)}) VALUES ({placeholders})",
+                [
+                    (e.path, e.type, e.created_at, e.size, e.number,
+                     json.dumps(e.summary, separators=(",", ":")), e.archive)
+                    for e in entries
+                ]
+            )
+
+    def reindex(self) -> int:
+        """Rebuild the index from the files and archives under ``reports/``"""
+        entries: Dict[str, ReportEntry] = {}
+        archive_root = self.root / ARCHIVE_DIR
+
+        if archive_root.exists():
+            for archive in sorted(archive_root.glob("*.zip")):
+                archive_name = archive.relative_to(self.root).as_posix()
+                with zipfile.ZipFile(archive) as zf:
+                    for info in zf.infolist():
+                        report_type, number = classify_report(info.filename)
+                        if report_type is None:
+                            continue
+                        entries[info.filename] = ReportEntry(
+                            path=info.filename,
+                            type=report_type,
+                            created_at=datetime(*info.date_time).timestamp(),
+                            size=info.file_size,
+                            number=number,
+                            archive=archive_name
+                        )
+
+        for path in self.root.rglob("*"):
+            if not path.is_file() or archive_root in path.parents:
+                continue
+            report_type, number = classify_report(path.name)
+            if report_type is None or path.suffix not in (".json", ".md"):
+                continue
+            summary = {}
+            if path.suffix == ".json":
+                try:
+                    with open(path, 'r') as f:
+                        summary = summarize_report(report_type, json.load(f))
+                except (OSError, json.JSONDecodeError) as e:
+                    logger.warning(f"Indexing unreadable report {path}: {e}")
+            stat = path.stat()
+            name = path.relative_to(self.root).as_posix()
+            # A loose file wins over an archived copy left by an interrupted archive run
+            entries[name] = ReportEntry(
+                path=name,
+                type=report_type,
+                created_at=stat.st_mtime,
+                size=stat.st_size,
+                number=number,
+                summary=summary
+            )
+
+        with self.conn:
+            self.conn.execute("DELETE FROM reports")
+        self._record(*entries.values())
+        logger.info(f"Indexed {len(entries)} reports under {self.root}")
+        return len(entries)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def _entry(self, row: tuple) -> ReportEntry:
+        path, report_type, created_at, size, number, summary, archive = row
+        return ReportEntry(path, report_type, created_at, size, number, json.loads(summary), archive)
+
+    def latest_number(self, report_type: str = "sprint") -> Optional[int]:
+        """Highest report number of a type (the last sprint), or None"""
+        return self.conn.execute(
+            "SELECT MAX(number) FROM reports WHERE type = ?", (report_type,)
+        ).fetchone()[0]
+
+    def latest(
+        self,
+        report_type: Optional[str] = None,
+        limit: Optional[int] = 30,
+        since: Optional[datetime] = None
+    ) -> List[ReportEntry]:
+        """Most recent reports first, optionally of one type and newer than ``since``"""
+        clauses, params = [], []
+        if report_type is not None:
+            clauses.append("type = ?")
+            params.append(report_type)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since.timestamp())
+        sql = f"SELECT {', '.join(self.COLUMNS)} FROM reports"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [self._entry(row) for row in self.conn.execute(sql, params)]
+
+    def get(self, path: str) -> Optional[ReportEntry]:
+        row = self.conn.execute(
+            f"SELECT {', '.join(self.COLUMNS)} FROM reports WHERE path = ?", (path,)
+        ).fetchone()
+        return self._entry(row) if row else None
+
+    def read(self, entry: ReportEntry) -> str:
+        """Report contents, from its file or from the archive it was rolled into"""
+        if entry.archive is None:
+            with open(self.root / entry.path, 'r') as f:
+                return f.read()
+        with zipfile.ZipFile(self.root / entry.archive) as zf:
+            return zf.read(entry.path).decode("utf-8")
+
+    def load(self, entry: ReportEntry) -> Any:
+        """Parsed contents of a JSON report"""
+        return json.loads(self.read(entry))
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-type report counts and sizes, split into loose and archived"""
+        rows = self.conn.execute(
+            "SELECT type, COUNT(*), SUM(size), SUM(archive IS NOT NULL), "
+            "MIN(created_at), MAX(created_at) FROM reports GROUP BY type ORDER BY type"
+        ).fetchall()
+        return [
+            {
+                "type": report_type,
+                "reports": count,
+                "bytes": size,
+                "archived": archived,
+                "oldest": datetime.fromtimestamp(oldest),
+                "newest": datetime.fromtimestamp(newest),
+            }
+            for report_type, count, size, archived, oldest, newest in rows
+        ]
+
+    # ------------------------------------------------------------------
+    # Retention
+    # ------------------------------------------------------------------
+
+    def _expired(self, days: Dict[str, Optional[float]], now: float, archived: Optional[bool]) -> Iterator[ReportEntry]:
+        for report_type, limit in days.items():
+            if limit is None:
+                continue
+            sql = f"SELECT {', '.join(self.COLUMNS)} FROM reports WHERE type = ? AND created_at < ?"
+            if archived is not None:
+                sql += " AND archive IS NOT NULL" if archived else " AND archive IS NULL"
+            rows = self.conn.execute(sql, (report_type, now - limit * SECONDS_PER_DAY)).fetchall()
+            for row in rows:
+                yield self._entry(row)
+
+    def apply_retention(self, now: Optional[datetime] = None, dry_run: bool = False) -> Dict[str, int]:
+        """Archive and delete reports past their type's retention; returns counts"""
+        now_ts = (now or datetime.now()).timestamp()
+        result = {"archived": 0, "deleted": 0, "archived_bytes": 0}
+
+        # Drop expired reports first so they are not archived just to be deleted
+        expired = list(self._expired(self.delete_after_days, now_ts, archived=None))
+        result["deleted"] = len(expired)
+        if expired and not dry_run:
+            self._delete(expired)
+
+        deleted = {entry.path for entry in expired}
+        to_archive = [
+            entry for entry in self._expired(self.archive_after_days, now_ts, archived=False)
+            if entry.path not in deleted
+        ]
+        result["archived"] = len(to_archive)
+        result["archived_bytes"] = sum(entry.size for entry in to_archive)
+        if to_archive and not dry_run:
+            self._archive(to_archive)
+
+        if not dry_run and (result["archived"] or result["deleted"]):
+            logger.info(f"Report retention: archived {result['archived']}, deleted {result['deleted']}")
+        return result
+
+    def _archive(self, entries: List[ReportEntry]):
+        groups: Dict[str, List[ReportEntry]] = defaultdict(list)
+        for entry in entries:
+            groups[f"{ARCHIVE_DIR}/{entry.type}_{entry.created:%Y-%m}.zip"].append(entry)
+
+        os.makedirs(self.root / ARCHIVE_DIR, exist_ok=True)
+        for archive_name, group in groups.items():
+            with zipfile.ZipFile(self.root / archive_name, 'a', compression=zipfile.ZIP_DEFLATED) as zf:
+                existing = set(zf.namelist())
+                for entry in group:
+                    if entry.path not in existing:
+                        zf.write(self.root / entry.path, arcname=entry.path)
+            for entry in group:
+                entry.archive = archive_name
+            # Index first: a crash before the unlink leaves a loose copy, never a lost report
+            self._record(*group)
+            for entry in group:
+                (self.root / entry.path).unlink(missing_ok=True)
+
+    def _delete(self, entries: List[ReportEntry]):
+        by_archive: Dict[str, set] = defaultdict(set)
+        for entry in entries:
+            if entry.archive is None:
+                (self.root / entry.path).unlink(missing_ok=True)
+            else:
+                by_archive[entry.archive].add(entry.path)
+
+        for archive_name, names in by_archive.items():
+            archive = self.root / archive_name
+            if not archive.exists():
+                continue
+            with zipfile.ZipFile(archive) as zf:
+                keep = [info for info in zf.infolist() if info.filename not in names]
+                if keep:
+                    tmp_path = archive.with_name(archive.name + ".tmp")
+                    with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as out:
+                        for info in keep:
+                            out.writestr(info, zf.read(info))
+            if keep:
+                os.replace(tmp_path, archive)
+            else:
+                archive.unlink()
+
+        with self.conn:
+            self.conn.executemany("DELETE FROM reports WHERE path = ?", [(entry.path,) for entry in entries])
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
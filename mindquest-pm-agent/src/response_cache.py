@@ -0,0 +1,166 @@
+"""
+MindQuest Project Manager Agent - Response Cache
+Persistent, content-addressed cache for model responses with TTL and LRU eviction
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """On-disk cache of model responses keyed by a hash of the request.
+
+    Entries older than ``ttl_seconds`` are treated as misses. When the stored
+    responses exceed ``max_bytes`` the least recently used entries are evicted.
+    Hit/miss counts and the model latency saved by hits are tracked per
+    process so each run can report them.
+
+    ``bypass`` skips lookups for a run while still refreshing entries with
+    the fresh responses; ``enabled=False`` turns the cache off entirely.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS responses (
+        key TEXT PRIMARY KEY,
+        response TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        latency REAL NOT NULL,
+        created_at REAL NOT NULL,
+        last_access REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access);
+    """
+
+    def __init__(
+        self,
+        path: str = "data/response_cache.db",
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_bytes: int = 50 * 1024 * 1024,
+        enabled: bool = True
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.bypass = False
+
+        self.hits = 0
+        self.misses = 0
+        self.saved_latency = 0.0
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._total_bytes = 0
+
+    @classmethod
+    def from_config(cls, cache_config: Optional[Dict[str, Any]] = None) -> "ResponseCache":
+        """Create a cache from the ``cache`` config section"""
+        cache_config = cache_config or {}
+        return cls(
+            path=cache_config.get("path", "data/response_cache.db"),
+            ttl_seconds=cache_config.get("ttl_hours", 168) * 3600,
+            max_bytes=int(cache_config.get("max_size_mb", 50) * 1024 * 1024),
+            enabled=cache_config.get("enabled", True)
+        )
+
+    @staticmethod
+    def make_key(model: str, max_tokens: int, temperature: float, prompt: str) -> str:
+        """Content address of a request"""
+        payload = json.dumps([model, max_tokens, temperature, prompt], separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.path.parent, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path))
+            self._conn.executescript(self.SCHEMA)
+            self._total_bytes = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a fresh cached response, or None"""
+        if not self.enabled or self.bypass:
+            return None
+
+        now = time.time()
+        row = self.conn.execute(
+            "SELECT response, latency, created_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or now - row[2] > self.ttl_seconds:
+            self.misses += 1
+            return None
+
+        with self.conn:
+            self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        self.saved_latency += row[1]
+        return row[0]
+
+    def put(self, key: str, response: str, latency: float):
+        """Store a response and evict least recently used entries if over budget"""
+        if not self.enabled:
+            return
+
+        size = len(response.encode("utf-8"))
+        now = time.time()
+        with self.conn:
+            previous = self.conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, latency, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, response, size, latency, now, now)
+            )
+        self._total_bytes += size - (previous[0] if previous else 0)
+        self.evict()
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            self._total_bytes = self.conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+
+            cursor = self.conn.execute("SELECT key, size FROM responses ORDER BY last_access")
+            evicted = []
+            for key, size in cursor:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                evicted.append((key,))
+                self._total_bytes -= size
+            self.conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+        if evicted:
+            logger.info(f"Evicted {len(evicted)} cached responses")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counts and latency saved during this run"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "saved_latency_seconds": round(self.saved_latency, 2)
+        }
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,349 @@
+"""
+MindQuest Project Manager Agent - Scheduler
+Resident asyncio daemon that runs agent jobs on the configured analysis_schedule
+"""
+
+import asyncio
+import json
+import logging
+import os
+import signal
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from datetime import time as time_of_day
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+INTERVAL_DAYS = {"daily": 1, "weekly": 7, "biweekly": 14}
+
+# Longest single sleep, so wall-clock jumps (suspend, DST) are noticed promptly
+MAX_SLEEP_SECONDS = 60.0
+LATENCY_WINDOW = 100
+
+
+@dataclass
+class Schedule:
+    """Fires at ``at`` on every ``every_days``-th day, or weekly on ``weekday``"""
+    spec: str
+    at: time_of_day
+    weekday: Optional[int] = None
+    every_days: int = 1
+
+    def next_after(self, moment: datetime, last_run: Optional[datetime] = None) -> datetime:
+        """First firing time after ``moment``.
+
+        Multi-day intervals count from the day of ``last_run`` instead, so a
+        restart keeps the cadence; the result may then already be due.
+        """
+        if last_run is not None and self.every_days > 1:
+            return datetime.combine(last_run.date(), self.at) + timedelta(days=self.every_days)
+
+        candidate = datetime.combine(moment.date(), self.at)
+        if self.weekday is not None:
+            candidate += timedelta(days=(self.weekday - candidate.weekday()) % 7)
+            if candidate <= moment:
+                candidate += timedelta(days=7)
+            return candidate
+        if candidate <= moment:
+            candidate += timedelta(days=1)
+        return candidate
+
+
+def parse_schedule(spec: str, default_at: time_of_day, sprint_days: int = 14) -> Schedule:
+    """Parse an analysis_schedule entry.
+
+    Accepts ``"HH:MM"`` (daily), a weekday name optionally followed by a time
+    (``"friday"``, ``"friday 16:00"``), or an interval: ``daily``, ``weekly``,
+    ``biweekly`` or ``sprint`` (every ``sprint_duration_days``).
+    """
+    words = spec.strip().lower().split()
+    if not words:
+        raise ValueError("Empty schedule")
+
+    at = default_at
+    if ":" in words[-1]:
+        at = time_of_day.fromisoformat(words[-1].zfill(5))
+        words = words[:-1]
+    if not words:
+        return Schedule(spec, at)
+
+    word = words[0]
+    if word in WEEKDAYS:
+        return Schedule(spec, at, weekday=WEEKDAYS.index(word))
+    if word in INTERVAL_DAYS:
+        return Schedule(spec, at, every_days=INTERVAL_DAYS[word])
+    if word == "sprint":
+        return Schedule(spec, at, every_days=sprint_days)
+    raise ValueError(f"Unrecognised schedule: {spec!r}")
+
+
+@dataclass
+class JobStats:
+    """Run counters and recent latencies for one job"""
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0
+    last_started: Optional[str] = None
+    last_status: Optional[str] = None
+    last_seconds: Optional[float] = None
+    durations: Deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+
+    def record(self, started: datetime, seconds: float, error: Optional[BaseException]):
+        self.runs += 1
+        self.last_started = started.isoformat(timespec="seconds")
+        self.last_seconds = round(seconds, 3)
+        self.durations.append(seconds)
+        if error is None:
+            self.last_status = "ok"
+        else:
+            self.failures += 1
+            self.last_status = f"error: {error!r}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.durations)
+
+        def percentile(q: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "last_started": self.last_started,
+            "last_status": self.last_status,
+            "last_seconds": self.last_seconds,
+            "mean_seconds": round(sum(ordered) / len(ordered), 3) if ordered else None,
+            "p50_seconds": percentile(0.5),
+            "p95_seconds": percentile(0.95),
+            "max_seconds": round(ordered[-1], 3) if ordered else None,
+            "recent_seconds": [round(d, 3) for d in self.durations],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "JobStats":
+        return cls(
+            runs=data.get("runs", 0),
+            failures=data.get("failures", 0),
+            skipped=data.get("skipped", 0),
+            last_started=data.get("last_started"),
+            last_status=data.get("last_status"),
+            last_seconds=data.get("last_seconds"),
+            durations=deque(data.get("recent_seconds", []), maxlen=LATENCY_WINDOW)
+        )
+
+
+@dataclass
+class ScheduledJob:
+    """A named coroutine run on a schedule"""
+    name: str
+    schedule: Schedule
+    run: Callable[[], Awaitable[Any]]
+    next_run: Optional[datetime] = None
+    last_run: Optional[datetime] = None
+    running: Optional[asyncio.Task] = None
+    stats: JobStats = field(default_factory=JobStats)
+
+
+def build_jobs(agent) -> List[ScheduledJob]:
+    """Map the analysis_schedule entries onto agent coroutines"""
+    schedule_config = agent.config.get("analysis_schedule", {})
+    sprint_days = agent.config.get("sprint_duration_days", 14)
+    default_at = time_of_day.fromisoformat(schedule_config.get("daily_standup", "09:00").zfill(5))
+    actions = {
+        "daily_standup": agent.run_daily_automation,
+        "weekly_review": agent.run_weekly_review,
+        "sprint_planning": agent.generate_sprint_plan,
+    }
+
+    jobs = []
+    for name, spec in schedule_config.items():
+        if name not in actions:
+            logger.warning(f"No scheduler job for analysis_schedule.{name}; ignoring it")
+            continue
+        if not spec:
+            continue
+        jobs.append(ScheduledJob(name, parse_schedule(spec, default_at, sprint_days), actions[name]))
+    return jobs
+
+
+class AgentScheduler:
+    """Runs scheduled jobs against one long-lived agent.
+
+    The agent, its task store and its model client stay warm between runs.
+    A job whose previous run is still going when it comes due is skipped for
+    that slot rather than started twice. Last-run times and latency stats
+    are persisted to ``state_path`` after every run, so a restart resumes
+    the cadence and runs each job at most once to catch up on missed slots.
+    ``after_job`` is called after each run as well (the agent's scheduler
+    uses it to export telemetry).
+    """
+
+    def __init__(
+        self,
+        jobs: List[ScheduledJob],
+        state_path: str = "data/scheduler_state.json",
+        shutdown_grace_seconds: float = 30.0,
+        clock: Callable[[], datetime] = datetime.now,
+        after_job: Optional[Callable[[], None]] = None
+    ):
+        self.jobs = {job.name: job for job in jobs}
+        self.state_path = Path(state_path)
+        self.shutdown_grace_seconds = shutdown_grace_seconds
+        self.clock = clock
+        self.after_job = after_job
+        self._stopping: Optional[asyncio.Event] = None
+        self._load_state()
+
+    @classmethod
+    def for_agent(cls, agent) -> "AgentScheduler":
+        scheduler_config = agent.config.get("scheduler", {})
+        return cls(
+            build_jobs(agent),
+            state_path=scheduler_config.get("state_path", "data/scheduler_state.json"),
+            shutdown_grace_seconds=scheduler_config.get("shutdown_grace_seconds", 30),
+            after_job=agent.telemetry.flush
+        )
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
+    def _load_state(self):
+        state = read_state(self.state_path)
+        now = self.clock()
+        for name, job in self.jobs.items():
+            saved = state.get(name, {})
+            if saved.get("last_run"):
+                job.last_run = datetime.fromisoformat(saved["last_run"])
+            job.stats = JobStats.from_dict(saved.get("stats", {}))
+            if job.last_run is not None:
+                # A slot missed while the daemon was down comes due immediately
+                job.next_run = job.schedule.next_after(job.last_run, job.last_run)
+            else:
+                job.next_run = job.schedule.next_after(now)
+
+    def save_state(self):
+        state = {
+            name: {
+                "schedule": job.schedule.spec,
+                "last_run": job.last_run.isoformat(timespec="seconds") if job.last_run else None,
+                "next_run": job.next_run.isoformat(timespec="seconds") if job.next_run else None,
+                "running": job.running is not None,
+                "stats": job.stats.to_dict(),
+            }
+            for name, job in self.jobs.items()
+        }
+        os.makedirs(self.state_path.parent, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".json.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    # ------------------------------------------------------------------
+    # Running
+    # ------------------------------------------------------------------
+
+    def stop(self):
+        """Ask ``run`` to return after in-flight jobs finish"""
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def run(self, run_now: Optional[List[str]] = None):
+        """Fire jobs as they come due until ``stop`` is called or SIGINT/SIGTERM arrives"""
+        self._stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        for name in run_now or ():
+            if name not in self.jobs:
+                raise ValueError(f"Unknown job {name!r}; expected one of {', '.join(self.jobs)}")
+            self.jobs[name].next_run = self.clock()
+
+        for job in self.jobs.values():
+            logger.info(f"Scheduled {job.name} ({job.schedule.spec}); next run {job.next_run:%Y-%m-%d %H:%M}")
+        self.save_state()
+
+        try:
+            while not self._stopping.is_set():
+                now = self.clock()
+                for job in self.jobs.values():
+                    if job.next_run is not None and job.next_run <= now:
+                        self._fire(job, now)
+
+                upcoming = min((job.next_run for job in self.jobs.values() if job.next_run), default=None)
+                delay = MAX_SLEEP_SECONDS
+                if upcoming is not None:
+                    delay = min(delay, max(0.0, (upcoming - self.clock()).total_seconds()))
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self._drain()
+            self.save_state()
+
+    def _fire(self, job: ScheduledJob, now: datetime):
+        job.next_run = job.schedule.next_after(now, now)
+        if job.running is not None:
+            job.stats.skipped += 1
+            logger.warning(f"Skipping {job.name}: previous run still in progress")
+            return
+        job.running = asyncio.create_task(self._run_job(job), name=f"job:{job.name}")
+
+    async def _run_job(self, job: ScheduledJob):
+        started_at = self.clock()
+        started = time.perf_counter()
+        error = None
+        logger.info(f"Starting scheduled job {job.name}")
+        try:
+            await job.run()
+        except asyncio.CancelledError:
+            error = asyncio.CancelledError("cancelled at shutdown")
+            raise
+        except Exception as e:
+            error = e
+            logger.error(f"Scheduled job {job.name} failed: {e!r}")
+        finally:
+            elapsed = time.perf_counter() - started
+            job.stats.record(started_at, elapsed, error)
+            job.last_run = started_at
+            job.running = None
+            logger.info(f"Finished {job.name} in {elapsed:.2f}s; next run {job.next_run:%Y-%m-%d %H:%M}")
+            self.save_state()
+            if self.after_job is not None:
+                self.after_job()
+
+    async def _drain(self):
+        running = [job.running for job in self.jobs.values() if job.running is not None]
+        if not running:
+            return
+        logger.info(f"Waiting up to {self.shutdown_grace_seconds}s for {len(running)} running jobs")
+        done, pending = await asyncio.wait(running, timeout=self.shutdown_grace_seconds)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def read_state(state_path) -> Dict[str, Any]:
+    """Persisted per-job schedule state and stats, or {} if none"""
+    path = Path(state_path)
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable scheduler state: {e}")
+        return {}
@@ -0,0 +1,260 @@
+"""
+MindQuest Project Manager Agent - Sprint Planner
+Dependency-aware sprint selection: topological scheduling plus a capacity knapsack
+"""
+
+import heapq
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.models import Task, TaskPriority, TaskStatus
+
+# Lower rank = more urgent. Replaces sorting on priority.value, which is alphabetical.
+PRIORITY_RANK = {
+    TaskPriority.CRITICAL: 0,
+    TaskPriority.HIGH: 1,
+    TaskPriority.MEDIUM: 2,
+    TaskPriority.LOW: 3,
+}
+
+OPEN_STATUSES = (TaskStatus.TODO, TaskStatus.IN_PROGRESS)
+
+# Upper bound on knapsack table width; keeps planning sub-second for team-sized capacity
+MAX_CAPACITY_UNITS = 512
+
+
+@dataclass
+class SprintSelection:
+    """Tasks chosen for a sprint and why the rest were left out"""
+    tasks: List[Task] = field(default_factory=list)
+    hours: float = 0.0
+    deferred: List[str] = field(default_factory=list)
+    blocked: Dict[str, List[str]] = field(default_factory=dict)
+    cycles: List[List[str]] = field(default_factory=list)
+
+
+class DependencyGraph:
+    """DAG over open tasks; an edge runs from a prerequisite to its dependent"""
+
+    def __init__(self, tasks: Iterable[Task]):
+        self.tasks: Dict[str, Task] = {task.id: task for task in tasks}
+        self.parents: Dict[str, List[str]] = {}
+        self.children: Dict[str, List[str]] = {task_id: [] for task_id in self.tasks}
+        self.external: Dict[str, List[str]] = {}
+
+        for task_id, task in self.tasks.items():
+            parents = []
+            for dep in task.dependencies or ():
+                if dep in self.tasks:
+                    if dep not in parents:
+                        parents.append(dep)
+                        self.children[dep].append(task_id)
+                else:
+                    self.external.setdefault(task_id, []).append(dep)
+            self.parents[task_id] = parents
+
+    def topological_order(self) -> Tuple[List[str], Set[str]]:
+        """Kahn's algorithm, most urgent and oldest first among ready tasks.
+
+        Returns the order and the set of tasks that could not be ordered
+        because they lie on, or depend on, a cycle.
+        """
+        def key(task_id: str):
+            task = self.tasks[task_id]
+            return (PRIORITY_RANK[task.priority], task.created_us, task_id)
+
+        indegree = {task_id: len(parents) for task_id, parents in self.parents.items()}
+        ready = [key(task_id) for task_id, degree in indegree.items() if degree == 0]
+        heapq.heapify(ready)
+
+        order = []
+        while ready:
+            task_id = heapq.heappop(ready)[2]
+            order.append(task_id)
+            for child in self.children[task_id]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    heapq.heappush(ready, key(child))
+
+        unordered = set(self.tasks) - set(order)
+        return order, unordered
+
+    def find_cycles(self, nodes: Set[str]) -> List[List[str]]:
+        """Strongly connected components with more than one task (or a self-loop)"""
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        cycles: List[List[str]] = []
+        counter = 0
+
+        for root in sorted(nodes):
+            if root in index:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, child_index = work.pop()
+                if child_index == 0:
+                    index[node] = lowlink[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack.add(node)
+                children = [c for c in self.children[node] if c in nodes]
+                if child_index < len(children):
+                    work.append((node, child_index + 1))
+                    child = children[child_index]
+                    if child not in index:
+                        work.append((child, 0))
+                    elif child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                    continue
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in self.parents[node]:
+                        cycles.append(sorted(component))
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+        return cycles
+
+
+def plan_sprint(
+    open_tasks: Iterable[Task],
+    capacity_hours: float,
+    priorities: Iterable[TaskPriority] = (TaskPriority.CRITICAL, TaskPriority.HIGH),
+    resolve_status: Optional[Callable[[str], Optional[TaskStatus]]] = None,
+    resolution: Optional[float] = None
+) -> SprintSelection:
+    """Choose the sprint's tasks.
+
+    Every selected task has all of its prerequisites either completed or
+    selected earlier in the returned order. Prerequisites of wanted tasks are
+    pulled in whatever their own priority. Selection maximises scheduled
+    hours lexicographically by priority (critical hours first, then high, ...)
+    with a 0/1 knapsack over capacity quantised to ``resolution`` hours
+    (half an hour, coarsened for very large capacities to bound the table).
+    Task hours are rounded up to whole units for the knapsack, so the space
+    that rounding wastes is then topped up by real hours, most urgent first.
+    """
+    selection = SprintSelection()
+    graph = DependencyGraph(task for task in open_tasks if task.status in OPEN_STATUSES)
+    wanted_ranks = {PRIORITY_RANK[priority] for priority in priorities}
+    resolve_status = resolve_status or (lambda task_id: None)
+
+    order, unordered = graph.topological_order()
+    if unordered:
+        selection.cycles = graph.find_cycles(unordered)
+
+    # A task is schedulable when every prerequisite is done or schedulable itself
+    schedulable: Set[str] = set()
+    for task_id in order:
+        missing = [
+            dep for dep in graph.external.get(task_id, ())
+            if resolve_status(dep) != TaskStatus.COMPLETED
+        ]
+        missing += [dep for dep in graph.parents[task_id] if dep not in schedulable]
+        if missing:
+            selection.blocked[task_id] = missing
+        else:
+            schedulable.add(task_id)
+    for task_id in unordered:
+        selection.blocked[task_id] = list(graph.parents[task_id])
+
+    resolution = resolution or max(0.5, capacity_hours / MAX_CAPACITY_UNITS)
+    capacity = int(math.floor(capacity_hours / resolution + 1e-9))
+    units = {
+        task_id: max(1, int(math.ceil(graph.tasks[task_id].estimated_hours / resolution - 1e-9)))
+        for task_id in schedulable
+    }
+    # Lexicographic value: one hour of a higher tier outweighs any mix of lower ones
+    base = capacity + 1
+    weight = {rank: base ** (len(PRIORITY_RANK) - 1 - rank) for rank in PRIORITY_RANK.values()}
+
+    def task_value(task_id: str) -> int:
+        return weight[PRIORITY_RANK[graph.tasks[task_id].priority]] * units[task_id]
+
+    def closure(task_id: str, limit: float, costs: Dict[str, float] = units) -> Optional[List[str]]:
+        """The task plus its open prerequisites, or None once their ``costs`` exceed ``limit``"""
+        members = [task_id]
+        seen = {task_id}
+        cost = costs[task_id]
+        stack = [task_id]
+        while stack:
+            for parent in graph.parents[stack.pop()]:
+                if parent not in seen:
+                    seen.add(parent)
+                    cost += costs[parent]
+                    if cost > limit:
+                        return None
+                    members.append(parent)
+                    stack.append(parent)
+        return members if cost <= limit else None
+
+    targets = [
+        task_id for task_id in order
+        if task_id in schedulable and PRIORITY_RANK[graph.tasks[task_id].priority] in wanted_ranks
+    ]
+
+    # Each target becomes an item bundled with its prerequisites
+    by_cost: Dict[int, List[Tuple[int, int, List[str]]]] = {}
+    for position, task_id in enumerate(targets):
+        members = closure(task_id, capacity)
+        if members is None:
+            continue
+        cost = sum(units[m] for m in members)
+        value = sum(task_value(m) for m in members)
+        by_cost.setdefault(cost, []).append((-value, position, members))
+
+    # Only the best capacity // cost items of each cost can appear in an optimum
+    items: List[Tuple[int, int, List[str]]] = []
+    for cost, candidates in by_cost.items():
+        candidates.sort()
+        for negative_value, _, members in candidates[:capacity // cost]:
+            items.append((cost, -negative_value, members))
+
+    # 0/1 knapsack over quantised capacity
+    best = [0] * (capacity + 1)
+    taken = []
+    for cost, value, _ in items:
+        row = bytearray(capacity + 1)
+        for remaining in range(capacity, cost - 1, -1):
+            candidate = best[remaining - cost] + value
+            if candidate > best[remaining]:
+                best[remaining] = candidate
+                row[remaining] = 1
+        taken.append(row)
+
+    chosen: Set[str] = set()
+    remaining = capacity
+    for item_index in range(len(items) - 1, -1, -1):
+        if taken[item_index][remaining]:
+            cost, _, members = items[item_index]
+            chosen.update(members)
+            remaining -= cost
+
+    # Rounding up to units and bundles sharing prerequisites leave capacity over: top it up
+    hours = {task_id: graph.tasks[task_id].estimated_hours for task_id in schedulable}
+    used = sum(hours[task_id] for task_id in chosen)
+    for task_id in sorted(targets, key=lambda task_id: PRIORITY_RANK[graph.tasks[task_id].priority]):
+        if task_id in chosen:
+            continue
+        members = closure(task_id, capacity_hours + 1e-9, hours)
+        if members is None:
+            continue
+        extra = [m for m in members if m not in chosen]
+        extra_hours = sum(hours[m] for m in extra)
+        if used + extra_hours <= capacity_hours + 1e-9:
+            chosen.update(extra)
+            used += extra_hours
+
+    selection.tasks = [graph.tasks[task_id] for task_id in order if task_id in chosen]
+    selection.hours = sum(task.estimated_hours for task in selection.tasks)
+    selection.deferred = [task_id for task_id in targets if task_id not in chosen]
+    return selection
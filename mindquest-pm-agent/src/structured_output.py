@@ -0,0 +1,268 @@
+"""
+MindQuest Project Manager Agent - Structured Output
+Incremental, bracket-aware JSON array extraction from streamed model responses
+"""
+
+import json
+import logging
+from typing import Annotated, Any, Generic, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, TypeAdapter, ValidationError, field_validator
+
+from src.models import TaskPriority
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+
+def repair_json(text: str) -> str:
+    """Fix the slips models make in otherwise valid JSON.
+
+    Outside strings: trailing commas are dropped, Python literals become
+    JSON ones and single-quoted strings are re-quoted. Curly quotes are
+    straightened first.
+    """
+    text = text.translate(_SMART_QUOTES)
+    out: List[str] = []
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if ch in "\"'":
+            # Copy a string, re-quoting single-quoted ones
+            j = i + 1
+            body: List[str] = []
+            while j < len(text) and text[j] != ch:
+                if text[j] == "\\" and j + 1 < len(text):
+                    body.append(text[j:j + 2])
+                    j += 2
+                    continue
+                body.append('\\"' if text[j] == '"' else text[j])
+                j += 1
+            out.append('"' + "".join(body) + '"')
+            i = j + 1
+            continue
+        if ch in "}]":
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+            out.append(ch)
+        elif ch.isalpha():
+            j = i
+            while j < len(text) and (text[j].isalnum() or text[j] == "_"):
+                j += 1
+            word = text[i:j]
+            out.append(_LITERALS.get(word, word))
+            i = j
+            continue
+        else:
+            out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def parse_json(text: str) -> Any:
+    """``json.loads``, retried once on the repaired text"""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return json.loads(repair_json(text))
+
+
+class JsonArrayStream:
+    """Yields the elements of the first JSON array in a text stream as each one completes.
+
+    Text before the array (prose, a Markdown fence) is skipped. Brackets
+    and braces inside strings are ignored, so nested arrays and objects are
+    handled. Each element is parsed the moment its closing bracket, quote
+    or separator arrives. An element that fails to parse, even after
+    ``repair_json``, is recorded in ``errors`` and skipped; the rest of the
+    array is still used. If a bracketed span yields no valid elements (for
+    example ``[Note]`` in prose), scanning resumes after it. An element cut
+    off by the end of the stream is recorded as truncated, never returned:
+    its strings and numbers may be incomplete.
+    """
+
+    def __init__(self):
+        self.errors: List[Tuple[int, str]] = []
+        self.done = False
+        self._in_array = False
+        self._index = 0
+        self._parsed = 0
+        self._array_errors: List[Tuple[int, str]] = []
+        self._reset_element()
+
+    def _reset_element(self):
+        self._chars: List[str] = []
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume more text; returns the elements it completed"""
+        return [value for _, value in self.feed_indexed(chunk)]
+
+    def finish(self) -> List[Any]:
+        """End the stream; an element cut off by it (e.g. at max_tokens) goes to ``errors``"""
+        return [value for _, value in self.finish_indexed()]
+
+    def feed_indexed(self, chunk: str) -> List[Tuple[int, Any]]:
+        """``feed`` returning (position in the array, element) pairs"""
+        completed: List[Tuple[int, Any]] = []
+        for ch in chunk:
+            if self.done:
+                break
+            if not self._in_array:
+                if ch == "[":
+                    self._in_array = True
+                continue
+
+            if self._in_string:
+                self._chars.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if not self._stack:
+                        self._emit(completed)
+                continue
+
+            if not self._chars:
+                if ch.isspace() or ch == ",":
+                    continue
+                if ch == "]":
+                    self._end_array()
+                    continue
+
+            if ch == '"':
+                self._in_string = True
+                self._chars.append(ch)
+            elif ch in "{[":
+                self._stack.append(ch)
+                self._chars.append(ch)
+            elif ch in "}]" and self._stack:
+                self._stack.pop()
+                self._chars.append(ch)
+                if not self._stack:
+                    self._emit(completed)
+            elif ch in ",]" and not self._stack:
+                # End of a bare scalar (number, literal)
+                self._emit(completed)
+                if ch == "]":
+                    self._end_array()
+            else:
+                self._chars.append(ch)
+        return completed
+
+    def finish_indexed(self) -> List[Tuple[int, Any]]:
+        if self._in_array and not self.done:
+            if self._chars:
+                self.errors.append((self._index, "truncated"))
+            self._end_array()
+        return []
+
+    def _emit(self, completed: List[Tuple[int, Any]]):
+        text = "".join(self._chars).strip()
+        self._reset_element()
+        index = self._index
+        self._index += 1
+        try:
+            completed.append((index, parse_json(text)))
+            self._parsed += 1
+        except json.JSONDecodeError as e:
+            self._array_errors.append((index, f"invalid JSON: {e.msg}"))
+
+    def _end_array(self):
+        if self._parsed:
+            self.done = True
+            self.errors.extend(self._array_errors)
+        else:
+            # Not the array we were after; keep looking
+            self._in_array = False
+            self._index = 0
+        self._array_errors = []
+        self._reset_element()
+
+
+class StructuredArrayParser(Generic[T]):
+    """``JsonArrayStream`` whose elements are validated against a schema.
+
+    Elements that parse but fail validation are recorded in ``errors``
+    alongside parse failures, so one bad element never costs the whole
+    response.
+    """
+
+    def __init__(self, schema: Type[T]):
+        self.adapter = TypeAdapter(schema)
+        self.stream = JsonArrayStream()
+        self._validation_errors: List[Tuple[int, str]] = []
+
+    @property
+    def errors(self) -> List[Tuple[int, str]]:
+        return sorted(self.stream.errors + self._validation_errors)
+
+    def _validate(self, values: List[Tuple[int, Any]]) -> List[T]:
+        items = []
+        for index, value in values:
+            try:
+                items.append(self.adapter.validate_python(value))
+            except ValidationError as e:
+                problems = "; ".join(
+                    f"{'.'.join(str(part) for part in error['loc']) or 'value'}: {error['msg']}"
+                    for error in e.errors()
+                )
+                self._validation_errors.append((index, problems))
+        return items
+
+    def feed(self, chunk: str) -> List[T]:
+        return self._validate(self.stream.feed_indexed(chunk))
+
+    def finish(self) -> List[T]:
+        return self._validate(self.stream.finish_indexed())
+
+    def parse(self, text: str) -> List[T]:
+        """Parse a complete response"""
+        return self.feed(text) + self.finish()
+
+
+# ----------------------------------------------------------------------
+# Schemas
+# ----------------------------------------------------------------------
+
+def _goal_text(value: Any) -> Any:
+    """Accept a bare string or an object with a goal/title field"""
+    if isinstance(value, dict):
+        for key in ("goal", "title", "text", "description"):
+            if isinstance(value.get(key), str):
+                return value[key]
+    return value
+
+
+SprintGoal = Annotated[str, BeforeValidator(_goal_text), Field(min_length=1, max_length=300)]
+
+
+class TaskSuggestion(BaseModel):
+    """One suggested task as returned by the model"""
+    model_config = ConfigDict(str_strip_whitespace=True, extra="ignore")
+
+    title: str = Field(min_length=1, max_length=200)
+    description: str = ""
+    platform: str = "both"
+    priority: TaskPriority = TaskPriority.MEDIUM
+    estimated_hours: float = Field(4.0, ge=0, le=1000)
+
+    @field_validator("platform", "priority", mode="before")
+    @classmethod
+    def _lowercase(cls, value: Any) -> Any:
+        return value.strip().lower() if isinstance(value, str) else value
+
+    @field_validator("description", mode="before")
+    @classmethod
+    def _none_is_empty(cls, value: Optional[str]) -> Any:
+        return "" if value is None else value
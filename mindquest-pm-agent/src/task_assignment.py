@@ -0,0 +1,195 @@
+"""
+MindQuest Project Manager Agent - Task Assignment
+Skill- and dependency-aware assignment of tasks to team members with a day-by-day timeline
+"""
+
+import heapq
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.models import Task
+from src.sprint_planner import DependencyGraph
+
+# Skills a member needs to take a task on each platform
+REQUIRED_SKILLS = {
+    "ios": frozenset({"ios"}),
+    "android": frozenset({"android"}),
+    "web": frozenset({"web"}),
+    "both": frozenset({"ios", "android"}),
+}
+
+
+@dataclass
+class TeamMember:
+    """A developer with platform skills and a daily capacity"""
+    name: str
+    platforms: frozenset
+    hours_per_day: float
+
+    @classmethod
+    def from_config(cls, entry: Any, default_platforms: Iterable[str], default_hours: float) -> "TeamMember":
+        """Accept either a plain name or {"name", "platforms", "hours_per_day"}"""
+        if isinstance(entry, str):
+            return cls(entry, frozenset(default_platforms), default_hours)
+        return cls(
+            entry["name"],
+            frozenset(entry.get("platforms", default_platforms)),
+            entry.get("hours_per_day", default_hours)
+        )
+
+
+def load_team(config: Dict[str, Any]) -> List[TeamMember]:
+    """Team members from the agent config"""
+    default_platforms = config.get("platforms", ["ios", "android", "web"])
+    default_hours = config.get("work_hours_per_day", 6)
+    return [
+        TeamMember.from_config(entry, default_platforms, default_hours)
+        for entry in config.get("team_members", ["developer"])
+    ]
+
+
+@dataclass
+class AssignmentPlan:
+    """Who does what, when"""
+    assignments: Dict[str, str] = field(default_factory=dict)
+    start_days: Dict[str, float] = field(default_factory=dict)
+    finish_days: Dict[str, float] = field(default_factory=dict)
+    member_hours: Dict[str, float] = field(default_factory=dict)
+    unassigned: Dict[str, str] = field(default_factory=dict)
+    timeline: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "assignments": self.assignments,
+            "member_hours": {name: round(hours, 2) for name, hours in self.member_hours.items()},
+            "unassigned": self.unassigned,
+            "timeline": self.timeline,
+        }
+
+
+def assign_tasks(
+    tasks: Iterable[Task],
+    members: List[TeamMember],
+    horizon_days: int,
+    start_date: Optional[date] = None,
+    is_done: Optional[Callable[[str], bool]] = None
+) -> AssignmentPlan:
+    """List-schedule tasks onto members.
+
+    Tasks are taken in priority-aware topological order. Each task goes to
+    the eligible member (skills cover the task's platform) who can start it
+    earliest, no earlier than its in-plan prerequisites finish. Existing
+    assignees are kept when they are still on the team. Members are held in
+    one min-heap per distinct skill set, keyed by the day they become free,
+    so each placement costs O(skill groups * log members) instead of a scan
+    of the whole team. Time is measured in days from ``start_date``;
+    work that would finish after ``horizon_days`` is left unassigned.
+    """
+    plan = AssignmentPlan()
+    start_date = start_date or date.today()
+    is_done = is_done or (lambda task_id: False)
+    by_name = {member.name: member for member in members}
+    graph = DependencyGraph(tasks)
+    order, unordered = graph.topological_order()
+    for task_id in unordered:
+        plan.unassigned[task_id] = "dependency cycle"
+
+    # One heap per distinct skill set; entries are (free_day, name, version)
+    groups: Dict[frozenset, List[Tuple[float, str, int]]] = {}
+    for member in members:
+        groups.setdefault(member.platforms, []).append((0.0, member.name, 0))
+        plan.member_hours[member.name] = 0.0
+    for heap in groups.values():
+        heapq.heapify(heap)
+    free_day = {member.name: 0.0 for member in members}
+    version = {member.name: 0 for member in members}
+    eligible_groups: Dict[frozenset, List[frozenset]] = {}
+
+    def peek(heap) -> Optional[Tuple[float, str]]:
+        # Drop entries made stale by a placement through another skill group
+        while heap and heap[0][2] != version[heap[0][1]]:
+            heapq.heappop(heap)
+        return (heap[0][0], heap[0][1]) if heap else None
+
+    def place(member: TeamMember, task: Task, ready: float):
+        start = max(free_day[member.name], ready)
+        finish = start + task.estimated_hours / member.hours_per_day
+        if finish > horizon_days + 1e-9:
+            plan.unassigned[task.id] = "does not fit in the sprint"
+            return
+        plan.assignments[task.id] = member.name
+        plan.start_days[task.id] = start
+        plan.finish_days[task.id] = finish
+        plan.member_hours[member.name] += task.estimated_hours
+        free_day[member.name] = finish
+        version[member.name] += 1
+        heapq.heappush(groups[member.platforms], (finish, member.name, version[member.name]))
+
+    for task_id in order:
+        task = graph.tasks[task_id]
+        waiting = [dep for dep in graph.external.get(task_id, ()) if not is_done(dep)]
+        waiting += [dep for dep in graph.parents[task_id] if dep not in plan.finish_days]
+        if waiting:
+            plan.unassigned[task_id] = f"waiting on {', '.join(waiting)}"
+            continue
+        ready = max((plan.finish_days[dep] for dep in graph.parents[task_id]), default=0.0)
+
+        if task.assigned_to in by_name:
+            place(by_name[task.assigned_to], task, ready)
+            continue
+
+        required = REQUIRED_SKILLS.get(task.platform, frozenset({task.platform}))
+        if required not in eligible_groups:
+            eligible_groups[required] = [skills for skills in groups if required <= skills]
+        best = None
+        for skills in eligible_groups[required]:
+            top = peek(groups[skills])
+            if top is not None:
+                candidate = (max(top[0], ready), top[0], top[1])
+                if best is None or candidate < best:
+                    best = candidate
+        if best is None:
+            plan.unassigned[task_id] = f"no team member covers {task.platform}"
+            continue
+        place(by_name[best[2]], task, ready)
+
+    plan.timeline = build_timeline(plan, graph.tasks, by_name, start_date)
+    return plan
+
+
+def build_timeline(
+    plan: AssignmentPlan,
+    tasks: Dict[str, Task],
+    members: Dict[str, TeamMember],
+    start_date: date
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Split each member's task intervals into per-day hour allocations"""
+    days: Dict[str, Dict[int, List[Dict[str, Any]]]] = {name: {} for name in members}
+    for task_id, name in plan.assignments.items():
+        start, finish = plan.start_days[task_id], plan.finish_days[task_id]
+        hours_per_day = members[name].hours_per_day
+        day = int(start)
+        while day < finish - 1e-9:
+            overlap = min(finish, day + 1) - max(start, day)
+            if overlap > 1e-9:
+                days[name].setdefault(day, []).append({
+                    "task_id": task_id,
+                    "title": tasks[task_id].title,
+                    "hours": round(overlap * hours_per_day, 2),
+                })
+            day += 1
+
+    return {
+        name: [
+            {"day": day, "date": (start_date + timedelta(days=day)).isoformat(), "tasks": entries}
+            for day, entries in sorted(member_days.items())
+        ]
+        for name, member_days in days.items()
+    }
+
+
+def team_capacity_hours(members: List[TeamMember], days: int) -> float:
+    """Total working hours the team has over ``days``"""
+    return sum(member.hours_per_day for member in members) * days
+
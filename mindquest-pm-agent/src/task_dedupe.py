@@ -0,0 +1,423 @@
+"""
+MindQuest Project Manager Agent - Task Deduplication
+MinHash/LSH near-duplicate detection over task titles and descriptions
+"""
+
+import logging
+import os
+import sqlite3
+import zlib
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.models import Task
+from src.task_search import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Smallest prime above 2**32: universal hashing of 32-bit token hashes stays within uint64
+_PRIME = np.uint64(4294967311)
+# Odd 64-bit multipliers for mixing a band's rows into its bucket key
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+_MIX_SEED = np.uint64(0xC2B2AE3D27D4EB4F)
+
+
+def shingles(title: str, description: str) -> Set[str]:
+    """The set of normalised terms a task's similarity is measured on.
+
+    Title terms are also included marked as title terms, so they count
+    twice: tasks sharing only boilerplate descriptions stay apart.
+    """
+    title_terms = tokenize(title or "")
+    return {*title_terms, *tokenize(description or ""), *(f"title:{term}" for term in title_terms)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+@lru_cache(maxsize=1 << 16)
+def _token_hash(token: str) -> int:
+    return zlib.crc32(token.encode("utf-8"))
+
+
+def text_hash(task: Task) -> int:
+    return zlib.crc32(f"{task.title}\n{task.description}".encode("utf-8"))
+
+
+class MinHasher:
+    """MinHash signatures split into LSH bands.
+
+    Two sets with Jaccard similarity ``s`` share at least one band bucket
+    with probability ``1 - (1 - s ** rows) ** bands``: with 64 hashes in 16
+    bands of 4 that is 0.98 at s=0.8 and 0.05 at s=0.3.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, tokens: Set[str]) -> Optional[np.ndarray]:
+        """Minimum of each hash function over the tokens; None for no tokens"""
+        return self.signatures([tokens])[0] if tokens else None
+
+    def signatures(self, token_sets: List[Set[str]]) -> np.ndarray:
+        """Signatures of several non-empty token sets at once, one row each"""
+        counts = [len(tokens) for tokens in token_sets]
+        hashes = np.fromiter(
+            (_token_hash(token) for tokens in token_sets for token in tokens), dtype=np.uint64, count=sum(counts)
+        )
+        # (a * h + b) mod p, with a, h and b below 2**32 so nothing overflows
+        values = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME
+        starts = np.concatenate(([0], np.cumsum(counts[:-1], dtype=np.int64)))
+        return np.minimum.reduceat(values, starts, axis=1).T.astype(np.uint32)
+
+    def bucket_keys(self, signature: np.ndarray) -> List[int]:
+        """One bucket key per band, as signed 64-bit integers for SQLite"""
+        return self.band_keys(signature[None, :])[0].tolist()
+
+    def band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """Bucket keys for rows of signatures, one column per band"""
+        rows = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        keys = np.full((len(signatures), self.bands), _MIX_SEED, dtype=np.uint64)
+        # Polynomial mix of each band's rows; uint64 arithmetic wraps around
+        for column in range(self.rows):
+            keys = keys * _MIX + rows[:, :, column]
+        return (keys ^ (keys >> np.uint64(29))).view(np.int64)
+
+
+class LocalLSH:
+    """In-memory LSH buckets, for tasks not stored yet (an import batch)"""
+
+    def __init__(self, hasher: MinHasher):
+        self.hasher = hasher
+        self.buckets: Dict[Tuple[int, int], List[Any]] = {}
+
+    def add(self, item: Any, tokens: Set[str]):
+        signature = self.hasher.signature(tokens)
+        if signature is None:
+            return
+        for band, key in enumerate(self.hasher.bucket_keys(signature)):
+            self.buckets.setdefault((band, key), []).append(item)
+
+    def candidates(self, tokens: Set[str]) -> List[Any]:
+        signature = self.hasher.signature(tokens)
+        if signature is None:
+            return []
+        found = {}
+        for band, key in enumerate(self.hasher.bucket_keys(signature)):
+            for item in self.buckets.get((band, key), ()):
+                found[id(item)] = item
+        return list(found.values())
+
+    def clear(self):
+        self.buckets.clear()
+
+
+class DedupeIndex:
+    """Persistent LSH index of every task's MinHash signature.
+
+    ``sync`` catches the index up with the store: only tasks whose version
+    changed are looked at, and only those whose title or description changed
+    are re-hashed. After that ``observe`` is called with each created or
+    updated task. ``candidates`` looks up a text's band buckets (one
+    primary-key range per band) instead of comparing it with every
+    task; callers confirm candidates with the exact Jaccard similarity of
+    their terms. Bucket entries are only keyed by bucket: a task's entries
+    are found again for deletion from its stored signature.
+
+    Writes are committed per task, or once for a ``batch()``; ``sync``
+    writes changed tasks in chunks of ``chunk_size``. A write lost to a
+    crash only leaves a task's stored version behind, so the next ``sync``
+    redoes it.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS signatures (
+        task_id TEXT PRIMARY KEY,
+        version INTEGER NOT NULL,
+        text_hash INTEGER NOT NULL,
+        signature BLOB
+    );
+    CREATE TABLE IF NOT EXISTS buckets (
+        band INTEGER NOT NULL,
+        bucket INTEGER NOT NULL,
+        task_id TEXT NOT NULL,
+        PRIMARY KEY (band, bucket, task_id)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS settings (
+        name TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+    """
+
+    def __init__(
+        self,
+        path: str = "data/dedupe_index.db",
+        threshold: float = 0.6,
+        num_perm: int = 64,
+        bands: int = 16,
+        enabled: bool = True
+    ):
+        self.path = Path(path)
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm, bands)
+        self.enabled = enabled
+        self._conn: Optional[sqlite3.Connection] = None
+        # task id -> (version, text hash) as last indexed
+        self._known: Dict[str, Tuple[int, int]] = {}
+        self._batch_depth = 0
+
+    @classmethod
+    def from_config(cls, dedupe_config: Optional[Dict[str, Any]] = None) -> "DedupeIndex":
+        """Create an index from the ``dedupe`` config section"""
+        dedupe_config = dedupe_config or {}
+        return cls(
+            path=dedupe_config.get("path", "data/dedupe_index.db"),
+            threshold=dedupe_config.get("threshold", 0.6),
+            num_perm=dedupe_config.get("num_perm", 64),
+            bands=dedupe_config.get("bands", 16),
+            enabled=dedupe_config.get("enabled", True)
+        )
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.path.parent, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path))
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # Bucket keys are random, so writes touch pages all over the table; keep more of it cached
+            self._conn.execute("PRAGMA cache_size=-65536")
+            self._conn.executescript(self.SCHEMA)
+            self._check_settings()
+        return self._conn
+
+    def _check_settings(self):
+        """Signatures from other hash settings are useless; start over if they changed"""
+        wanted = {"num_perm": str(self.hasher.num_perm), "bands": str(self.hasher.bands), "seed": str(self.hasher.seed)}
+        stored = dict(self._conn.execute("SELECT name, value FROM settings"))
+        if stored == wanted:
+            return
+        if stored:
+            logger.info("Dedupe index hash settings changed; rebuilding it")
+        with self._conn:
+            self._conn.execute("DELETE FROM signatures")
+            self._conn.execute("DELETE FROM buckets")
+            self._conn.execute("DELETE FROM settings")
+            self._conn.executemany("INSERT INTO settings (name, value) VALUES (?, ?)", wanted.items())
+
+    @contextmanager
+    def batch(self):
+        """Commit every write inside the block once, when it exits"""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._conn is not None:
+                self._conn.commit()
+
+    def _commit(self):
+        if not self._batch_depth:
+            self.conn.commit()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
+    def sync(self, tasks: Iterable[Task], chunk_size: int = 2000) -> int:
+        """Bring the index up to date with ``tasks`` (the whole store); returns tasks re-hashed"""
+        self._known = {
+            task_id: (version, stored_hash)
+            for task_id, version, stored_hash in self.conn.execute("SELECT task_id, version, text_hash FROM signatures")
+        }
+        seen = set()
+        rehashed = 0
+        chunk: List[Task] = []
+        with self.batch():
+            for task in tasks:
+                seen.add(task.id)
+                known = self._known.get(task.id)
+                if known is not None and known[0] == task.version:
+                    continue
+                chunk.append(task)
+                if len(chunk) >= chunk_size:
+                    rehashed += self._index(chunk)
+                    chunk = []
+            rehashed += self._index(chunk)
+            removed = [task_id for task_id in self._known if task_id not in seen]
+            self._delete(removed)
+            for task_id in removed:
+                del self._known[task_id]
+        return rehashed
+
+    def observe(self, task: Task):
+        """Account for a created or updated task"""
+        if self._index([task]):
+            self._commit()
+
+    def _index(self, tasks: List[Task]) -> int:
+        """Write tasks whose version moved on; returns how many had to be re-hashed"""
+        moved, hashed, replaced = [], [], []
+        for task in tasks:
+            known = self._known.get(task.id)
+            if known is not None and known[0] == task.version:
+                continue
+            current_hash = text_hash(task)
+            if known is not None and known[1] == current_hash:
+                moved.append((task.version, task.id))
+            else:
+                hashed.append((task, current_hash))
+                if known is not None:
+                    replaced.append(task.id)
+            self._known[task.id] = (task.version, current_hash)
+        if moved:
+            self.conn.executemany("UPDATE signatures SET version = ? WHERE task_id = ?", moved)
+        if not hashed:
+            return 0
+
+        self._delete(replaced)
+        token_sets = [shingles(task.title, task.description) for task, _ in hashed]
+        present = [n for n, tokens in enumerate(token_sets) if tokens]
+        signatures: List[Optional[np.ndarray]] = [None] * len(hashed)
+        bucket_rows = []
+        if present:
+            computed = self.hasher.signatures([token_sets[n] for n in present])
+            for n, signature, keys in zip(present, computed, self.hasher.band_keys(computed).tolist()):
+                signatures[n] = signature
+                bucket_rows.extend((band, key, hashed[n][0].id) for band, key in enumerate(keys))
+        self.conn.executemany(
+            "INSERT INTO signatures (task_id, version, text_hash, signature) VALUES (?, ?, ?, ?)",
+            [
+                (task.id, task.version, current_hash, None if signature is None else signature.tobytes())
+                for (task, current_hash), signature in zip(hashed, signatures)
+            ]
+        )
+        self.conn.executemany("INSERT OR IGNORE INTO buckets (band, bucket, task_id) VALUES (?, ?, ?)", bucket_rows)
+        return len(hashed)
+
+    def _delete(self, task_ids: List[str]):
+        """Drop tasks' signatures and bucket entries, found again from the stored signatures"""
+        bucket_rows, stored = [], []
+        for start in range(0, len(task_ids), 500):
+            chunk = task_ids[start:start + 500]
+            stored.extend(self.conn.execute(
+                f"SELECT task_id, signature FROM signatures WHERE task_id IN ({', '.join('?' * len(chunk))})", chunk
+            ))
+        for task_id, signature in stored:
+            if signature is not None:
+                keys = self.hasher.bucket_keys(np.frombuffer(signature, dtype=np.uint32))
+                bucket_rows.extend((band, key, task_id) for band, key in enumerate(keys))
+        if not stored:
+            return
+        self.conn.executemany("DELETE FROM buckets WHERE band = ? AND bucket = ? AND task_id = ?", bucket_rows)
+        self.conn.executemany("DELETE FROM signatures WHERE task_id = ?", [(task_id,) for task_id, _ in stored])
+
+    def candidates(self, tokens: Set[str]) -> Set[str]:
+        """Ids of tasks sharing at least one band bucket with ``tokens``"""
+        signature = self.hasher.signature(tokens)
+        if signature is None:
+            return set()
+        found: Set[str] = set()
+        for band, key in enumerate(self.hasher.bucket_keys(signature)):
+            found.update(task_id for (task_id,) in self.conn.execute(
+                "SELECT task_id FROM buckets WHERE band = ? AND bucket = ?", (band, key)
+            ))
+        return found
+
+    def candidate_groups(self) -> Iterator[List[str]]:
+        """Task ids sharing a band bucket, one list per bucket with more than one task"""
+        cursor = self.conn.execute(
+            "SELECT group_concat(task_id, char(31)) FROM buckets GROUP BY band, bucket HAVING COUNT(*) > 1"
+        )
+        for (members,) in cursor:
+            yield members.split("\x1f")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+
+class UnionFind:
+    """Disjoint sets of task ids, with path halving and union by size"""
+
+    def __init__(self):
+        self.parent: Dict[str, str] = {}
+        self.size: Dict[str, int] = {}
+
+    def find(self, item: str) -> str:
+        parent = self.parent
+        if item not in parent:
+            parent[item] = item
+            self.size[item] = 1
+            return item
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: str, b: str):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+
+    def groups(self) -> List[List[str]]:
+        """Sets with more than one member"""
+        members: Dict[str, List[str]] = {}
+        for item in self.parent:
+            members.setdefault(self.find(item), []).append(item)
+        return [group for group in members.values() if len(group) > 1]
+
+
+def cluster_duplicates(index: DedupeIndex, load_tokens, representatives: int = 8) -> List[List[str]]:
+    """Clusters of near-duplicate task ids, without comparing all pairs.
+
+    Only tasks sharing a band bucket are compared: each member of a bucket
+    with up to ``representatives`` earlier members that matched nothing
+    before them, so a bucket costs at most that many comparisons per member.
+    A pair at or above the index threshold is merged with union-find, so
+    clusters are connected through any chain of similar pairs.
+    ``load_tokens(task_id)`` returns a task's terms, or None if it is gone.
+    """
+    tokens: Dict[str, Optional[Set[str]]] = {}
+
+    def terms(task_id: str) -> Optional[Set[str]]:
+        if task_id not in tokens:
+            tokens[task_id] = load_tokens(task_id)
+        return tokens[task_id]
+
+    sets = UnionFind()
+    for group in index.candidate_groups():
+        group.sort()
+        leaders: List[str] = []
+        for task_id in group:
+            task_terms = terms(task_id)
+            if task_terms is None:
+                continue
+            root = sets.find(task_id)
+            for leader in leaders:
+                if sets.find(leader) == root or jaccard(terms(leader), task_terms) >= index.threshold:
+                    sets.union(leader, task_id)
+                    break
+            else:
+                if len(leaders) < representatives:
+                    leaders.append(task_id)
+    return sets.groups()
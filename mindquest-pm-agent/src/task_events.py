@@ -0,0 +1,401 @@
+"""
+MindQuest Project Manager Agent - Task Events
+Append-only log of status transitions with incrementally maintained flow metrics
+"""
+
+import json
+import logging
+import os
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.file_lock import FileLock
+from src.models import Task, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+_COMPACT = (",", ":")
+CHECKPOINT_VERSION = 1
+HOUR = 3600.0
+
+
+class TaskEventLog:
+    """Status transitions, one compact JSON line each.
+
+    A record is ``{"t": epoch seconds, "id": task id, "f": previous status or
+    null on creation, "s": new status, "h": estimated hours}``. The log is
+    only ever appended to; readers resume from a byte offset.
+
+    Several processes append to the same log, each under an inter-process
+    lock on ``<log>.lock``. A ``batch()`` holds the lock until it exits, so
+    the events it writes are contiguous and their offsets known.
+    """
+
+    def __init__(self, path: str = "data/task_events.log"):
+        self.path = Path(path)
+        self.lock = FileLock(f"{self.path}.lock")
+        self._file = None
+        self._batch_depth = 0
+        # Size of the log while this process holds the lock, counting its unflushed events
+        self._end: Optional[int] = None
+
+    def exists(self) -> bool:
+        return self.path.exists() and self.path.stat().st_size > 0
+
+    def size(self) -> int:
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    @contextmanager
+    def locked(self):
+        """Hold the log's lock, so no other process appends until the block exits"""
+        with self.lock:
+            outermost = self._end is None
+            if outermost:
+                self._end = self.size()
+            try:
+                yield
+            finally:
+                if outermost:
+                    if self._file is not None:
+                        self._file.flush()
+                    self._end = None
+
+    def append(self, event: Dict[str, Any]) -> int:
+        """Write one event and return the log size after it"""
+        with self.locked():
+            if self._file is None:
+                os.makedirs(self.path.parent, exist_ok=True)
+                self._file = open(self.path, 'ab')
+            line = json.dumps(event, separators=_COMPACT).encode() + b"\n"
+            self._file.write(line)
+            self._end += len(line)
+            if not self._batch_depth:
+                self._file.flush()
+            return self._end
+
+    @contextmanager
+    def batch(self):
+        """Hold the lock and flush once when the block exits instead of after every event"""
+        with self.locked():
+            self._batch_depth += 1
+            try:
+                yield
+            finally:
+                self._batch_depth -= 1
+
+    def read(self, offset: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield ``(offset after event, event)`` from ``offset`` on, stopping at a torn line"""
+        if not self.path.exists():
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                try:
+                    yield offset, json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping corrupt event at byte {offset - len(line)} of {self.path}")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+@dataclass
+class SprintFlow:
+    """Completions that landed in one sprint window"""
+    throughput: int = 0
+    points: float = 0.0
+    lead_seconds: float = 0.0
+    cycle_seconds: float = 0.0
+    cycled: int = 0
+
+
+class FlowMetrics:
+    """Lead time, cycle time, throughput and velocity per sprint.
+
+    Every event is folded into running state once: open tasks keep their
+    creation and start times, completed tasks remember which sprint they
+    were counted in (so a reopened task can be taken back out), and each
+    sprint window keeps its own totals. A checkpoint of that state plus the
+    log offset is written periodically, so loading replays only events
+    appended since and closed sprints are never recomputed.
+
+    Other processes append to the same log. Events past ``offset`` are
+    applied before each append (under the log's lock) and before each read,
+    and ``offset`` only moves past events that have been applied.
+
+    Lead time runs from creation to completion, cycle time from the first
+    move to in-progress to completion. Velocity is the mean completed
+    estimate hours (the agent's story points) over recent closed sprints.
+    """
+
+    def __init__(
+        self,
+        log_path: str = "data/task_events.log",
+        checkpoint_path: str = "data/flow_checkpoint.json",
+        sprint_days: int = 14,
+        sprint_start: Optional[str] = None,
+        velocity_window: int = 3,
+        checkpoint_every: int = 500
+    ):
+        self.log = TaskEventLog(log_path)
+        self.checkpoint_path = Path(checkpoint_path)
+        self.sprint_seconds = sprint_days * 86400.0
+        self.configured_start = (
+            datetime.fromisoformat(sprint_start).timestamp() if sprint_start else None
+        )
+        self.velocity_window = velocity_window
+        self.checkpoint_every = checkpoint_every
+        self._reset()
+        self._load()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "FlowMetrics":
+        flow_config = config.get("flow_metrics", {})
+        return cls(
+            log_path=flow_config.get("events_path", "data/task_events.log"),
+            checkpoint_path=flow_config.get("checkpoint_path", "data/flow_checkpoint.json"),
+            sprint_days=config.get("sprint_duration_days", 14),
+            sprint_start=flow_config.get("sprint_start_date"),
+            velocity_window=flow_config.get("velocity_window_sprints", 3),
+            checkpoint_every=flow_config.get("checkpoint_every", 500)
+        )
+
+    def _reset(self):
+        self.anchor: Optional[float] = self.configured_start
+        self.offset = 0
+        # task id -> [created_at, started_at or None]
+        self.open: Dict[str, List[Optional[float]]] = {}
+        # task id -> (sprint, hours, created_at, started_at or None, completed_at)
+        self.done: Dict[str, Tuple[int, float, float, Optional[float], float]] = {}
+        self.sprints: Dict[int, SprintFlow] = {}
+        self._pending = 0
+
+    # ------------------------------------------------------------------
+    # Loading and checkpoints
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        state = self._read_checkpoint()
+        if state is not None:
+            self.anchor = state["anchor"]
+            self.offset = state["offset"]
+            self.open = state["open"]
+            self.done = {task_id: tuple(entry) for task_id, entry in state["done"].items()}
+            self.sprints = {int(k): SprintFlow(**v) for k, v in state["sprints"].items()}
+
+        replayed = self.refresh()
+        if replayed:
+            logger.info(f"Replayed {replayed} task events since the last flow checkpoint")
+            self.save_checkpoint()
+
+    def refresh(self) -> int:
+        """Apply events appended to the log since ``offset``, by any process; returns how many"""
+        applied = 0
+        for offset, event in self.log.read(self.offset):
+            self._apply(event)
+            self.offset = offset
+            applied += 1
+        self._pending += applied
+        return applied
+
+    def _read_checkpoint(self) -> Optional[Dict[str, Any]]:
+        if not self.checkpoint_path.exists():
+            return None
+        try:
+            with open(self.checkpoint_path, 'r') as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable flow checkpoint: {e}")
+            return None
+
+        # A checkpoint for different sprint windows, or past the end of a
+        # replaced log, cannot be resumed; rebuild from the log instead
+        if (
+            state.get("version") != CHECKPOINT_VERSION
+            or state.get("sprint_seconds") != self.sprint_seconds
+            or (self.configured_start is not None and state.get("anchor") != self.configured_start)
+            or state.get("offset", 0) > self.log.size()
+        ):
+            logger.info("Flow checkpoint does not match the event log or sprint settings; rebuilding")
+            return None
+        return state
+
+    def save_checkpoint(self):
+        """Atomically persist the running state and log offset.
+
+        Any process's checkpoint is consistent with its own offset, so the
+        last one written wins and the next load replays from its offset.
+        """
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "sprint_seconds": self.sprint_seconds,
+            "anchor": self.anchor,
+            "offset": self.offset,
+            "open": self.open,
+            "done": self.done,
+            "sprints": {str(k): asdict(v) for k, v in self.sprints.items()},
+        }
+        os.makedirs(self.checkpoint_path.parent, exist_ok=True)
+        # Processes sharing the checkpoint each write their own temporary file
+        tmp_path = self.checkpoint_path.with_suffix(f".json.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, separators=_COMPACT)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+        self._pending = 0
+
+    def close(self):
+        if self._pending:
+            self.save_checkpoint()
+        self.log.close()
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def record(
+        self,
+        task_id: str,
+        previous: Optional[TaskStatus],
+        status: TaskStatus,
+        hours: float,
+        at: Optional[datetime] = None
+    ):
+        """Append a transition (``previous=None`` for creation) and fold it in"""
+        event = {
+            "t": round((at or datetime.now()).timestamp(), 3),
+            "id": task_id,
+            "f": previous.value if previous else None,
+            "s": status.value,
+            "h": hours,
+        }
+        with self.log.locked():
+            # Events other processes appended since our offset come first
+            self.refresh()
+            end = self.log.append(event)
+            self._apply(event)
+            self.offset = end
+        self._pending += 1
+        if self._pending >= self.checkpoint_every:
+            self.save_checkpoint()
+
+    def seed(self, tasks: Iterable[Task]):
+        """Backfill approximate history for tasks that predate the event log.
+
+        Each task gets a creation event at ``created_at`` and, unless it is
+        still to do, a transition to its current status at ``updated_at``.
+        """
+        seeded = 0
+        for task in sorted(tasks, key=lambda task: task.created_at):
+            self.record(task.id, None, TaskStatus.TODO, task.estimated_hours, at=task.created_at)
+            if task.status != TaskStatus.TODO:
+                self.record(task.id, TaskStatus.TODO, task.status, task.estimated_hours, at=task.updated_at)
+            seeded += 1
+        if seeded:
+            self.save_checkpoint()
+            logger.info(f"Seeded the task event log from {seeded} existing tasks")
+
+    def _apply(self, event: Dict[str, Any]):
+        at, task_id, previous, status = event["t"], event["id"], event["f"], event["s"]
+        if self.anchor is None:
+            self.anchor = datetime.fromtimestamp(at).replace(
+                hour=0, minute=0, second=0, microsecond=0
+            ).timestamp()
+
+        if previous is None:
+            self.open[task_id] = [at, None]
+            return
+
+        if previous == TaskStatus.COMPLETED.value and task_id in self.done:
+            # Reopened: take the completion back out of the sprint it was counted in
+            sprint, hours, created, started, completed = self.done.pop(task_id)
+            bucket = self.sprints[sprint]
+            bucket.throughput -= 1
+            bucket.points -= hours
+            bucket.lead_seconds -= completed - created
+            if started is not None:
+                bucket.cycle_seconds -= completed - started
+                bucket.cycled -= 1
+            self.open[task_id] = [created, started]
+
+        # Tasks first seen mid-flight are treated as created at that moment
+        timing = self.open.setdefault(task_id, [at, None])
+        if status == TaskStatus.IN_PROGRESS.value and timing[1] is None:
+            timing[1] = at
+        elif status == TaskStatus.COMPLETED.value:
+            created, started = self.open.pop(task_id)
+            sprint = self.sprint_index(at)
+            bucket = self.sprints.setdefault(sprint, SprintFlow())
+            bucket.throughput += 1
+            bucket.points += event["h"]
+            bucket.lead_seconds += at - created
+            if started is not None:
+                bucket.cycle_seconds += at - started
+                bucket.cycled += 1
+            self.done[task_id] = (sprint, event["h"], created, started, at)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def sprint_index(self, at: float) -> int:
+        return int((at - (self.anchor or at)) // self.sprint_seconds)
+
+    def current_sprint(self) -> int:
+        return self.sprint_index(datetime.now().timestamp())
+
+    def velocity(self) -> float:
+        """Mean completed points over the last ``velocity_window`` closed sprints"""
+        self.refresh()
+        if self.anchor is None:
+            return 0.0
+        current = self.current_sprint()
+        closed = range(max(0, current - self.velocity_window), current)
+        if not closed:
+            return round(self.sprints.get(current, SprintFlow()).points, 1)
+        return round(sum(self.sprints.get(i, SprintFlow()).points for i in closed) / len(closed), 1)
+
+    def average_lead_time_hours(self) -> float:
+        self.refresh()
+        completed = sum(bucket.throughput for bucket in self.sprints.values())
+        if not completed:
+            return 0.0
+        return round(sum(bucket.lead_seconds for bucket in self.sprints.values()) / completed / HOUR, 1)
+
+    def average_cycle_time_hours(self) -> float:
+        self.refresh()
+        cycled = sum(bucket.cycled for bucket in self.sprints.values())
+        if not cycled:
+            return 0.0
+        return round(sum(bucket.cycle_seconds for bucket in self.sprints.values()) / cycled / HOUR, 1)
+
+    def sprint_report(self, last: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Per-sprint flow metrics, oldest first"""
+        self.refresh()
+        if self.anchor is None:
+            return []
+        current = self.current_sprint()
+        first = 0 if last is None else max(0, current - last + 1)
+        report = []
+        for sprint in range(first, current + 1):
+            bucket = self.sprints.get(sprint, SprintFlow())
+            start = self.anchor + sprint * self.sprint_seconds
+            report.append({
+                "sprint": sprint + 1,
+                "start": datetime.fromtimestamp(start).date().isoformat(),
+                "end": datetime.fromtimestamp(start + self.sprint_seconds).date().isoformat(),
+                "throughput": bucket.throughput,
+                "points": round(bucket.points, 1),
+                "lead_time_hours": round(bucket.lead_seconds / bucket.throughput / HOUR, 1) if bucket.throughput else None,
+                "cycle_time_hours": round(bucket.cycle_seconds / bucket.cycled / HOUR, 1) if bucket.cycled else None,
+            })
+        return report
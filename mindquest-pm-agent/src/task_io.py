@@ -0,0 +1,279 @@
+"""
+MindQuest Project Manager Agent - Task Import/Export
+Streaming JSONL and CSV task exchange with batched validation
+"""
+
+import csv
+import json
+import math
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from src.models import Task, TaskPriority, TaskStatus
+from src.task_store import TaskStore
+
+FORMATS = ("jsonl", "csv")
+CSV_COLUMNS = (
+    "id", "title", "description", "priority", "status", "platform",
+    "estimated_hours", "assigned_to", "due_date", "dependencies", "tags",
+    "created_at", "updated_at"
+)
+# Separator for dependencies and tags inside a CSV cell
+LIST_SEPARATOR = ";"
+DEFAULT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 20
+
+# (line number, parsed record or None, parse error or None)
+RawRecord = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def detect_format(path: Optional[str], fmt: Optional[str] = None) -> str:
+    """Explicit format, else guessed from the file suffix (JSONL by default)"""
+    if fmt:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+        return fmt
+    if path and Path(path).suffix.lower() == ".csv":
+        return "csv"
+    return "jsonl"
+
+
+# ----------------------------------------------------------------------
+# Export
+# ----------------------------------------------------------------------
+
+def write_tasks(tasks: Iterable[Task], out: TextIO, fmt: str) -> int:
+    """Write tasks one at a time and return how many were written"""
+    written = 0
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(CSV_COLUMNS)
+        for task in tasks:
+            data = task.to_dict()
+            data["dependencies"] = LIST_SEPARATOR.join(data["dependencies"])
+            data["tags"] = LIST_SEPARATOR.join(data["tags"])
+            writer.writerow("" if data[column] is None else data[column] for column in CSV_COLUMNS)
+            written += 1
+    else:
+        for task in tasks:
+            out.write(json.dumps(task.to_dict(), separators=(",", ":")) + "\n")
+            written += 1
+    return written
+
+
+# ----------------------------------------------------------------------
+# Import
+# ----------------------------------------------------------------------
+
+def read_records(source: TextIO, fmt: str) -> Iterator[RawRecord]:
+    """Yield records lazily; malformed lines are reported, not raised"""
+    if fmt == "csv":
+        reader = csv.DictReader(source)
+        for row in reader:
+            yield reader.line_num, {k: v for k, v in row.items() if k is not None}, None
+        return
+
+    for line_number, line in enumerate(source, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "expected a JSON object"
+            continue
+        yield line_number, record, None
+
+
+def _blank(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _enum(enum_type, value: Any, default):
+    if _blank(value):
+        return default
+    try:
+        return enum_type(str(value).strip().lower())
+    except ValueError:
+        allowed = ", ".join(member.value for member in enum_type)
+        raise ValueError(f"{enum_type.__name__} must be one of {allowed}, got {value!r}")
+
+
+def _datetime(name: str, value: Any, default: Optional[datetime]) -> Optional[datetime]:
+    if _blank(value):
+        return default
+    try:
+        return datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        raise ValueError(f"{name} is not an ISO date/time: {value!r}")
+
+
+def _string_list(name: str, value: Any) -> List[str]:
+    if _blank(value):
+        return []
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(LIST_SEPARATOR) if item.strip()]
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return value
+    raise ValueError(f"{name} must be a list of strings")
+
+
+def task_from_record(record: Dict[str, Any], platforms: Iterable[str], now: datetime) -> Task:
+    """Validate one import record; missing optional fields get create_task defaults"""
+    title = record.get("title")
+    if _blank(title) or not isinstance(title, str):
+        raise ValueError("title is required")
+
+    platform = "both" if _blank(record.get("platform")) else str(record["platform"]).strip().lower()
+    if platform not in platforms:
+        raise ValueError(f"platform must be one of {', '.join(sorted(platforms))}, got {platform!r}")
+
+    hours = record.get("estimated_hours")
+    try:
+        hours = 4.0 if _blank(hours) else float(hours)
+    except (TypeError, ValueError):
+        raise ValueError(f"estimated_hours must be a number, got {hours!r}")
+    if not math.isfinite(hours) or hours < 0:
+        raise ValueError(f"estimated_hours must be a non-negative number, got {hours!r}")
+
+    created_at = _datetime("created_at", record.get("created_at"), now)
+    return Task(
+        id="" if _blank(record.get("id")) else str(record["id"]).strip(),
+        title=title.strip(),
+        description="" if _blank(record.get("description")) else str(record["description"]),
+        priority=_enum(TaskPriority, record.get("priority"), TaskPriority.MEDIUM),
+        status=_enum(TaskStatus, record.get("status"), TaskStatus.TODO),
+        platform=platform,
+        estimated_hours=hours,
+        assigned_to=None if _blank(record.get("assigned_to")) else str(record["assigned_to"]).strip(),
+        due_date=_datetime("due_date", record.get("due_date"), None),
+        dependencies=_string_list("dependencies", record.get("dependencies")),
+        tags=_string_list("tags", record.get("tags")),
+        created_at=created_at,
+        updated_at=_datetime("updated_at", record.get("updated_at"), created_at)
+    )
+
+
+@dataclass
+class ImportResult:
+    """Counts for an import; only the first few errors are kept"""
+    imported: int = 0
+    replaced: int = 0
+    skipped: int = 0
+    merged: int = 0
+    invalid: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+    dry_run: bool = False
+
+    def add_error(self, line_number: int, message: str):
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line_number, message))
+
+
+def validate_records(records: Iterable[RawRecord], platforms: Iterable[str]) -> ImportResult:
+    """Check every record without writing anything"""
+    result = ImportResult(dry_run=True)
+    platforms = set(platforms)
+    now = datetime.now()
+    for line_number, record, error in records:
+        if error is None:
+            try:
+                task_from_record(record, platforms, now)
+            except ValueError as e:
+                error = str(e)
+        if error is not None:
+            result.add_error(line_number, error)
+    return result
+
+
+def import_tasks(
+    store: TaskStore,
+    records: Iterable[RawRecord],
+    allocate_id: Callable[[], str],
+    platforms: Iterable[str],
+    on_conflict: str = "skip",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    dry_run: bool = False,
+    on_imported: Optional[Callable[[Task, Optional[Task]], None]] = None,
+    deduplicate: Optional[Callable[[Task], bool]] = None,
+    on_batch: Optional[Callable[[], None]] = None
+) -> ImportResult:
+    """Validate and store records ``batch_size`` at a time.
+
+    Only one batch of records is held in memory. Each batch is validated,
+    checked for id conflicts with a single ``get_many`` and written with one
+    ``add_many``; run inside ``store.batch()`` to commit the whole import
+    together. Records without an id get one from ``allocate_id`` when their
+    batch is written, never on a dry run. Existing ids are skipped or, with
+    ``on_conflict="replace"``, overwritten.
+    Every other record is offered to ``deduplicate(task)``, which returns
+    True if it merged the task into a near-duplicate instead.
+    ``on_imported(task, previous)`` is called for every stored task, and
+    ``on_batch()`` after each batch is written or, on a dry run, checked.
+    """
+    if on_conflict not in ("skip", "replace"):
+        raise ValueError(f"on_conflict must be 'skip' or 'replace', got {on_conflict!r}")
+    result = ImportResult(dry_run=dry_run)
+    platforms = set(platforms)
+    iterator = iter(records)
+
+    while True:
+        chunk = list(islice(iterator, batch_size))
+        if not chunk:
+            break
+
+        now = datetime.now()
+        valid: List[Task] = []
+        for line_number, record, error in chunk:
+            if error is None:
+                try:
+                    valid.append(task_from_record(record, platforms, now))
+                    continue
+                except ValueError as e:
+                    error = str(e)
+            result.add_error(line_number, error)
+
+        existing = store.get_many(task.id for task in valid if task.id)
+        batch: Dict[str, Task] = {}
+        unnumbered: List[Task] = []
+        for task in valid:
+            if task.id and (task.id in existing or task.id in batch):
+                if on_conflict == "skip":
+                    result.skipped += 1
+                    continue
+                result.replaced += 1
+            elif deduplicate is not None and deduplicate(task):
+                result.merged += 1
+                continue
+            if task.id:
+                batch[task.id] = task
+            else:
+                unnumbered.append(task)
+
+        result.imported += len(batch) + len(unnumbered)
+        if dry_run or not (batch or unnumbered):
+            if on_batch is not None:
+                on_batch()
+            continue
+        # Ids are only allocated for tasks that are written, so a dry run uses none up
+        for task in unnumbered:
+            task.id = allocate_id()
+            while task.id in batch:
+                # Taken by a record of this batch that is not stored yet
+                task.id = allocate_id()
+            batch[task.id] = task
+        store.add_many(batch.values())
+        if on_imported is not None:
+            for task in batch.values():
+                on_imported(task, existing.get(task.id))
+        if on_batch is not None:
+            on_batch()
+
+    return result
@@ -0,0 +1,401 @@
+"""
+MindQuest Project Manager Agent - Task Journal
+Append-only write-ahead log for task storage with background compaction
+"""
+
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.file_lock import FileLock
+
+logger = logging.getLogger(__name__)
+
+# Compact separators keep every journal record on a single short line
+_COMPACT = (",", ":")
+
+
+def _file_id(path: Path) -> Optional[Tuple[int, int]]:
+    """(inode, mtime) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def _parse_lines(data: bytes, origin: Path) -> List[dict]:
+    records = []
+    for line in data.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            logger.warning(f"Skipping corrupt journal record in {origin}")
+    return records
+
+
+class TaskJournal:
+    """Snapshot plus write-ahead journal for task records.
+
+    The snapshot (``tasks.json``) keeps the historical format: a JSON object
+    mapping task id to task dictionary. Every mutation appends one compact
+    record to ``tasks.journal`` instead of rewriting the snapshot, so the cost
+    of a mutation does not depend on the number of stored tasks.
+
+    Compaction rotates the live journal aside and folds it into a new
+    snapshot on a background thread. Replay is idempotent (records are full
+    puts or field assignments), so a crash at any point during compaction
+    only means some records are applied twice on the next load.
+
+    Several processes can share one journal. Writers hold ``lock`` (an
+    exclusive ``flock`` on ``tasks.lock``) only while they catch up with
+    ``read_new`` and append. Folding a journal and full reloads hold
+    ``compaction_lock``, and the journal is only rotated when that lock is
+    free, so a reload never sees a half-rotated journal. ``read_new``
+    returns None once the snapshot or journal was replaced by another
+    process, meaning the caller has to ``load`` again.
+    """
+
+    def __init__(
+        self,
+        data_dir: str = "data",
+        snapshot_name: str = "tasks.json",
+        compact_after: int = 1000,
+        lock_timeout: Optional[float] = 30.0
+    ):
+        self.data_dir = Path(data_dir)
+        self.snapshot_path = self.data_dir / snapshot_name
+        self.journal_path = self.snapshot_path.with_suffix(".journal")
+        self.compacting_path = self.snapshot_path.with_suffix(".journal.compacting")
+        self.sequence_path = self.snapshot_path.with_suffix(".seq")
+        self.compact_after = compact_after
+
+        self.lock = FileLock(self.snapshot_path.with_suffix(".lock"), timeout=lock_timeout)
+        self.compaction_lock = FileLock(self.snapshot_path.with_suffix(".compact.lock"), timeout=None)
+        self._journal_file = None
+        self._journal_records = 0
+        self._compaction: Optional[threading.Thread] = None
+        self._batch_depth = 0
+        self._batch_lines: List[str] = []
+        self._sequences: Optional[Dict[str, int]] = None
+
+        # What this process has read: the snapshot it loaded and how far into which journal
+        self._snapshot_id: Optional[Tuple[int, int]] = None
+        self._journal_inode: Optional[int] = None
+        self._offset = 0
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Replay snapshot plus any journals into task dictionaries"""
+        self.wait_for_compaction()
+
+        with self.compaction_lock:
+            tasks: Dict[str, Dict[str, Any]] = {}
+            self._snapshot_id = _file_id(self.snapshot_path)
+            if self._snapshot_id is not None:
+                with open(self.snapshot_path, 'r') as f:
+                    tasks = json.load(f)
+
+            # A leftover rotated journal means compaction was interrupted;
+            # it is older than the live journal so it is replayed first.
+            for record in self._read_records(self.compacting_path):
+                self._apply(tasks, record)
+
+            self._journal_inode = None
+            self._offset = 0
+            self._journal_records = 0
+            for record in self.read_new() or []:
+                self._apply(tasks, record)
+        return tasks
+
+    def read_new(self) -> Optional[List[dict]]:
+        """Records appended to the live journal since the last load or read.
+
+        Returns None if the snapshot or journal has been replaced since (by
+        compaction or a snapshot write in another process) and everything
+        must be loaded again. A trailing partial line (a write in progress)
+        is left for the next call.
+        """
+        if _file_id(self.snapshot_path) != self._snapshot_id:
+            return None
+        try:
+            f = open(self.journal_path, 'rb')
+        except FileNotFoundError:
+            return [] if self._journal_inode is None else None
+        with f:
+            inode = os.fstat(f.fileno()).st_ino
+            if inode != self._journal_inode:
+                if self._journal_inode is not None:
+                    return None
+                self._journal_inode = inode
+                self._offset = 0
+            f.seek(self._offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        if not end:
+            return []
+        self._offset += end
+        records = _parse_lines(data[:end], self.journal_path)
+        self._journal_records += len(records)
+        return records
+
+    @staticmethod
+    def _read_records(path: Path) -> Iterator[dict]:
+        """Yield journal records, skipping a torn trailing line"""
+        if not path.exists():
+            return
+        with open(path, 'r') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping corrupt journal record {path}:{line_number}")
+
+    @staticmethod
+    def _apply(tasks: Dict[str, Dict[str, Any]], record: dict):
+        """Apply a single journal record to the task dictionaries"""
+        op = record.get("op")
+        if op == "put":
+            task = record["task"]
+            tasks[task["id"]] = task
+        elif op == "set":
+            task = tasks.get(record["id"])
+            if task is not None:
+                task.update(record["fields"])
+        elif op == "del":
+            tasks.pop(record["id"], None)
+        else:
+            logger.warning(f"Unknown journal operation: {op}")
+
+    # ------------------------------------------------------------------
+    # Mutations
+    # ------------------------------------------------------------------
+
+    def append_put(self, task: Dict[str, Any]):
+        """Record a full task (creation or replacement)"""
+        self._append({"op": "put", "task": task})
+
+    def append_set(self, task_id: str, fields: Dict[str, Any]):
+        """Record a partial update to an existing task"""
+        self._append({"op": "set", "id": task_id, "fields": fields})
+
+    def append_delete(self, task_id: str):
+        """Record a task deletion"""
+        self._append({"op": "del", "id": task_id})
+
+    @property
+    def in_batch(self) -> bool:
+        return self._batch_depth > 0
+
+    @contextmanager
+    def batch(self):
+        """Hold the lock and write the block's records with a single write on exit.
+
+        Batches nest; only the outermost one writes. Buffered records are
+        written even if the block raises, since the caller's in-memory state
+        already reflects them.
+        """
+        with self.lock:
+            self._batch_depth += 1
+            try:
+                yield
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    if self._batch_lines:
+                        lines, self._batch_lines = self._batch_lines, []
+                        self._write("".join(lines), len(lines))
+                    self._flush_sequences()
+
+    def _append(self, record: dict):
+        line = json.dumps(record, separators=_COMPACT) + "\n"
+        if self._batch_depth:
+            self._batch_lines.append(line)
+            return
+        self._write(line, 1)
+
+    def _write(self, text: str, records: int):
+        """Append under the lock; the caller has caught up with ``read_new``"""
+        with self.lock:
+            if self._journal_file is not None:
+                current = _file_id(self.journal_path)
+                if current is None or current[0] != os.fstat(self._journal_file.fileno()).st_ino:
+                    # Rotated or removed by another process since it was opened
+                    self._close_journal()
+            if self._journal_file is None:
+                os.makedirs(self.data_dir, exist_ok=True)
+                self._journal_file = open(self.journal_path, 'ab')
+                self._journal_inode = os.fstat(self._journal_file.fileno()).st_ino
+            if os.fstat(self._journal_file.fileno()).st_size > self._offset:
+                # A line torn by a crashed writer; end it so this record starts cleanly
+                text = "\n" + text
+            self._journal_file.write(text.encode())
+            self._journal_file.flush()
+            self._offset = self._journal_file.tell()
+            self._journal_records += records
+            should_compact = self._journal_records >= self.compact_after
+
+        if should_compact:
+            self.compact(background=True)
+
+    # ------------------------------------------------------------------
+    # Sequences
+    # ------------------------------------------------------------------
+
+    def allocate(self, name: str, start: int, is_taken: Callable[[int], bool]) -> int:
+        """Next number of the named sequence that ``is_taken`` does not reject.
+
+        Sequences only move forward and are persisted in ``tasks.seq``, so a
+        number is never handed out twice, even to concurrent processes. A
+        new sequence continues from ``start``. Inside a batch the file is
+        written once when the batch ends.
+        """
+        with self.lock:
+            if self._sequences is None:
+                self._sequences = {}
+                if self.sequence_path.exists():
+                    with open(self.sequence_path, 'r') as f:
+                        self._sequences = json.load(f)
+            number = self._sequences.get(name, start) + 1
+            while is_taken(number):
+                number += 1
+            self._sequences[name] = number
+            if not self._batch_depth:
+                self._flush_sequences()
+            return number
+
+    def _flush_sequences(self):
+        if self._sequences is None:
+            return
+        sequences, self._sequences = self._sequences, None
+        os.makedirs(self.data_dir, exist_ok=True)
+        tmp_path = self.sequence_path.with_suffix(".seq.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(sequences, f)
+        os.replace(tmp_path, self.sequence_path)
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def write_snapshot(self, tasks: Dict[str, Dict[str, Any]]):
+        """Replace the snapshot with ``tasks`` and discard all journals.
+
+        ``tasks`` must include every record in the journals, so callers
+        catch up under ``lock`` first.
+        """
+        self.wait_for_compaction()
+        with self.lock, self.compaction_lock:
+            self._close_journal()
+            self._atomic_write(tasks)
+            for path in (self.compacting_path, self.journal_path):
+                if path.exists():
+                    path.unlink()
+            self._journal_records = 0
+            self._snapshot_id = _file_id(self.snapshot_path)
+            self._journal_inode = None
+            self._offset = 0
+
+    def compact(self, background: bool = False):
+        """Fold the live journal into the snapshot"""
+        with self.lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return
+            with self.compaction_lock.attempt() as free:
+                if not free:
+                    # Another process is folding or reloading; try again after later writes
+                    return
+                caught_up = False
+                if self.compacting_path.exists():
+                    # An interrupted compaction is finished before rotating again
+                    pass
+                elif self.journal_path.exists():
+                    journal = os.stat(self.journal_path)
+                    caught_up = journal.st_ino == self._journal_inode and journal.st_size == self._offset
+                    self._close_journal()
+                    os.replace(self.journal_path, self.compacting_path)
+                    self._journal_records = 0
+                    self._journal_inode = None
+                    self._offset = 0
+                else:
+                    return
+
+            if background:
+                self._compaction = threading.Thread(
+                    target=self._fold_rotated_journal,
+                    args=(caught_up,),
+                    name="task-journal-compaction",
+                    daemon=True
+                )
+                self._compaction.start()
+                return
+
+        self._fold_rotated_journal(caught_up)
+
+    def wait_for_compaction(self):
+        """Block until a running background compaction has finished"""
+        compaction = self._compaction
+        if compaction is not None:
+            compaction.join()
+            self._compaction = None
+
+    def _fold_rotated_journal(self, caught_up: bool = False):
+        """Fold the rotated journal into the snapshot.
+
+        With ``caught_up`` (this process had read the whole journal when it
+        rotated it) the new snapshot holds nothing this process lacks, so it
+        is adopted without a reload.
+        """
+        try:
+            with self.compaction_lock:
+                if not self.compacting_path.exists():
+                    return
+                snapshot_id = _file_id(self.snapshot_path)
+                tasks: Dict[str, Dict[str, Any]] = {}
+                if snapshot_id is not None:
+                    with open(self.snapshot_path, 'r') as f:
+                        tasks = json.load(f)
+                for record in self._read_records(self.compacting_path):
+                    self._apply(tasks, record)
+
+                self._atomic_write(tasks)
+                self.compacting_path.unlink()
+                if caught_up and snapshot_id == self._snapshot_id:
+                    self._snapshot_id = _file_id(self.snapshot_path)
+            logger.info(f"Compacted task journal into {self.snapshot_path} ({len(tasks)} tasks)")
+        except Exception as e:
+            # The rotated journal is kept and replayed on the next load
+            logger.error(f"Error compacting task journal: {e}")
+
+    def _atomic_write(self, tasks: Dict[str, Dict[str, Any]]):
+        os.makedirs(self.data_dir, exist_ok=True)
+        tmp_path = self.snapshot_path.with_suffix(".json.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(tasks, f, separators=_COMPACT)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+    def _close_journal(self):
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+
+    def close(self):
+        """Finish pending compaction and close the journal file"""
+        self.wait_for_compaction()
+        with self.lock:
+            self._close_journal()
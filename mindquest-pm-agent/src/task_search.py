@@ -0,0 +1,284 @@
+"""
+MindQuest Project Manager Agent - Task Search
+Incrementally maintained inverted index over task text with BM25 ranking
+"""
+
+import math
+import re
+import sys
+from array import array
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from src.models import Task, TaskPriority, TaskStatus
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in into is it its of on or so that the this to was with".split()
+)
+
+# A term in the title counts three times, in a tag twice, in the description once
+FIELD_WEIGHTS = (("title", 3.0), ("tags", 2.0), ("description", 1.0))
+
+# Filter columns hold small integer codes, looked up by enum value
+_STATUS_CODES = {status.value: code for code, status in enumerate(TaskStatus)}
+_PRIORITY_CODES = {priority.value: code for code, priority in enumerate(TaskPriority)}
+
+
+def _fold(token: str) -> str:
+    """Fold simple plurals so "tasks" finds "task" and "stories" finds "story" """
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+@lru_cache(maxsize=1 << 16)
+def _term(token: str) -> str:
+    """Index term for a raw token ("" for a stopword), interned since postings are keyed by it"""
+    return "" if token in STOPWORDS else sys.intern(_fold(token))
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased alphanumeric terms, without stopwords and with plurals folded"""
+    return [term for term in map(_term, _TOKEN.findall(text.lower())) if term]
+
+
+@dataclass
+class SearchHit:
+    task_id: str
+    score: float
+    task: Optional[Task] = None
+
+
+@dataclass
+class SearchResults:
+    """One page of ranked hits and the number of matches across all pages"""
+    total: int
+    hits: List[SearchHit] = field(default_factory=list)
+
+
+class TaskSearchIndex:
+    """Inverted index over task titles, descriptions and tags.
+
+    ``rebuild`` indexes every task once. After that ``observe`` is called
+    with each created or updated task: a status, priority or platform change
+    only updates the task's filter columns, and only a change to its text
+    re-indexes it. Re-indexing gives the task a new document number and
+    leaves the old postings dead until enough accumulate to compact them.
+
+    Postings are parallel arrays of document numbers and field-weighted term
+    frequencies, appended to in place. ``search`` copies the postings of its
+    own terms into numpy and ranks them with BM25, with the filters applied
+    as a mask over per-document status, priority and platform columns.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._clear()
+
+    def _clear(self):
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        # task id -> current document number
+        self._docs: Dict[str, int] = {}
+        # Per document number; ``_live`` is 0 (and the task id None) once the document is superseded
+        self._task_ids: List[Optional[str]] = []
+        self._live = array('b')
+        self._text_hashes = array('q')
+        self._lengths = array('f')
+        self._term_counts = array('q')
+        self._statuses = array('b')
+        self._priorities = array('b')
+        self._platforms = array('h')
+        self._platform_codes: Dict[str, int] = {}
+        self._total_length = 0.0
+        self._live_postings = 0
+        self._dead_postings = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def rebuild(self, tasks: Iterable[Task]):
+        """Index every task from scratch"""
+        self._clear()
+        for task in tasks:
+            self._index(task)
+
+    def observe(self, task: Task):
+        """Account for a created or updated task"""
+        doc = self._docs.get(task.id)
+        if doc is not None and self._text_hashes[doc] == self._text_hash(task):
+            self._set_filters(doc, task)
+            return
+        if doc is not None:
+            self._retire(doc)
+        self._index(task)
+
+    def remove(self, task_id: str):
+        """Drop a deleted task"""
+        doc = self._docs.get(task_id)
+        if doc is not None:
+            self._retire(doc)
+
+    @staticmethod
+    def _text_hash(task: Task) -> int:
+        return hash((task.title, task.description, task.tags))
+
+    def _platform_code(self, platform: str) -> int:
+        code = self._platform_codes.get(platform)
+        if code is None:
+            code = self._platform_codes[platform] = len(self._platform_codes)
+        return code
+
+    def _set_filters(self, doc: int, task: Task):
+        self._statuses[doc] = _STATUS_CODES[task.status.value]
+        self._priorities[doc] = _PRIORITY_CODES[task.priority.value]
+        self._platforms[doc] = self._platform_code(task.platform)
+
+    def _index(self, task: Task):
+        frequencies: Dict[str, float] = {}
+        length = 0.0
+        for name, weight in FIELD_WEIGHTS:
+            value = getattr(task, name)
+            text = " ".join(value) if name == "tags" else value or ""
+            for term in tokenize(text):
+                frequencies[term] = frequencies.get(term, 0.0) + weight
+                length += weight
+
+        doc = len(self._task_ids)
+        self._docs[task.id] = doc
+        self._task_ids.append(task.id)
+        self._live.append(1)
+        self._text_hashes.append(self._text_hash(task))
+        self._lengths.append(length)
+        self._term_counts.append(len(frequencies))
+        self._statuses.append(0)
+        self._priorities.append(0)
+        self._platforms.append(0)
+        self._set_filters(doc, task)
+        self._total_length += length
+        self._live_postings += len(frequencies)
+
+        postings = self._postings
+        for term, frequency in frequencies.items():
+            entry = postings.get(term)
+            if entry is None:
+                entry = postings[term] = (array('q'), array('f'))
+            entry[0].append(doc)
+            entry[1].append(frequency)
+
+    def _retire(self, doc: int):
+        del self._docs[self._task_ids[doc]]
+        self._task_ids[doc] = None
+        self._live[doc] = 0
+        self._total_length -= self._lengths[doc]
+        self._live_postings -= self._term_counts[doc]
+        self._dead_postings += self._term_counts[doc]
+        if self._dead_postings > max(1000, self._live_postings // 4):
+            self._compact()
+
+    def _compact(self):
+        """Drop the postings of superseded documents"""
+        live = _column(self._live, np.int8).astype(bool)
+        for term in list(self._postings):
+            docs, frequencies = (_column(values, dtype) for values, dtype in zip(self._postings[term], (np.int64, np.float32)))
+            keep = live[docs]
+            if not keep.any():
+                del self._postings[term]
+                continue
+            self._postings[term] = (array('q', docs[keep].tobytes()), array('f', frequencies[keep].tobytes()))
+        self._dead_postings = 0
+
+    def _codes(self, values, codes: Dict[str, int]) -> Optional[Set[int]]:
+        """Filter values (enum members or strings) as a set of column codes; None for no filter"""
+        if not values:
+            return None
+        if isinstance(values, (str, TaskStatus, TaskPriority)):
+            values = [values]
+        return {codes.get(value.value if isinstance(value, (TaskStatus, TaskPriority)) else value, -1) for value in values}
+
+    def search(
+        self,
+        query: str,
+        status: Union[TaskStatus, str, Iterable, None] = None,
+        priority: Union[TaskPriority, str, Iterable, None] = None,
+        platform: Union[str, Iterable[str], None] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> SearchResults:
+        """BM25-ranked tasks matching any query term, best first.
+
+        Filters take one value or several (enum members or their string
+        values); empty filters match everything.
+        """
+        terms = set(tokenize(query))
+        if not terms or not self._docs:
+            return SearchResults(0)
+
+        statuses = self._codes(status, _STATUS_CODES)
+        priorities = self._codes(priority, _PRIORITY_CODES)
+        platforms = self._codes(platform, self._platform_codes)
+
+        live = _column(self._live, np.int8).astype(bool)
+        allowed = live
+        for codes, column, dtype in (
+            (statuses, self._statuses, np.int8),
+            (priorities, self._priorities, np.int8),
+            (platforms, self._platforms, np.int16),
+        ):
+            if codes is not None:
+                allowed = allowed & np.isin(_column(column, dtype), list(codes))
+
+        documents = len(self._docs)
+        lengths = _column(self._lengths, np.float32)
+        k1 = self.k1
+        # Length normalisation for each document: k1 * (1 - b + b * length / average length)
+        norms = k1 * (1 - self.b) + k1 * self.b * documents / (self._total_length or 1.0) * lengths
+        scores = np.zeros(len(live), dtype=np.float64)
+        for term in terms:
+            entry = self._postings.get(term)
+            if entry is None:
+                continue
+            docs = _column(entry[0], np.int64)
+            frequencies = _column(entry[1], np.float32)
+            # Document frequency counts every live document, filtered or not
+            document_frequency = int(np.count_nonzero(live[docs]))
+            keep = allowed[docs]
+            docs, frequencies = docs[keep], frequencies[keep]
+            if not len(docs):
+                continue
+            idf = _idf(documents, document_frequency) * (k1 + 1)
+            # A term appears once per document's postings, so plain fancy-index addition is safe
+            scores[docs] += idf * frequencies / (frequencies + norms[docs])
+
+        matched = np.flatnonzero(scores)
+        total = len(matched)
+        wanted = min(offset + limit, total)
+        if offset >= wanted:
+            return SearchResults(total)
+        matched_scores = scores[matched]
+        if wanted < total:
+            top = np.argpartition(-matched_scores, wanted - 1)[:wanted]
+            matched, matched_scores = matched[top], matched_scores[top]
+        # Best first; ties in document order
+        order = np.lexsort((matched, -matched_scores))[offset:wanted]
+        task_ids = self._task_ids
+        return SearchResults(
+            total=total,
+            hits=[SearchHit(task_ids[doc], round(float(score), 4)) for doc, score in zip(matched[order], matched_scores[order])]
+        )
+
+
+def _column(values: array, dtype) -> np.ndarray:
+    """A numpy copy of an index array (a view would stop the array from growing)"""
+    return np.frombuffer(values, dtype=dtype).copy()
+
+
+def _idf(documents: int, document_frequency: int) -> float:
+    """BM25 inverse document frequency, never negative"""
+    return math.log(1 + (documents - document_frequency + 0.5) / (document_frequency + 0.5))
@@ -0,0 +1,760 @@
+"""
+MindQuest Project Manager Agent - Task Stores
+Pluggable task persistence with filter push-down (JSON journal or SQLite)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from src.models import PRIORITIES, STATUSES, Task, TaskPriority, TaskStatus, to_epoch_us
+from src.task_journal import TaskJournal
+
+logger = logging.getLogger(__name__)
+
+StatusFilter = Union[TaskStatus, Iterable[TaskStatus], None]
+PriorityFilter = Union[TaskPriority, Iterable[TaskPriority], None]
+PlatformFilter = Union[str, Iterable[str], None]
+
+ORDER_FIELDS = ("id", "created_at", "updated_at")
+_ORDER_ATTRIBUTES = {"created_at": "created_us", "updated_at": "updated_us"}
+
+
+class VersionConflict(Exception):
+    """A compare-and-swap update found the task at a different version"""
+
+    def __init__(self, task_id: str, expected: int, actual: int):
+        super().__init__(f"Task {task_id} is at version {actual}, expected {expected}")
+        self.task_id = task_id
+        self.expected = expected
+        self.actual = actual
+
+
+def _as_values(value: Any) -> Optional[List[str]]:
+    """Normalise a scalar/iterable filter into a list of raw string values"""
+    if value is None:
+        return None
+    if isinstance(value, (str, TaskStatus, TaskPriority)):
+        value = [value]
+    return [v.value if isinstance(v, (TaskStatus, TaskPriority)) else v for v in value]
+
+
+class TaskStore(ABC):
+    """Abstract task store.
+
+    Stores behave like a read-only ``Dict[str, Task]`` (``len``, ``in``,
+    indexing, ``values()``) so existing callers keep working, and add
+    ``query``/``count``/``sum_hours`` so filters run inside the backend
+    instead of over every materialised ``Task``.
+
+    Listeners registered with ``add_listener`` are called with every task
+    after it is added or updated, and by ``refresh`` with tasks other
+    processes wrote.
+
+    Mutations inside ``with store.batch():`` are persisted together when the
+    block exits: one journal write or one SQLite transaction.
+
+    Several processes (the daemon, cron jobs, the CLI) may share a store.
+    Every write bumps the task's ``version``; ``update`` with
+    ``expected_version`` only applies if nobody else wrote the task since it
+    was read and raises ``VersionConflict`` otherwise. ``allocate_id`` hands
+    out ids that are unique across processes.
+    """
+
+    def __init__(self):
+        self._listeners: List[Callable[[Task], None]] = []
+
+    def add_listener(self, listener: Callable[[Task], None]):
+        """Call ``listener(task)`` after every add or update"""
+        self._listeners.append(listener)
+
+    def _notify(self, task: Task):
+        for listener in self._listeners:
+            listener(task)
+
+    @abstractmethod
+    def get(self, task_id: str) -> Optional[Task]:
+        """Return a task by id, or None"""
+
+    @abstractmethod
+    def add(self, task: Task):
+        """Insert or replace a task"""
+
+    @abstractmethod
+    def update(self, task_id: str, expected_version: Optional[int] = None, **fields) -> Optional[Task]:
+        """Update fields on a task and return it, or None if it does not exist.
+
+        With ``expected_version`` the update is a compare-and-swap: it raises
+        ``VersionConflict`` if the stored task is at any other version.
+        """
+
+    @abstractmethod
+    def allocate_id(self, prefix: str = "TASK-", width: int = 4) -> str:
+        """A new task id, never handed out before by any process"""
+
+    @abstractmethod
+    def query(
+        self,
+        status: StatusFilter = None,
+        priority: PriorityFilter = None,
+        platform: PlatformFilter = None,
+        updated_after: Optional[datetime] = None,
+        updated_before: Optional[datetime] = None,
+        order_by: str = "id",
+        limit: Optional[int] = None
+    ) -> List[Task]:
+        """Return tasks matching every given filter"""
+
+    @abstractmethod
+    def count(
+        self,
+        status: StatusFilter = None,
+        priority: PriorityFilter = None,
+        platform: PlatformFilter = None,
+        updated_after: Optional[datetime] = None,
+        updated_before: Optional[datetime] = None
+    ) -> int:
+        """Count tasks matching every given filter"""
+
+    @abstractmethod
+    def sum_hours(self, status: StatusFilter = None, platform: PlatformFilter = None) -> float:
+        """Sum estimated hours of tasks matching the filters"""
+
+    @abstractmethod
+    def ids(self) -> Iterator[str]:
+        """Iterate over task ids"""
+
+    @abstractmethod
+    def values(self) -> Iterator[Task]:
+        """Iterate over all tasks, ordered by id"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    def add_many(self, tasks: Iterable[Task]):
+        """Insert or replace many tasks in one batch"""
+        with self.batch():
+            for task in tasks:
+                self.add(task)
+
+    def get_many(self, task_ids: Iterable[str]) -> Dict[str, Task]:
+        """Existing tasks among ``task_ids``, by id"""
+        found = {}
+        for task_id in task_ids:
+            task = self.get(task_id)
+            if task is not None:
+                found[task_id] = task
+        return found
+
+    @contextmanager
+    def batch(self):
+        """Persist every mutation in the block together"""
+        yield
+
+    def save(self):
+        """Persist a full snapshot, if the backend has one"""
+
+    def refresh(self):
+        """Pick up writes made by other processes and notify listeners of them"""
+
+    def close(self):
+        """Release files and connections"""
+
+    def items(self) -> Iterator:
+        for task in self.values():
+            yield task.id, task
+
+    def keys(self) -> Iterator[str]:
+        return self.ids()
+
+    def __iter__(self) -> Iterator[str]:
+        return self.ids()
+
+    def __contains__(self, task_id: object) -> bool:
+        return isinstance(task_id, str) and self.get(task_id) is not None
+
+    def __getitem__(self, task_id: str) -> Task:
+        task = self.get(task_id)
+        if task is None:
+            raise KeyError(task_id)
+        return task
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+
+class JsonTaskStore(TaskStore):
+    """In-memory task dict persisted as snapshot plus append-only journal.
+
+    Writes take the journal lock, replay whatever other processes appended
+    since this store last looked, check versions and append. Reads replay
+    new records first as well, except ``get``, which serves the in-memory
+    copy (call ``refresh`` first when it must be current).
+    """
+
+    def __init__(
+        self,
+        data_dir: str = "data",
+        compact_after: int = 1000,
+        lock_timeout: Optional[float] = 30.0
+    ):
+        super().__init__()
+        self.journal = TaskJournal(data_dir=data_dir, compact_after=compact_after, lock_timeout=lock_timeout)
+        self.tasks: Dict[str, Task] = {
+            task_id: Task.from_record(task_data)
+            for task_id, task_data in self.journal.load().items()
+        }
+
+    def _sync(self):
+        """Apply records appended by other processes since the last sync"""
+        if self.journal.in_batch:
+            # The batch holds the lock and caught up on entry; nobody else has written
+            return
+        records = self.journal.read_new()
+        if records is None:
+            self._reload()
+            return
+        for record in records:
+            task = self._apply_record(record)
+            if task is not None:
+                self._notify(task)
+
+    def _reload(self):
+        self.tasks = {
+            task_id: Task.from_record(task_data)
+            for task_id, task_data in self.journal.load().items()
+        }
+        if self._listeners:
+            for task in self.tasks.values():
+                self._notify(task)
+
+    def _apply_record(self, record: dict) -> Optional[Task]:
+        op = record.get("op")
+        if op == "put":
+            task = Task.from_record(record["task"])
+            self.tasks[task.id] = task
+            return task
+        if op == "set":
+            task = self.tasks.get(record["id"])
+            if task is None:
+                return None
+            for name, value in record["fields"].items():
+                if name == "status":
+                    value = STATUSES[value]
+                elif name == "priority":
+                    value = PRIORITIES[value]
+                setattr(task, name, value)
+            return task
+        if op == "del":
+            self.tasks.pop(record["id"], None)
+        return None
+
+    refresh = _sync
+
+    def get(self, task_id: str) -> Optional[Task]:
+        return self.tasks.get(task_id)
+
+    def add(self, task: Task):
+        with self.journal.lock:
+            self._sync()
+            existing = self.tasks.get(task.id)
+            task.version = max(task.version, existing.version + 1 if existing else 1)
+            self.tasks[task.id] = task
+            self.journal.append_put(task.to_record())
+        self._notify(task)
+
+    def update(self, task_id: str, expected_version: Optional[int] = None, **fields) -> Optional[Task]:
+        with self.journal.lock:
+            self._sync()
+            task = self.tasks.get(task_id)
+            if task is None:
+                return None
+            if expected_version is not None and task.version != expected_version:
+                raise VersionConflict(task_id, expected_version, task.version)
+            fields["version"] = task.version + 1
+            for name, value in fields.items():
+                setattr(task, name, value)
+            self.journal.append_set(task_id, _encode_fields(fields, epoch=True))
+        self._notify(task)
+        return task
+
+    def allocate_id(self, prefix: str = "TASK-", width: int = 4) -> str:
+        with self.journal.lock:
+            self._sync()
+            number = self.journal.allocate(
+                prefix,
+                start=len(self.tasks),
+                is_taken=lambda n: f"{prefix}{n:0{width}d}" in self.tasks
+            )
+        return f"{prefix}{number:0{width}d}"
+
+    def _filter(self, status, priority, platform, updated_after, updated_before) -> Iterator[Task]:
+        statuses = _as_values(status)
+        priorities = _as_values(priority)
+        platforms = _as_values(platform)
+        after_us = None if updated_after is None else to_epoch_us(updated_after)
+        before_us = None if updated_before is None else to_epoch_us(updated_before)
+        for task in self.tasks.values():
+            if statuses is not None and task.status.value not in statuses:
+                continue
+            if priorities is not None and task.priority.value not in priorities:
+                continue
+            if platforms is not None and task.platform not in platforms:
+                continue
+            if after_us is not None and task.updated_us < after_us:
+                continue
+            if before_us is not None and task.updated_us >= before_us:
+                continue
+            yield task
+
+    def query(
+        self,
+        status: StatusFilter = None,
+        priority: PriorityFilter = None,
+        platform: PlatformFilter = None,
+        updated_after: Optional[datetime] = None,
+        updated_before: Optional[datetime] = None,
+        order_by: str = "id",
+        limit: Optional[int] = None
+    ) -> List[Task]:
+        if order_by not in ORDER_FIELDS:
+            raise ValueError(f"Cannot order tasks by {order_by}")
+        self._sync()
+        # Timestamps sort on their raw epoch form instead of building datetimes
+        key = _ORDER_ATTRIBUTES.get(order_by, order_by)
+        tasks = sorted(
+            self._filter(status, priority, platform, updated_after, updated_before),
+            key=lambda task: getattr(task, key)
+        )
+        return tasks[:limit] if limit is not None else tasks
+
+    def count(
+        self,
+        status: StatusFilter = None,
+        priority: PriorityFilter = None,
+        platform: PlatformFilter = None,
+        updated_after: Optional[datetime] = None,
+        updated_before: Optional[datetime] = None
+    ) -> int:
+        self._sync()
+        return sum(1 for _ in self._filter(status, priority, platform, updated_after, updated_before))
+
+    def sum_hours(self, status: StatusFilter = None, platform: PlatformFilter = None) -> float:
+        self._sync()
+        return sum(task.estimated_hours for task in self._filter(status, None, platform, None, None))
+
+    def ids(self) -> Iterator[str]:
+        self._sync()
+        return iter(sorted(self.tasks))
+
+    def values(self) -> Iterator[Task]:
+        self._sync()
+        tasks = self.tasks
+        for task_id in sorted(tasks):
+            yield tasks[task_id]
+
+    def __len__(self) -> int:
+        self._sync()
+        return len(self.tasks)
+
+    @contextmanager
+    def batch(self):
+        """Hold the journal lock for the block and write its records once"""
+        with self.journal.batch():
+            self._sync()
+            yield
+
+    def save(self):
+        with self.journal.lock:
+            self._sync()
+            self.journal.write_snapshot({
+                task_id: task.to_record() for task_id, task in self.tasks.items()
+            })
+
+    def close(self):
+        self.journal.close()
+
+
+class SqliteTaskStore(TaskStore):
+    """SQLite task store with indexes on status, priority, platform and updated_at.
+
+    Every write stamps the row with the next value of a store-wide change
+    counter; ``refresh`` notifies listeners of the rows stamped since it
+    last looked, which is how writes by other processes reach them.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS tasks (
+        id TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        description TEXT NOT NULL,
+        priority TEXT NOT NULL,
+        status TEXT NOT NULL,
+        platform TEXT NOT NULL,
+        estimated_hours REAL NOT NULL,
+        assigned_to TEXT,
+        due_date TEXT,
+        dependencies TEXT NOT NULL DEFAULT '[]',
+        tags TEXT NOT NULL DEFAULT '[]',
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        version INTEGER NOT NULL DEFAULT 0,
+        changed INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS sequences (
+        name TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+    CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority);
+    CREATE INDEX IF NOT EXISTS idx_tasks_platform ON tasks(platform);
+    CREATE INDEX IF NOT EXISTS idx_tasks_updated_at ON tasks(updated_at);
+    """
+
+    INDEXES = """
+    CREATE INDEX IF NOT EXISTS idx_tasks_changed ON tasks(changed);
+    """
+
+    # Writers are serialised, so each stamp is above every committed one
+    NEXT_CHANGE = "(SELECT COALESCE(MAX(changed), 0) + 1 FROM tasks)"
+
+    COLUMNS = (
+        "id", "title", "description", "priority", "status", "platform",
+        "estimated_hours", "assigned_to", "due_date", "dependencies", "tags",
+        "created_at", "updated_at", "version"
+    )
+
+    def __init__(self, db_path: str = "data/tasks.db", lock_timeout: Optional[float] = 30.0):
+        super().__init__()
+        self.db_path = Path(db_path)
+        os.makedirs(self.db_path.parent, exist_ok=True)
+        # SQLite's own locking serialises writers; the timeout is how long one waits for another
+        self.conn = sqlite3.connect(str(self.db_path), timeout=lock_timeout if lock_timeout is not None else 3600)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self._migrate()
+        self.conn.executescript(self.INDEXES)
+        self._batch_depth = 0
+        self._watermark = self._last_change()
+
+    def _migrate(self):
+        """Add columns introduced after a database was created"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(tasks)")}
+        if "version" not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+        if "changed" not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE tasks ADD COLUMN changed INTEGER NOT NULL DEFAULT 0")
+
+    def _last_change(self) -> int:
+        return self.conn.execute("SELECT COALESCE(MAX(changed), 0) FROM tasks").fetchone()[0]
+
+    def refresh(self):
+        """Notify listeners of rows written since the last refresh, by any process"""
+        if self._batch_depth:
+            # Rows written by the open transaction are not committed yet
+            return
+        if not self._listeners:
+            self._watermark = self._last_change()
+            return
+        rows = self.conn.execute(
+            f"SELECT {', '.join(self.COLUMNS)}, changed FROM tasks WHERE changed > ? ORDER BY changed",
+            (self._watermark,)
+        ).fetchall()
+        for row in rows:
+            self._notify(self._from_row(row[:-1]))
+            self._watermark = row[-1]
+
+    @contextmanager
+    def batch(self):
+        """One transaction for the whole block, rolled back if it raises"""
+        self._batch_depth += 1
+        try:
+            yield
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.conn.rollback()
+            raise
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self.conn.commit()
+
+    @contextmanager
+    def _transaction(self):
+        """Commit per statement outside a batch; inside one, defer to its end"""
+        if self._batch_depth:
+            yield
+        else:
+            with self.conn:
+                yield
+
+    @staticmethod
+    def _to_row(task: Task) -> tuple:
+        due_date = task.due_date
+        return (
+            task.id, task.title, task.description, task.priority.value, task.status.value,
+            task.platform, task.estimated_hours, task.assigned_to,
+            due_date.isoformat() if due_date is not None else None,
+            json.dumps(task.dependencies), json.dumps(task.tags),
+            task.created_at.isoformat(), task.updated_at.isoformat(), task.version
+        )
+
+    @staticmethod
+    def _from_row(row: tuple) -> Task:
+        (task_id, title, description, priority, status, platform, hours,
+         assigned_to, due_date, dependencies, tags, created_at, updated_at, version) = row
+        return Task(
+            task_id, title, description, PRIORITIES[priority], STATUSES[status],
+            platform, hours, assigned_to, due_date or None,
+            json.loads(dependencies) if dependencies != "[]" else None,
+            json.loads(tags) if tags != "[]" else None,
+            created_at, updated_at, version
+        )
+
+    def get(self, task_id: str) -> Optional[Task]:
+        row = self.conn.execute(
+            f"SELECT {', '.join(self.COLUMNS)} FROM tasks WHERE id = ?", (task_id,)
+        ).fetchone()
+        return self._from_row(row) if row else None
+
+    def add(self, task: Task):
+        self.add_many([task])
+
+    def add_many(self, tasks: Iterable[Task]):
+        """Insert or replace many tasks in a single transaction"""
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        assignments = ", ".join(f"{name} = excluded.{name}" for name in self.COLUMNS[1:-1])
+        added = []
+        
+        def rows():
+            for task in tasks:
+                # New tasks start at version 1; a replaced one goes past the stored version
+                task.version = max(task.version, 1)
+                added.append(task)
+                yield self._to_row(task)
+        
+        with self._transaction():
+            self.conn.executemany(
+                f"INSERT INTO tasks ({', '.join(self.COLUMNS)}, changed) "
+                f"VALUES ({placeholders}, {self.NEXT_CHANGE}) "
+                f"ON CONFLICT(id) DO UPDATE SET {assignments}, "
+                f"version = MAX(tasks.version + 1, excluded.version), changed = excluded.changed",
+                rows()
+            )
+            self._read_versions(added)
+        if self._listeners:
+            for task in added:
+                self._notify(task)
+
+    def _read_versions(self, tasks: List[Task]):
+        """Set each task's version to the stored one, which a replace moved past it"""
+        by_id = {task.id: task for task in tasks}
+        task_ids = list(by_id)
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(task_ids), 500):
+            chunk = task_ids[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT id, version FROM tasks WHERE id IN ({', '.join('?' for _ in chunk)})", chunk
+            )
+            for task_id, version in rows:
+                by_id[task_id].version = version
+
+    def update(self, task_id: str, expected_version: Optional[int] = None, **fields) -> Optional[Task]:
+        encoded = _encode_fields(fields)
+        for name in ("dependencies", "tags"):
+            if name in encoded:
+                encoded[name] = json.dumps(encoded[name])
+        assignments = ", ".join(f"{name} = ?" for name in encoded)
+        sql = f"UPDATE tasks SET {assignments}, version = version + 1, changed = {self.NEXT_CHANGE} WHERE id = ?"
+        params = [*encoded.values(), task_id]
+        if expected_version is not None:
+            sql += " AND version = ?"
+            params.append(expected_version)
+        with self._transaction():
+            cursor = self.conn.execute(sql, params)
+        if cursor.rowcount == 0:
+            if expected_version is None:
+                return None
+            row = self.conn.execute("SELECT version FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row is None:
+                return None
+            raise VersionConflict(task_id, expected_version, row[0])
+        task = self.get(task_id)
+        self._notify(task)
+        return task
+
+    def allocate_id(self, prefix: str = "TASK-", width: int = 4) -> str:
+        with self._transaction():
+            # The first write of the transaction takes SQLite's write lock before the count is read
+            self.conn.execute(
+                "INSERT OR IGNORE INTO sequences (name, value) SELECT ?, COUNT(*) FROM tasks", (prefix,)
+            )
+            while True:
+                self.conn.execute("UPDATE sequences SET value = value + 1 WHERE name = ?", (prefix,))
+                number = self.conn.execute("SELECT value FROM sequences WHERE name = ?", (prefix,)).fetchone()[0]
+                task_id = f"{prefix}{number:0{width}d}"
+                if self.conn.execute("SELECT 1 FROM tasks WHERE id = ?", (task_id,)).fetchone() is None:
+                    return task_id
+
+    @staticmethod
+    def _where(
+        status: StatusFilter = None,
+        priority: PriorityFilter = None,
+        platform: PlatformFilter = None,
+        updated_after: Optional[datetime] = None,
+        updated_before: Optional[datetime] = None
+    ):
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in (("status", status), ("priority", priority), ("platform", platform)):
+            values = _as_values(value)
+            if values is not None:
+                clauses.append(f"{column} IN ({', '.join('?' for _ in values)})")
+                params.extend(values)
+        if updated_after is not None:
+            clauses.append("updated_at >= ?")
+            params.append(updated_after.isoformat())
+        if updated_before is not None:
+            clauses.append("updated_at < ?")
+            params.append(updated_before.isoformat())
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def query(
+        self,
+        status: StatusFilter = None,
+        priority: PriorityFilter = None,
+        platform: PlatformFilter = None,
+        updated_after: Optional[datetime] = None,
+        updated_before: Optional[datetime] = None,
+        order_by: str = "id",
+        limit: Optional[int] = None
+    ) -> List[Task]:
+        if order_by not in ORDER_FIELDS:
+            raise ValueError(f"Cannot order tasks by {order_by}")
+        where, params = self._where(status, priority, platform, updated_after, updated_before)
+        sql = f"SELECT {', '.join(self.COLUMNS)} FROM tasks{where} ORDER BY {order_by}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [self._from_row(row) for row in self.conn.execute(sql, params)]
+
+    def count(
+        self,
+        status: StatusFilter = None,
+        priority: PriorityFilter = None,
+        platform: PlatformFilter = None,
+        updated_after: Optional[datetime] = None,
+        updated_before: Optional[datetime] = None
+    ) -> int:
+        where, params = self._where(status, priority, platform, updated_after, updated_before)
+        return self.conn.execute(f"SELECT COUNT(*) FROM tasks{where}", params).fetchone()[0]
+
+    def sum_hours(self, status: StatusFilter = None, platform: PlatformFilter = None) -> float:
+        where, params = self._where(status=status, platform=platform)
+        total = self.conn.execute(
+            f"SELECT SUM(estimated_hours) FROM tasks{where}", params
+        ).fetchone()[0]
+        return total or 0.0
+
+    def ids(self) -> Iterator[str]:
+        for (task_id,) in self.conn.execute("SELECT id FROM tasks ORDER BY id"):
+            yield task_id
+
+    def values(self) -> Iterator[Task]:
+        cursor = self.conn.execute(f"SELECT {', '.join(self.COLUMNS)} FROM tasks ORDER BY id")
+        for row in cursor:
+            yield self._from_row(row)
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def __contains__(self, task_id: object) -> bool:
+        if not isinstance(task_id, str):
+            return False
+        return self.conn.execute("SELECT 1 FROM tasks WHERE id = ?", (task_id,)).fetchone() is not None
+
+    def get_many(self, task_ids: Iterable[str]) -> Dict[str, Task]:
+        task_ids = list(task_ids)
+        found = {}
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(task_ids), 500):
+            chunk = task_ids[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM tasks WHERE id IN ({', '.join('?' for _ in chunk)})",
+                chunk
+            )
+            for row in rows:
+                task = self._from_row(row)
+                found[task.id] = task
+        return found
+
+    def close(self):
+        self.conn.close()
+
+
+def _encode_fields(fields: Dict[str, Any], epoch: bool = False) -> Dict[str, Any]:
+    """Convert Task attribute values into their stored form.
+
+    Datetimes become ISO strings, or epoch microseconds (the JSON journal's
+    record form) when ``epoch`` is set.
+    """
+    encoded = {}
+    for name, value in fields.items():
+        if isinstance(value, (TaskStatus, TaskPriority)):
+            value = value.value
+        elif isinstance(value, datetime):
+            value = to_epoch_us(value) if epoch else value.isoformat()
+        elif isinstance(value, tuple):
+            value = list(value)
+        encoded[name] = value
+    return encoded
+
+
+def migrate_json_to_sqlite(data_dir: str = "data", db_path: str = "data/tasks.db") -> int:
+    """Copy every task from the JSON snapshot/journal into a SQLite store"""
+    source = JsonTaskStore(data_dir=data_dir)
+    target = SqliteTaskStore(db_path)
+    try:
+        target.add_many(source.values())
+        migrated = len(target)
+    finally:
+        source.close()
+        target.close()
+    logger.info(f"Migrated {migrated} tasks from {data_dir} to {db_path}")
+    return migrated
+
+
+def open_task_store(storage_config: Optional[Dict[str, Any]] = None) -> TaskStore:
+    """Open the task store selected by the ``storage`` config section"""
+    storage_config = storage_config or {}
+    backend = storage_config.get("backend", "json")
+    data_dir = storage_config.get("data_dir", "data")
+    lock_timeout = storage_config.get("lock_timeout_seconds", 30)
+
+    if backend == "json":
+        return JsonTaskStore(
+            data_dir=data_dir,
+            compact_after=storage_config.get("compact_after", 1000),
+            lock_timeout=lock_timeout
+        )
+
+    if backend == "sqlite":
+        db_path = storage_config.get("sqlite_path", os.path.join(data_dir, "tasks.db"))
+        has_json = any((Path(data_dir) / name).exists() for name in ("tasks.json", "tasks.journal"))
+        if not Path(db_path).exists() and has_json:
+            logger.info(f"No SQLite store at {db_path}, migrating existing JSON tasks")
+            migrate_json_to_sqlite(data_dir, db_path)
+        return SqliteTaskStore(db_path, lock_timeout=lock_timeout)
+
+    raise ValueError(f"Unknown task store backend: {backend}")
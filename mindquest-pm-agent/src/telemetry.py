@@ -0,0 +1,329 @@
+"""
+MindQuest Project Manager Agent - Telemetry
+Nested timing spans, latency histograms and counters with JSON and OpenMetrics export
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import math
+import os
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "mindquest"
+QUANTILES = (0.5, 0.95, 0.99)
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("mindquest_span", default=None)
+
+
+class Histogram:
+    """Latency distribution on log-spaced buckets.
+
+    Buckets grow by ``GROWTH`` from 1µs, so a quantile is accurate to within
+    one bucket (about 10%) at any scale while memory stays bounded by the
+    number of distinct buckets hit.
+    """
+    GROWTH = 1.1
+    MIN_VALUE = 1e-6
+    _LOG_GROWTH = math.log(GROWTH)
+
+    __slots__ = ("buckets", "count", "sum", "min", "max")
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, value: float):
+        index = 0 if value <= self.MIN_VALUE else math.ceil(math.log(value / self.MIN_VALUE) / self._LOG_GROWTH)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Estimated value below which a fraction ``q`` of observations fall"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Geometric middle of the bucket, never outside what was observed
+                value = self.MIN_VALUE * self.GROWTH ** (index - 0.5)
+                return min(self.max, max(self.min, value))
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "min": round(self.min, 6) if self.count else None,
+            "max": round(self.max, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+            **{f"p{round(q * 100)}": round(self.quantile(q), 6) for q in QUANTILES},
+        }
+
+
+class Span:
+    """One timed operation; nests under the span active when it was entered"""
+
+    __slots__ = ("telemetry", "name", "path", "attach", "started", "duration", "_token")
+
+    def __init__(self, telemetry: "Telemetry", name: str, attach: bool = True):
+        self.telemetry = telemetry
+        self.name = name
+        self.attach = attach
+        self.path: Tuple[str, ...] = (name,)
+        self.duration = 0.0
+        self._token = None
+
+    def __enter__(self) -> "Span":
+        parent = _current_span.get()
+        if parent is not None:
+            self.path = parent.path + (self.name,)
+        if self.path not in self.telemetry.paths:
+            # Registered on entry so the profile lists phases in the order they started
+            self.telemetry.paths[self.path] = Histogram()
+        if self.attach:
+            self._token = _current_span.set(self)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self.started
+        if self._token is not None:
+            _current_span.reset(self._token)
+        self.telemetry._finish(self, failed=exc_type is not None)
+        return False
+
+
+class _NoopSpan:
+    """Stand-in returned while telemetry is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Telemetry:
+    """Span latencies per operation and per call path, plus labelled counters.
+
+    Disabled by default; ``span`` then returns a shared no-op and ``count``
+    returns immediately, so instrumented code costs a method call and a flag
+    check. Spans track their parent through a context variable, so nesting
+    follows ``await`` and tasks started by ``asyncio.gather``. Spans around
+    async generators should pass ``attach=False`` so they do not become the
+    parent of whatever the consumer does between chunks.
+    """
+
+    def __init__(self, enabled: bool = False, export_path: Optional[str] = None):
+        self.enabled = enabled
+        self.export_path = Path(export_path) if export_path else None
+        self.started_at = datetime.now()
+        self.spans: Dict[str, Histogram] = {}
+        self.paths: Dict[Tuple[str, ...], Histogram] = {}
+        self.counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+
+    @classmethod
+    def from_config(cls, telemetry_config: Optional[Dict[str, Any]] = None) -> "Telemetry":
+        """Create telemetry from the ``telemetry`` config section"""
+        telemetry_config = telemetry_config or {}
+        return cls(
+            enabled=telemetry_config.get("enabled", False),
+            export_path=telemetry_config.get("export_path")
+        )
+
+    def span(self, name: str, attach: bool = True):
+        """Context manager timing the enclosed block as ``name``"""
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, name, attach)
+
+    def count(self, name: str, value: float = 1, **labels):
+        """Add ``value`` to a counter (tokens, bytes, calls)"""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def _finish(self, span: Span, failed: bool):
+        histogram = self.spans.get(span.name)
+        if histogram is None:
+            histogram = self.spans[span.name] = Histogram()
+        histogram.observe(span.duration)
+        self.paths[span.path].observe(span.duration)
+        if failed:
+            self.count("span_errors", span=span.name)
+
+    def reset(self):
+        self.started_at = datetime.now()
+        self.spans.clear()
+        self.paths.clear()
+        self.counters.clear()
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "exported_at": datetime.now().isoformat(timespec="seconds"),
+            "spans": {name: histogram.to_dict() for name, histogram in sorted(self.spans.items())},
+            "paths": [
+                {"path": "/".join(path), **histogram.to_dict()}
+                for path, histogram in self.paths.items()
+                if histogram.count
+            ],
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self.counters.items())
+            ],
+        }
+
+    def to_openmetrics(self) -> str:
+        """OpenMetrics text exposition: a summary per span name and the counters"""
+        def labels_text(labels: Dict[str, str]) -> str:
+            if not labels:
+                return ""
+            escaped = (
+                key + '="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+                for key, value in labels.items()
+            )
+            return "{" + ",".join(escaped) + "}"
+
+        family = f"{METRIC_PREFIX}_span_duration_seconds"
+        lines = [
+            f"# TYPE {family} summary",
+            f"# UNIT {family} seconds",
+            f"# HELP {family} Duration of agent operations.",
+        ]
+        for name, histogram in sorted(self.spans.items()):
+            for q in QUANTILES:
+                lines.append(f"{family}{labels_text({'span': name, 'quantile': str(q)})} {histogram.quantile(q):.6g}")
+            lines.append(f"{family}_sum{labels_text({'span': name})} {histogram.sum:.6g}")
+            lines.append(f"{family}_count{labels_text({'span': name})} {histogram.count}")
+
+        by_name: Dict[str, List[Tuple[Dict[str, str], float]]] = {}
+        for (name, labels), value in sorted(self.counters.items()):
+            by_name.setdefault(name, []).append((dict(labels), value))
+        for name, samples in by_name.items():
+            counter = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# TYPE {counter} counter")
+            for labels, value in samples:
+                lines.append(f"{counter}_total{labels_text(labels)} {value:g}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: Optional[str] = None) -> Optional[Path]:
+        """Write everything recorded so far: JSON for a ``.json`` path, OpenMetrics text otherwise"""
+        path = Path(path) if path else self.export_path
+        if path is None:
+            return None
+        text = json.dumps(self.to_dict(), indent=2) if path.suffix == ".json" else self.to_openmetrics()
+        os.makedirs(path.parent, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+        return path
+
+    def flush(self):
+        """Export to the configured path if telemetry is on; never raises"""
+        if not self.enabled or self.export_path is None:
+            return
+        try:
+            self.export()
+        except OSError as e:
+            logger.warning(f"Could not export telemetry: {e}")
+
+    # ------------------------------------------------------------------
+    # Profile
+    # ------------------------------------------------------------------
+
+    def format_profile(self) -> str:
+        """Per-phase breakdown as an indented call tree"""
+        # Children listed under their parent in the order they started; spans still open are left out
+        children: Dict[Tuple[str, ...], List[Tuple[str, ...]]] = {}
+        for path, histogram in self.paths.items():
+            if histogram.count:
+                children.setdefault(path[:-1], []).append(path)
+        if not children:
+            return "No spans recorded"
+        roots = children.get((), [])
+        wall = sum(self.paths[path].sum for path in roots) or 1.0
+
+        lines = [f"{'Phase':<44} {'calls':>6} {'total':>9} {'mean':>9} {'p95':>9} {'share':>7}"]
+
+        def walk(path: Tuple[str, ...]):
+            histogram = self.paths[path]
+            label = "  " * (len(path) - 1) + path[-1]
+            lines.append(
+                f"{label[:44]:<44} {histogram.count:>6} {_seconds(histogram.sum):>9} "
+                f"{_seconds(histogram.sum / histogram.count):>9} {_seconds(histogram.quantile(0.95)):>9} "
+                f"{histogram.sum / wall:>7.1%}"
+            )
+            for child in children.get(path, []):
+                walk(child)
+
+        for root in roots:
+            walk(root)
+
+        if self.counters:
+            lines.append("")
+            for (name, labels), value in sorted(self.counters.items()):
+                label_text = ",".join(f"{k}={v}" for k, v in labels)
+                lines.append(f"{name}{'{' + label_text + '}' if label_text else ''}: {value:g}")
+        return "\n".join(lines)
+
+
+def _seconds(value: float) -> str:
+    if value >= 1:
+        return f"{value:.2f}s"
+    return f"{value * 1000:.1f}ms"
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Time a method of an object with a ``telemetry`` attribute as a span (default: the method name)"""
+    def decorate(method: Callable) -> Callable:
+        span_name = name or method.__name__
+        if asyncio.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                telemetry = self.telemetry
+                if not telemetry.enabled:
+                    return await method(self, *args, **kwargs)
+                with Span(telemetry, span_name):
+                    return await method(self, *args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            telemetry = self.telemetry
+            if not telemetry.enabled:
+                return method(self, *args, **kwargs)
+            with Span(telemetry, span_name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate